@@ -1,48 +1,49 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-
-def app():
-    st.title("📊 Customer Dashboard - Bank Credit Card")
-    
-    # Load dataset
-    df_churn = pd.read_csv("Bank_Card/dataset/df_churn.csv")
-
+from shared.count_cube import BANK_CHURN_CUBE, CountCube
+from shared.datasets import cached_dataset, dataset_version
+from shared.lazy_tabs import lazy_tabs, memoized_tab
+from shared.rendering import paged_dataframe
+
+DATASET = "Bank_Card/dataset/df_churn.csv"
+TABS = [
+    "📊 Overview",
+    "👥 Demographics & Social",
+    "🧭 Behavior & Account Activity",
+    "💰 Financial & Credit Limit",
+    "💳 Transactions & Usage",
+    "🧾 Products & Card Categories"
+]
+
+def prepare_churn(df_churn):
     # Preprocessing ringan jika diperlukan
     df_churn["Gender"] = df_churn["Gender"].astype("category").cat.rename_categories({"F": "Female", "M": "Male"})
+    df_churn["Total_Revolving_Bal_Category"] = pd.Categorical(df_churn["Total_Revolving_Bal_Category"], categories=['Very Low', 'Low', 'Medium', 'High', 'Very High'], ordered=True)
+    df_churn["Avg_Utilization_Category"] = pd.Categorical(df_churn["Avg_Utilization_Category"], categories=['Low Utilization', 'Medium Utilization', 'High Utilization'], ordered=True)
+    return df_churn
 
-    # Filter
-    st.sidebar.header("🔍 Filter Options")
-    gender_filter = st.sidebar.multiselect("Select Gender:", df_churn["Gender"].unique(), default=df_churn["Gender"].unique(),  help="Filter data based on customer's gender.")
-    churn_filter = st.sidebar.multiselect("Churn Status:", df_churn["Attrition_Flag"].unique(), default=df_churn["Attrition_Flag"].unique(), help="Choose whether to display churned or existing customers.")
-
-    age_filter = st.sidebar.slider("Customer Age Range:", int(df_churn["Customer_Age"].min()), int(df_churn["Customer_Age"].max()), (int(df_churn["Customer_Age"].min()), int(df_churn["Customer_Age"].max())), help="Select a range of customer ages to include in the analysis.")
-    trans_ct_filter = st.sidebar.slider("Total Transactions Range:", int(df_churn["Total_Trans_Ct"].min()), int(df_churn["Total_Trans_Ct"].max()), (int(df_churn["Total_Trans_Ct"].min()), int(df_churn["Total_Trans_Ct"].max())), help="Filter by the number of transactions made by customers.")
-    trans_amt_filter = st.sidebar.slider("Total Transaction Amount Range:", float(df_churn["Total_Trans_Amt"].min()), float(df_churn["Total_Trans_Amt"].max()), (float(df_churn["Total_Trans_Amt"].min()), float(df_churn["Total_Trans_Amt"].max())), help="Select a range of total transaction amounts for filtering customers.")
-
-    # Apply Filter ke DataFrame
-    df_churn = df_churn[
-    (df_churn["Gender"].isin(gender_filter)) &
-    (df_churn["Customer_Age"].between(age_filter[0], age_filter[1])) &
-    (df_churn["Total_Trans_Ct"].between(trans_ct_filter[0], trans_ct_filter[1])) &
-    (df_churn["Total_Trans_Amt"].between(trans_amt_filter[0], trans_amt_filter[1])) &
-    (df_churn["Attrition_Flag"].isin(churn_filter))
-    ]
-
-    # Tab layout
-    tabs = st.tabs([
-        "📊 Overview",
-        "👥 Demographics & Social",
-        "🧭 Behavior & Account Activity",
-        "💰 Financial & Credit Limit",
-        "💳 Transactions & Usage",
-        "🧾 Products & Card Categories"
-    ])
+def build_churn_cube(df_churn):
+    # Count cube over the filter columns, used for every chart below
+    return CountCube(df_churn, **BANK_CHURN_CUBE)
+
+def range_slider(cube, column, label, unit, help):
+    # Slider snapped to the cube's bins: lower bound included, upper bound excluded
+    edges = cube.edges[column]
+    step = int(edges[1] - edges[0])
+    return st.sidebar.slider(label, int(edges[0]), int(edges[-1]), (int(edges[0]), int(edges[-1])), step=step,
+                             help=f"{help} Moves in steps of {step}{' ' + unit if unit else ''}; the upper bound is excluded.")
+
+@memoized_tab
+def render_dashboard_tab(tab, where, version, _cube):
+    cube = _cube
 
     # === TAB 0: Overview ===
-    with tabs[0]:
+    if tab == TABS[0]:
         st.markdown("##### Churn Status Distribution")
-        churn_count = df_churn['Attrition_Flag'].value_counts().reset_index()
+        churn_count = cube.counts("Attrition_Flag", where).sort_values(ascending=False)
+        churn_count = churn_count[churn_count > 0].reset_index()
         churn_count.columns = ['Attrition_Flag', 'Count']
 
         fig = px.bar(churn_count, x='Count', y='Attrition_Flag',
@@ -52,17 +53,19 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
     # === TAB 1: Demografi & Sosial ===
-    with tabs[1]:
+    elif tab == TABS[1]:
         st.markdown("##### a. Gender")
-        data_gender = pd.crosstab(df_churn["Gender"], df_churn["Attrition_Flag"]).T
+        data_gender = cube.crosstab("Gender", "Attrition_Flag", where).T
         data_gender_long = data_gender.T.reset_index().melt(id_vars="Gender", var_name="Attrition_Flag", value_name="Count" ) 
         fig = px.pie( data_gender_long,  names="Gender",   values="Count",  facet_col="Attrition_Flag",  title="Gender Distribution by Churn", color_discrete_sequence=px.colors.qualitative.Antique, labels={"Gender": "", "Count": "", "Attrition_Flag": ""} ) 
         fig.for_each_annotation(lambda a: a.update(text=a.text.replace("=", "")))
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### b. Age")
-        fig = px.histogram(
-            df_churn, x="Customer_Age", color="Attrition_Flag", nbins=60,
+        data_age = cube.crosstab("Customer_Age", "Attrition_Flag", where).stack().reset_index(name="Count")
+        data_age = data_age[data_age["Count"] > 0]
+        fig = px.bar(
+            data_age, x="Customer_Age", y="Count", color="Attrition_Flag",
             barmode="stack", title="Customer Age Distribution by Churn", labels={"Customer_Age": "", "Attrition_Flag": ""},
             color_discrete_sequence=px.colors.qualitative.Pastel, text_auto=True)
         fig.update_layout(xaxis=dict(tickmode="linear"), template="plotly_white")
@@ -70,7 +73,7 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### c. Education and Income")
-        data_edu_income = pd.crosstab([df_churn["Education_Level"], df_churn["Income_Category"]], df_churn["Attrition_Flag"]).T
+        data_edu_income = cube.crosstab(["Education_Level", "Income_Category"], "Attrition_Flag", where).T
         data_long = data_edu_income.T.reset_index().melt(id_vars=["Education_Level", "Income_Category"], var_name="Attrition_Flag", value_name="Count")
         fig = px.scatter(data_long, x="Education_Level", y="Income_Category", size="Count", color="Attrition_Flag", facet_col="Attrition_Flag", title="Churn Distribution by Education and Income",
                         labels={"Count": "", "Education_Level": "", "Income_Category": "", "Attrition_Flag": ""}, color_discrete_map={"Attrited Customer": "red", "Existing Customer": "blue"}, size_max=40)
@@ -79,7 +82,7 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### d. Marital Status and Dependents")
-        data_marital = pd.crosstab([df_churn["Marital_Status"], df_churn["Dependent_count"]], df_churn["Attrition_Flag"]).stack().reset_index()
+        data_marital = cube.crosstab(["Marital_Status", "Dependent_count"], "Attrition_Flag", where).stack().reset_index()
         data_marital.columns = ["Marital Status", "Dependent Count", "Churn Status", "Count"]
         fig = px.bar(data_marital, y="Marital Status", x="Count", color="Churn Status", facet_col="Dependent Count", text_auto=True, title="Churn Distribution by Marital Status & Dependent Count",
                     labels={"Count": "Count", "Marital Status": "", "Churn Status": ""}, barmode="stack", color_discrete_sequence=px.colors.qualitative.Set1)
@@ -88,9 +91,9 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
     # === TAB 2: Perilaku & Aktivitas Akun ===
-    with tabs[2]:
+    elif tab == TABS[2]:
         st.markdown("##### a. Number of Contacts")
-        data_contacts = pd.crosstab(df_churn["Contacts_Count_12_mon"], df_churn["Attrition_Flag"]).stack().reset_index()
+        data_contacts = cube.crosstab("Contacts_Count_12_mon", "Attrition_Flag", where).stack().reset_index()
         data_contacts.columns = ["Contacts Count (12M)", "Churn Status", "Count"]
         # Perbaikan: color diganti dari "Attrition_Flag" menjadi "Churn Status"
         fig = px.area(data_contacts, x="Contacts Count (12M)", y="Count", color="Churn Status", markers=True, line_shape="spline", title="Account Activity by Contact Count (Last 12 Months)",
@@ -99,7 +102,7 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### b. Customer Tenure")
-        data_months = pd.crosstab(df_churn["Months_on_book"], df_churn["Attrition_Flag"]).T
+        data_months = cube.crosstab("Months_on_book", "Attrition_Flag", where).T
         data_months_long = data_months.T.reset_index().melt(id_vars="Months_on_book", var_name="Attrition_Flag", value_name="Count")
         fig = px.line(data_months_long, x="Months_on_book", y="Count", color="Attrition_Flag", markers=True, title="Trend of Customer Attrition by Months on Book",
                     labels={"Months_on_book": "", "Count": "", "Attrition_Flag": ""}, color_discrete_map={"Existing Customer": "blue", "Attrited Customer": "red"})
@@ -107,7 +110,7 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### c. Total Financial Products or Services")
-        data_rel = pd.crosstab(df_churn["Total_Relationship_Count"], df_churn["Attrition_Flag"]).T
+        data_rel = cube.crosstab("Total_Relationship_Count", "Attrition_Flag", where).T
         data_rel_long = data_rel.T.reset_index().melt(id_vars="Total_Relationship_Count", var_name="Attrition_Flag", value_name="Count")
         fig = px.line(data_rel_long, x="Total_Relationship_Count", y="Count", color="Attrition_Flag", markers=True, title="Trend of Customer Attrition by Total Relationship Count",
                     labels={"Total_Relationship_Count": "", "Count": "", "Attrition_Flag": ""}, color_discrete_map={"Existing Customer": "blue", "Attrited Customer": "red"})
@@ -115,7 +118,7 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### d. Number of Inactive Months")
-        data_inactive = pd.crosstab(df_churn["Months_Inactive_12_mon"], df_churn["Attrition_Flag"]).stack().reset_index()
+        data_inactive = cube.crosstab("Months_Inactive_12_mon", "Attrition_Flag", where).stack().reset_index()
         data_inactive.columns = ["Months_Inactive_12_mon", "Churn Status", "Count"]
         # Perbaikan: color diganti dari "Attrition_Flag" menjadi "Churn Status"
         fig = px.bar(data_inactive, x="Months_Inactive_12_mon", y="Count", color="Churn Status", barmode="group", title="Customer Attrition by Months of Inactivity", labels={"Months_Inactive_12_mon": "", "Count": "", "Churn Status": ""}, text_auto=True, color_discrete_sequence=px.colors.qualitative.Set1)
@@ -123,18 +126,16 @@ def app():
         fig.update_traces(textposition='outside')
         st.plotly_chart(fig, use_container_width=True)
 
-    with tabs[3]:
+    elif tab == TABS[3]:
         st.markdown("##### a. Credit Card Transaction Limit")
-        data_credit_cat = pd.crosstab(df_churn["Credit_Limit_Category"], df_churn["Attrition_Flag"]).T
+        data_credit_cat = cube.crosstab("Credit_Limit_Category", "Attrition_Flag", where).T
         data_credit_cat_long = data_credit_cat.T.reset_index().melt(id_vars="Credit_Limit_Category", var_name="Attrition_Flag", value_name="Count")
         fig = px.pie(data_credit_cat_long, names="Credit_Limit_Category", values="Count", facet_col="Attrition_Flag", hole=0.4, title="Churn Distribution by Credit Limit Category", labels={"Credit_Limit_Category": "", "Count": "", "Attrition_Flag": ""})
         fig.for_each_annotation(lambda a: a.update(text=a.text.replace('=', '')))
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### b. Total Credit Balance")
-        category_order = ['Very Low', 'Low', 'Medium', 'High', 'Very High']
-        df_churn['Total_Revolving_Bal_Category'] = pd.Categorical(df_churn['Total_Revolving_Bal_Category'], categories=category_order, ordered=True)
-        data_revolving = pd.crosstab(df_churn["Total_Revolving_Bal_Category"], df_churn["Attrition_Flag"]).T
+        data_revolving = cube.crosstab("Total_Revolving_Bal_Category", "Attrition_Flag", where).T
         data_revolving_long = data_revolving.T.reset_index().melt(id_vars="Total_Revolving_Bal_Category", var_name="Attrition_Flag", value_name="Count")
         fig = px.bar(data_revolving_long, x="Total_Revolving_Bal_Category", y="Count", color="Attrition_Flag", barmode="group", title="Churn Distribution by Total Revolving Balance Category",
                     labels={"Total_Revolving_Bal_Category": "", "Count": "", "Attrition_Flag": ""}, text_auto=True, color_discrete_sequence=px.colors.qualitative.Vivid)
@@ -143,18 +144,16 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### c. Average Funds and Credit Limit")
-        utilization_order = ['Low Utilization', 'Medium Utilization', 'High Utilization']
-        df_churn['Avg_Utilization_Category'] = pd.Categorical(df_churn['Avg_Utilization_Category'], categories=utilization_order, ordered=True)
-        avg_open_to_buy_utilization = pd.crosstab([df_churn["Avg_Open_To_Buy_Category"], df_churn["Avg_Utilization_Category"]], df_churn["Attrition_Flag"]).T
+        avg_open_to_buy_utilization = cube.crosstab(["Avg_Open_To_Buy_Category", "Avg_Utilization_Category"], "Attrition_Flag", where).T
         avg_open_to_buy_utilization_long = avg_open_to_buy_utilization.T.reset_index().melt(id_vars=["Avg_Open_To_Buy_Category", "Avg_Utilization_Category"], var_name="Attrition_Flag", value_name="Count")
         fig = px.bar(avg_open_to_buy_utilization_long, x="Count", y="Avg_Open_To_Buy_Category", color="Attrition_Flag", orientation="h", title="Churn by Avg Open To Buy & Utilization Categories", labels={"Count": "", "Avg_Open_To_Buy_Category": "", "Attrition_Flag": "", "Avg_Utilization_Category": ""}, barmode="group", facet_col="Avg_Utilization_Category", text_auto=True, custom_data=["Count"])
         fig.for_each_annotation(lambda a: a.update(text=a.text.replace("=", "")))
         fig.update_traces(hovertemplate="Count: %{customdata[0]}")
         st.plotly_chart(fig, use_container_width=True)
 
-    with tabs[4]:
+    elif tab == TABS[4]:
         st.markdown("##### a. Change in Total Spend and Number of Transactions")
-        Total_Amt_Chng = pd.crosstab(index=[df_churn["Total_Amt_Chng_Q4_Q1_Category"], df_churn["Total_Ct_Chng_Q4_Q1_Category"]], columns=df_churn["Attrition_Flag"]).reset_index()
+        Total_Amt_Chng = cube.crosstab(["Total_Amt_Chng_Q4_Q1_Category", "Total_Ct_Chng_Q4_Q1_Category"], "Attrition_Flag", where).reset_index()
         Total_Amt_Chng_long = Total_Amt_Chng.melt(id_vars=["Total_Amt_Chng_Q4_Q1_Category", "Total_Ct_Chng_Q4_Q1_Category"], var_name="Attrition_Flag", value_name="Count")
 
         Total_Amt_Chng_long["Total_Amt_Chng_Q4_Q1_Category"] = pd.Categorical(Total_Amt_Chng_long["Total_Amt_Chng_Q4_Q1_Category"], categories=['Low Amt Change', 'Medium Amt Change', 'High Amt Change', 'Very High Amt Change'], ordered=True)
@@ -167,7 +166,7 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### b. Total Amount Spend and Total Number of Transactions")
-        Total_Trans_Amt_Ct = pd.crosstab(index=[df_churn["Total_Trans_Amt_Category"], df_churn["Total_Trans_Ct_Category"]], columns=df_churn["Attrition_Flag"]).reset_index()
+        Total_Trans_Amt_Ct = cube.crosstab(["Total_Trans_Amt_Category", "Total_Trans_Ct_Category"], "Attrition_Flag", where).reset_index()
         Total_Trans_Amt_Ct_long = Total_Trans_Amt_Ct.melt(id_vars=["Total_Trans_Amt_Category", "Total_Trans_Ct_Category"], var_name="Attrition_Flag", value_name="Count")
         Total_Trans_Amt_Ct_long["Total_Trans_Amt_Category"] = pd.Categorical(Total_Trans_Amt_Ct_long["Total_Trans_Amt_Category"], categories=["Low Spend", "Medium Spend", "High Spend"], ordered=True)
         Total_Trans_Amt_Ct_long["Total_Trans_Ct_Category"] = pd.Categorical(Total_Trans_Amt_Ct_long["Total_Trans_Ct_Category"], categories=["Low Transactions", "Medium Transactions", "High Transactions"], ordered=True)
@@ -176,10 +175,9 @@ def app():
         fig.for_each_annotation(lambda a: a.update(text=a.text.replace('=', '')))
         st.plotly_chart(fig, use_container_width=True)    
 
-    with tabs[5]:
+    elif tab == TABS[5]:
         st.markdown("##### a. Card Type and Total Relationship Count")
-        card_relationship = pd.crosstab(index=[df_churn["Card_Category"], df_churn["Total_Relationship_Count"]],
-                                        columns=df_churn["Attrition_Flag"]).reset_index()
+        card_relationship = cube.crosstab(["Card_Category", "Total_Relationship_Count"], "Attrition_Flag", where).reset_index()
         card_relationship_long = card_relationship.melt(id_vars=["Card_Category", "Total_Relationship_Count"],
                                                         var_name="Attrition_Flag", value_name="Count")
         fig = px.line(card_relationship_long, x="Total_Relationship_Count", y="Count", color="Attrition_Flag", facet_col="Card_Category",markers=True, title="Churn Distribution by Card Category and Total Relationship Count", labels={"Total_Relationship_Count": "", "Count": "", "Attrition_Flag": "", "Card_Category": ""}, color_discrete_map={"Attrited Customer": "red", "Existing Customer": "blue"})
@@ -187,8 +185,7 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("##### b. Total Inactive Months and Bank Interactions")
-        Inactive_Contacts = pd.crosstab([df_churn["Months_Inactive_12_mon"], df_churn["Contacts_Count_12_mon"]],
-                                        df_churn["Attrition_Flag"]).reset_index()
+        Inactive_Contacts = cube.crosstab(["Months_Inactive_12_mon", "Contacts_Count_12_mon"], "Attrition_Flag", where).reset_index()
         Inactive_Contacts_long = Inactive_Contacts.melt(id_vars=["Months_Inactive_12_mon", "Contacts_Count_12_mon"],
                                                         var_name="Attrition_Flag", value_name="Count")
         fig = px.bar(Inactive_Contacts_long, x="Months_Inactive_12_mon", y="Count", color="Attrition_Flag", barmode="stack", facet_col="Contacts_Count_12_mon", title="Churn Distribution by Months Inactive and Contacts Count",
@@ -196,8 +193,38 @@ def app():
         fig.for_each_annotation(lambda a: a.update(text=a.text.replace('=', '')))
         st.plotly_chart(fig, use_container_width=True)
 
+def app():
+    st.title("📊 Customer Dashboard - Bank Credit Card")
+    
+    # Load dataset and its count cube (shared across sessions, reloaded when the file changes)
+    df_churn = cached_dataset(DATASET, prepare_churn)
+    cube = cached_dataset(DATASET, prepare_churn, build=build_churn_cube)
+
+    # Filter
+    st.sidebar.header("🔍 Filter Options")
+    gender_filter = st.sidebar.multiselect("Select Gender:", list(cube.levels["Gender"]), default=list(cube.levels["Gender"]),  help="Filter data based on customer's gender.")
+    churn_filter = st.sidebar.multiselect("Churn Status:", list(cube.levels["Attrition_Flag"]), default=list(cube.levels["Attrition_Flag"]), help="Choose whether to display churned or existing customers.")
+
+    age_filter = range_slider(cube, "Customer_Age", "Customer Age Range:", "years", "Select a range of customer ages to include in the analysis.")
+    trans_ct_filter = range_slider(cube, "Total_Trans_Ct", "Total Transactions Range:", "transactions", "Filter by the number of transactions made by customers.")
+    trans_amt_filter = range_slider(cube, "Total_Trans_Amt", "Total Transaction Amount Range:", "", "Select a range of total transaction amounts for filtering customers.")
+
+    # Filter selection: charts read counts from the cube, only the table below filters rows
+    where = {
+        "Gender": gender_filter,
+        "Attrition_Flag": churn_filter,
+        "Customer_Age": age_filter,
+        "Total_Trans_Ct": trans_ct_filter,
+        "Total_Trans_Amt": trans_amt_filter,
+    }
+
+    # Tab layout: only the selected tab is computed, memoized per filter selection
+    tab = lazy_tabs(TABS, key="bank_dashboard_tab")
+    render_dashboard_tab(tab, where, dataset_version(DATASET), cube)
+
+    # Only the visible page of the selected rows is taken from the frame
     st.markdown("#### Data Displayed")
-    st.dataframe(df_churn)
+    paged_dataframe(df_churn, "bank_dashboard_rows", rows=np.flatnonzero(cube.mask(df_churn, where)))
 
 if __name__ == "__main__":
     app()
@@ -1,20 +1,43 @@
 import streamlit as st
 from PIL import Image
-import pandas as pd
 import numpy as np
-import joblib
+from shared.feature_schema import schema_for_model
+from shared.history import render_history, session_history
+from shared.model_registry import get_model, model_info, describe, preload_available
+from shared.paths import resolve
+from shared.prediction_cache import cached_predict, prediction_cache
+from shared.schema_form import field_input
+from shared.svm_fast import MAX_PROBA_DIFF, fast_path_for, prefer_fast_svm
+from shared.tree_compiler import prefer_compiled
 import plotly.graph_objects as go
 
-st.cache_data.clear()
-st.cache_resource.clear()
+XGB_MODEL = "Bank_Card/models/xgb_model.pkl"
+SVM_MODEL = "Bank_Card/models/svm_model.pkl"
+
 
 def app():
     st.title("📈 Churn Prediction - Bank Credit Card")
     st.info("Prediction model using **XGBoost** or **SVM** based on credit card customer data.")
 
+    # Every model the selector can pick is loaded once per process, so switching models never waits on unpickling
+    preload_available([prefer_compiled(XGB_MODEL), prefer_fast_svm(SVM_MODEL), fast_path_for(SVM_MODEL, approximate=True)])
+
     model_option = st.radio("Select Model", ["XGBoost", "SVM"], horizontal=True, help="Choose a prediction model to use.")
-    model_path = "Bank_Card/models/xgb_model.pkl" if model_option == "XGBoost" else "Bank_Card/models/svm_model.pkl"
-    model = joblib.load(model_path)
+    if model_option == "XGBoost":
+        model_path = prefer_compiled(XGB_MODEL)
+    else:
+        # The approximation is only exported when its probabilities are within MAX_PROBA_DIFF (python -m shared.svm_fast export)
+        approximate = resolve(fast_path_for(SVM_MODEL, approximate=True)).exists() and st.toggle(
+            "Approximate SVM (Nyström)", help="Faster kernel evaluation against a few hundred landmarks instead of every support vector.")
+        model_path = prefer_fast_svm(SVM_MODEL, approximate)
+    st.caption(describe(model_info(model_path)))
+    meta = getattr(get_model(model_path), "meta", {})
+    approximate_proba = meta.get("mode") == "nystroem"
+    if approximate_proba:
+        st.caption(f"Nyström approximation: {meta['accuracy']:.2%} test accuracy vs {meta['exact_accuracy']:.2%} for the exact SVM "
+                   f"({(meta['accuracy'] - meta['exact_accuracy']) * 100:+.2f} pp), {meta['agreement']:.2%} label agreement, "
+                   f"churn probabilities within {meta['max_proba_diff'] * 100:.1f} pp of the exact SVM on the test set "
+                   f"(limit {MAX_PROBA_DIFF * 100:.0f} pp).")
 
     if model_option == "XGBoost":
         with st.expander("ℹ️ XGBoost Model Performance"):
@@ -52,11 +75,10 @@ def app():
             with col2:
                 st.image(Image.open("Bank_Card/img/output4.png"), caption="SHAP Summary Plot", use_container_width=True)
 
-    df_ref = pd.read_csv("Bank_Card/dataset/df_churn_test_scaled.csv")
-    expected_cols = [col for col in df_ref.columns if col != "Attrition_Flag"]
+    # Column order and one-hot vocabularies come from the compiled schema (python -m shared.build_feature_schemas)
+    schema = schema_for_model(model_path)
 
-    if "history" not in st.session_state:
-        st.session_state.history = []
+    history = session_history("history")
 
     st.markdown("#### Customer Form")
 
@@ -65,39 +87,30 @@ def app():
     row3 = st.columns(4)
     row4 = st.columns(4)
 
-    age = row1[0].slider("Customer Age", 26, 73, 40, help="Customer's age in years.")
-    gender = row1[1].selectbox("Gender", ["M", "F"], help="Customer's gender.")
-    dependents = row1[2].slider("Number of Dependents", 0, 5, 1, help="Number of dependents the customer has.")
-    total_rel = row1[3].slider("Total Relationship Count", 1, 6, 3, help="Total number of products/services used.")
-
-    months_inactive = row2[0].slider("Months Inactive (Last 12 Months)", 0, 6, 2, help="Months the customer was inactive.")
-    contacts = row2[1].slider("Contact Count (Last 12 Months)", 0, 6, 2, help="Times bank contacted the customer.")
-    credit_limit = row2[2].slider("Credit Limit", 1438.0, 34516.0, 10000.0, help="Credit limit available.")
-    total_revolving = row2[3].slider("Total Revolving Balance", 0.0, 2517.0, 800.0, help="Unpaid revolving balance.")
-
-    amt_chg = row3[0].slider("Total Amount Change (Q4/Q1)", 0.0, 3.397, 1.2, help="Change in amount from Q1 to Q4.")
-    ct_chg = row3[1].slider("Transaction Count Change (Q4/Q1)", 0.0, 3.714, 0.8, help="Change in count from Q1 to Q4.")    
-    trans_amt = row3[2].slider("Total Transaction Amount", 510.0, 18484.0, 5000.0, help="Total transaction amount.")
-    trans_ct = row3[3].slider("Total Transaction Count", 10, 139, 60, help="Total number of transactions.")
-
-    util_ratio = row4[0].slider("Utilization Ratio", 0.0, 0.999, 0.3, help="Credit utilization ratio.")
+    age = field_input(row1[0], schema, "Customer_Age", "Customer Age", help="Customer's age in years.")
+    gender = field_input(row1[1], schema, "Gender", "Gender", help="Customer's gender.")
+    dependents = field_input(row1[2], schema, "Dependent_count", "Number of Dependents", help="Number of dependents the customer has.")
+    total_rel = field_input(row1[3], schema, "Total_Relationship_Count", "Total Relationship Count", help="Total number of products/services used.")
 
-    education = row4[1].selectbox("Education Level", [
-        "College", "Graduate", "High School", "Post-Graduate", "Uneducated", "Unknown"
-    ], help="Highest education level.")
+    months_inactive = field_input(row2[0], schema, "Months_Inactive_12_mon", "Months Inactive (Last 12 Months)", help="Months the customer was inactive.")
+    contacts = field_input(row2[1], schema, "Contacts_Count_12_mon", "Contact Count (Last 12 Months)", help="Times bank contacted the customer.")
+    credit_limit = field_input(row2[2], schema, "Credit_Limit", "Credit Limit", help="Credit limit available.")
+    total_revolving = field_input(row2[3], schema, "Total_Revolving_Bal", "Total Revolving Balance", help="Unpaid revolving balance.")
 
-    marital = row4[2].selectbox("Marital Status", [
-        "Divorced", "Married", "Single", "Unknown"
-    ], help="Marital status of the customer.")
+    amt_chg = field_input(row3[0], schema, "Total_Amt_Chng_Q4_Q1", "Total Amount Change (Q4/Q1)", help="Change in amount from Q1 to Q4.")
+    ct_chg = field_input(row3[1], schema, "Total_Ct_Chng_Q4_Q1", "Transaction Count Change (Q4/Q1)", help="Change in count from Q1 to Q4.")
+    trans_amt = field_input(row3[2], schema, "Total_Trans_Amt", "Total Transaction Amount", help="Total transaction amount.")
+    trans_ct = field_input(row3[3], schema, "Total_Trans_Ct", "Total Transaction Count", help="Total number of transactions.")
 
-    income = row4[3].selectbox("Income Category", [
-        "$120K +", "$40K - $60K", "$60K - $80K", "$80K - $120K", "Less than $40K", "Unknown"
-    ], help="Annual income category.")
+    util_ratio = field_input(row4[0], schema, "Avg_Utilization_Ratio", "Utilization Ratio", help="Credit utilization ratio.")
+    education = field_input(row4[1], schema, "Education_Level", "Education Level", help="Highest education level.")
+    marital = field_input(row4[2], schema, "Marital_Status", "Marital Status", help="Marital status of the customer.")
+    income = field_input(row4[3], schema, "Income_Category", "Income Category", help="Annual income category.")
 
-    # Construct feature dictionary
+    # Raw customer fields, encoded with the schema's one-hot vocabularies
     raw_input = {
         "Customer_Age": age,
-        "Gender": 1 if gender == "F" else 0,
+        "Gender": gender,
         "Dependent_count": dependents,
         "Total_Relationship_Count": total_rel,
         "Months_Inactive_12_mon": months_inactive,
@@ -109,42 +122,32 @@ def app():
         "Total_Trans_Ct": trans_ct,
         "Total_Ct_Chng_Q4_Q1": ct_chg,
         "Avg_Utilization_Ratio": util_ratio,
+        "Education_Level": education,
+        "Marital_Status": marital,
+        "Income_Category": income,
     }
-
-    for level in ["College", "Graduate", "High School", "Post-Graduate", "Uneducated", "Unknown"]:
-        raw_input[f"Education_Level_{level}"] = 1 if education == level else 0
-
-    for status in ["Divorced", "Married", "Single", "Unknown"]:
-        raw_input[f"Marital_Status_{status}"] = 1 if marital == status else 0
-
-    for inc in ["$120K +", "$40K - $60K", "$60K - $80K", "$80K - $120K", "Less than $40K", "Unknown"]:
-        raw_input[f"Income_Category_{inc}"] = 1 if income == inc else 0
-
-    input_df = pd.DataFrame([raw_input])
+    data = schema.encode(raw_input)
+    input_df = schema.to_frame(data)
 
     with st.expander("📋 Input Summary"):
         st.dataframe(input_df)
 
-    for col in expected_cols:
-        if col not in input_df.columns:
-            input_df[col] = 0
-    data = input_df[expected_cols]
-
     if st.button("Predict Churn"):
-        pred = model.predict(data)
-        prob = model.predict_proba(data)
+        pred = cached_predict(model_path, data)
+        prob = cached_predict(model_path, data, "predict_proba")
         label = "Attrited (Churn)" if pred[0] == 1 else "Existing (Not Churn)"
         churn_prob = round(prob[0][1] * 100, 2)
         not_churn_prob = round(prob[0][0] * 100, 2)
 
         st.warning(f"**Prediction Result:** {label}")
 
+        approx = " (approx.)" if approximate_proba else ""
         col1, col2, col3 = st.columns([1, 1, 2])
         with col1:
-            st.markdown("#### Churn Probability")
+            st.markdown(f"#### Churn Probability{approx}")
             st.markdown(f"<h3 style='color:red; font-weight:bold;'>{churn_prob:.2f}%</h3>", unsafe_allow_html=True)
         with col2:
-            st.markdown("#### Not Churn Probability")
+            st.markdown(f"#### Not Churn Probability{approx}")
             st.markdown(f"<h3 style='color:green; font-weight:bold;'>{not_churn_prob:.2f}%</h3>", unsafe_allow_html=True)
         with col3:
             fig = go.Figure(go.Indicator(
@@ -166,17 +169,15 @@ def app():
 
         input_df["Churn Probability"] = churn_prob
         input_df["Not Churn Probability"] = not_churn_prob
-        st.session_state.history.append(input_df)
+        history.append(input_df.iloc[0].to_dict())
+
+    st.caption(prediction_cache.describe())
 
     st.markdown("#### History Data")
-    if st.session_state.history:
-        hist_df = pd.concat(st.session_state.history, ignore_index=True)
-        st.dataframe(hist_df)
-    else:
-        st.info("No input history available.")
+    render_history(history, "history")
 
     if st.button("Reset History"):
-        st.session_state.history = []
+        history.clear()
         st.rerun()
 
 if __name__ == "__main__":
@@ -1,13 +1,16 @@
+import sys
+from pathlib import Path
 import streamlit as st
 from streamlit_option_menu import option_menu
-from my_pages import about, contact, dashboard_churn, dashboard_sentiment, prediction_churn, prediction_sentiment
+# Make the repo-level `shared` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.admin import render_cache_admin
+# Pages are imported when first selected (shared.page_loader), not at startup
+from shared.page_loader import load_page
 st.set_page_config(page_title="Portofolio", page_icon="📌", layout="centered")
 # import os
 # st.write("Current working directory:", os.getcwd())
 # st.write("Files in cwd:", os.listdir())
-# Clear Streamlit cache (you can clear cache programmatically here if needed)
-st.cache_data.clear()
-st.cache_resource.clear() 
 with st.sidebar:
     st.title("Navigation")
     
@@ -31,18 +34,21 @@ with st.sidebar:
             format_func=lambda x: f"📋 {x}" if "Churn" in x else f"💬 {x}")
 
 if menu == "About":
-    about.about_me()
+    load_page("my_pages.about").about_me()
 elif menu == "Dashboard" and submenu == "Customer Churn":
-    dashboard_churn.dashboard_churn()
+    load_page("my_pages.dashboard_churn").dashboard_churn()
 elif menu == "Dashboard" and submenu == "Customer Satisfaction":
-    dashboard_sentiment.dashboard_sentiment()
+    load_page("my_pages.dashboard_sentiment").dashboard_sentiment()
 elif menu == "Prediction" and submenu == "Customer Churn":
-    prediction_churn.prediction_churn()
+    load_page("my_pages.prediction_churn").prediction_churn()
 elif menu == "Prediction" and submenu == "Customer Satisfaction":
-    prediction_sentiment.prediction_sentiment()
+    load_page("my_pages.prediction_sentiment").prediction_sentiment()
 elif menu == "Contact":
-    contact.contact_me()
+    load_page("my_pages.contact").contact_me()
 
 if menu != "Contact":
     st.markdown("---")
-    st.write(f"**You are viewing the {menu}{' - ' + submenu if submenu else ''} page!**")
\ No newline at end of file
+    st.write(f"**You are viewing the {menu}{' - ' + submenu if submenu else ''} page!**")
+
+# Cache state and flush controls (admin only), rendered after the page so the numbers are current
+render_cache_admin()
@@ -2,9 +2,6 @@ import streamlit as st
 # import os
 # st.write("Current working directory:", os.getcwd())
 # st.write("Files in cwd:", os.listdir())
-# Clear Streamlit cache (you can clear cache programmatically here if needed)
-st.cache_data.clear()
-st.cache_resource.clear() 
 
 def contact_me():
 
@@ -2,31 +2,35 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import numpy as np
+from shared.datasets import cached_dataset, cached_rows, dataset_version
+from shared.lazy_tabs import lazy_tabs, memoized_tab
+from shared.rendering import histogram, paged_dataframe
 # import os
 # st.write("Current working directory:", os.getcwd())
 # st.write("Files in cwd:", os.listdir())
-# Clear Streamlit cache (you can clear cache programmatically here if needed)
-st.cache_data.clear()
-st.cache_resource.clear() 
 
-def dashboard_churn():
-    st.title("Customer Churn Dashboard")    
-    df = pd.read_csv("Project_/dataset/df_churn_cleaned.csv")
-    df["Exited"] = df["Exited"].replace({0: "No Churn", 1: "Churn"})
+DATASET = "Project_/dataset/df_churn_cleaned.csv"
+TABS = ["📊 Overview", "👥 Customer Characteristics", "📅 Age & Tenure", "💰 Financial Factors", "🏦 Finance & Activity"]
+# Columns each tab reads (prepare_churn needs Exited)
+TAB_COLUMNS = {
+    TABS[0]: ["Exited"],
+    TABS[1]: ["Exited", "Gender", "Geography"],
+    TABS[2]: ["Exited", "AgeGroup", "Age_ActiveStatus", "TenureGroup"],
+    TABS[3]: ["Exited", "BalanceCategory", "CreditScoreGroup"],
+    TABS[4]: ["Exited", "CreditScore", "NumOfProducts", "HasCrCard", "IsActiveMember", "EstimatedSalaryCategory"],
+}
 
-    st.sidebar.header("🔍 Filter Options")
-    gender_filter = st.sidebar.selectbox("Select Gender:", options=["All"] + list(df["Gender"].unique()))
-    geo_filter = st.sidebar.selectbox("Select Geography:", options=["All"] + list(df["Geography"].unique()))
+def prepare_churn(df):
+    df["Exited"] = df["Exited"].replace({0: "No Churn", 1: "Churn"})
+    return df
 
-    filtered_df = df.copy()
-    if gender_filter != "All":
-        filtered_df = filtered_df[filtered_df["Gender"] == gender_filter]
-    if geo_filter != "All":
-        filtered_df = filtered_df[filtered_df["Geography"] == geo_filter]
+@memoized_tab
+def render_dashboard_tab(tab, filters, version, _rows):
+    # Only this tab's columns are loaded, and the selected rows taken, on a cache miss
+    filtered_df = cached_rows(DATASET, _rows, TAB_COLUMNS[tab], prepare_churn)
 
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Overview", "👥 Customer Characteristics", "📅 Age & Tenure", "💰 Financial Factors", "🏦 Finance & Activity"])
-    
-    with tab1:
+    if tab == TABS[0]:
         st.subheader("Churn Status Distribution")
         data = filtered_df["Exited"].value_counts().reset_index()
         data.columns = ["Churn Status", "Count"]
@@ -36,7 +40,7 @@ def dashboard_churn():
         fig.update_traces(textposition='outside')
         st.plotly_chart(fig, use_container_width=True)
     
-    with tab2:
+    elif tab == TABS[1]:
         st.subheader("Churn and Customer Characteristics")
         data_gender_geography = pd.crosstab([filtered_df["Gender"], filtered_df["Geography"]], filtered_df["Exited"]).T
         data_long = data_gender_geography.T.stack().reset_index()
@@ -47,7 +51,7 @@ def dashboard_churn():
         fig.update_traces(textposition='outside')
         st.plotly_chart(fig, use_container_width=True)
 
-    with tab3:
+    elif tab == TABS[2]:
         st.subheader("Churn by Age and Tenure")
         
         # a. Age Group and Activity Status
@@ -70,7 +74,7 @@ def dashboard_churn():
         fig.update_layout(legend_title_text="")
         st.plotly_chart(fig, use_container_width=True)
 
-    with tab4:
+    elif tab == TABS[3]:
         st.subheader("Churn and Financial Factors")
         
         # a. Balance Category
@@ -90,18 +94,12 @@ def dashboard_churn():
         fig.update_layout(yaxis_title="", legend_title_text="")
         st.plotly_chart(fig, use_container_width=True)
 
-    with tab5:
+    elif tab == TABS[4]:
         st.subheader("Churn and Financial Activity")
         
         # a. Credit Score and Bank Products Used
         st.markdown("Credit Score and Bank Products Used")
-        skor_jumlah_produk = pd.crosstab(
-            index=[filtered_df["CreditScore"], filtered_df["NumOfProducts"]],
-            columns=filtered_df["Exited"]
-        )
-        data_long = skor_jumlah_produk.stack().reset_index()
-        data_long.columns = ['CreditScore', 'NumOfProducts', 'Exited', 'Count']
-        fig = px.histogram(data_long, x='CreditScore', y='Count', color='Exited', facet_col='NumOfProducts', nbins=20)
+        fig = histogram(filtered_df, x='CreditScore', color='Exited', facet_col='NumOfProducts', nbins=20)
         fig.update_layout(yaxis_title="", legend_title_text="")        
         st.plotly_chart(fig, use_container_width=True)
         
@@ -119,5 +117,24 @@ def dashboard_churn():
         fig.update_traces(textposition='outside')
         st.plotly_chart(fig)
 
+def dashboard_churn():
+    st.title("Customer Churn Dashboard")    
+    df = cached_dataset(DATASET, prepare_churn)
+
+    st.sidebar.header("🔍 Filter Options")
+    gender_filter = st.sidebar.selectbox("Select Gender:", options=["All"] + list(df["Gender"].unique()))
+    geo_filter = st.sidebar.selectbox("Select Geography:", options=["All"] + list(df["Geography"].unique()))
+
+    selected = np.ones(len(df), dtype=bool)
+    if gender_filter != "All":
+        selected &= (df["Gender"] == gender_filter).to_numpy()
+    if geo_filter != "All":
+        selected &= (df["Geography"] == geo_filter).to_numpy()
+    rows = np.flatnonzero(selected)
+
+    # Only the selected tab is computed, memoized per filter selection
+    tab = lazy_tabs(TABS, key="churn_dashboard_tab")
+    render_dashboard_tab(tab, (gender_filter, geo_filter), dataset_version(DATASET), rows)
+
     st.subheader("📄 Data Displayed")
-    st.dataframe(filtered_df)
+    paged_dataframe(df, "churn_dashboard_rows", rows=rows)
@@ -1,29 +1,29 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import joblib
+from shared.feature_schema import schema_for_model
+from shared.history import render_history, session_history
+from shared.model_registry import model_info, describe
+from shared.prediction_cache import cached_predict, prediction_cache
+from shared.schema_form import field_input
+from shared.tree_compiler import prefer_compiled
 import plotly.express as px
 import plotly.graph_objects as go
 # import os
 # st.write("Current working directory:", os.getcwd())
 # st.write("Files in cwd:", os.listdir())
-# Clear Streamlit cache (you can clear cache programmatically here if needed)
-# Clear Streamlit cache
-st.cache_data.clear()
-st.cache_resource.clear()
 
 def prediction_churn():
     st.title("Churn Prediction")
     st.info("Model Prediction using **XGBoost**")
 
     # Load the model and reference dataset to ensure column order
-    model = joblib.load("Project_/models/xgboost_model.pkl")
-    df_ref = pd.read_csv("Project_/dataset/df_churn_processed.csv")
-    expected_cols = [col for col in df_ref.columns.tolist() if col != "Exited"]
+    model_path = prefer_compiled("Project_/models/xgboost_model.pkl")
+    st.caption(describe(model_info(model_path)))
+    # Column order and one-hot vocabularies come from the compiled schema (python -m shared.build_feature_schemas)
+    schema = schema_for_model(model_path)
 
     # Initialize session state to store input history
-    if "history" not in st.session_state:
-        st.session_state.history = []
+    history = session_history("history")
 
     st.markdown("### Customer Data Input")
     st.info("Please fill in the data below according to the instructions.")
@@ -32,49 +32,40 @@ def prediction_churn():
     row2 = st.columns(5)
 
     # First row: 5 inputs 
-    has_cr_card = row1[0].selectbox("Has Credit Card?", ["Yes", "No"], help="Select 'Yes' if the customer has a credit card.")
-    credit_score = row1[1].slider("Credit Score", 300, 900, 650, help="The customer's credit score (300-900).")
-    tenure = row1[2].slider("Tenure (years)", 0, 10, 5, help="How long the customer has been subscribed (in years).")
-    balance = row1[3].slider("Balance", 0.0, 250000.0, 50000.0, help="The customer's account balance.")
-    num_of_products = row1[4].selectbox("Number of Products", [1, 2, 3, 4], help="Number of bank products the customer has.")
+    has_cr_card = field_input(row1[0], schema, "HasCrCard", "Has Credit Card?", help="Select 'Yes' if the customer has a credit card.")
+    credit_score = field_input(row1[1], schema, "CreditScore", "Credit Score", help="The customer's credit score (300-900).")
+    tenure = field_input(row1[2], schema, "Tenure", "Tenure (years)", help="How long the customer has been subscribed (in years).")
+    balance = field_input(row1[3], schema, "Balance", "Balance", help="The customer's account balance.")
+    num_of_products = field_input(row1[4], schema, "NumOfProducts", "Number of Products", help="Number of bank products the customer has.")
 
     # Second row: 5 
-    is_active_member = row2[0].selectbox("Is Active Member?", ["Yes", "No"], help="Select 'Yes' if the customer is active.")
-    age = row2[1].slider("Age", 18, 80, 40, help="The customer's age in years.")        
-    estimated_salary = row2[2].slider("Estimated Salary", 0.0, 200000.0, 50000.0, help="The customer's estimated annual salary.")
-    geography = row2[3].selectbox("Geography", ["France", "Germany", "Spain"], help="The country where the customer resides.")
-    gender = row2[4].selectbox("Gender", ["Female", "Male"], help="The customer's gender.")
-
-    # Create DataFrame with raw input based on the expected order
-    raw_input = pd.DataFrame({
-        "HasCrCard": [1 if has_cr_card == "Yes" else 0],
-        "CreditScore": [credit_score],
-        "Tenure": [tenure],
-        "Balance": [balance],
-        "NumOfProducts": [num_of_products],
-        "Age": [age],
-        "IsActiveMember": [1 if is_active_member == "Yes" else 0],
-        "EstimatedSalary": [estimated_salary],
-        "Geography_France": [1 if geography == "France" else 0],
-        "Geography_Germany": [1 if geography == "Germany" else 0],
-        "Geography_Spain": [1 if geography == "Spain" else 0],
-        "Gender_Female": [1 if gender == "Female" else 0],
-        "Gender_Male": [1 if gender == "Male" else 0]
+    is_active_member = field_input(row2[0], schema, "IsActiveMember", "Is Active Member?", help="Select 'Yes' if the customer is active.")
+    age = field_input(row2[1], schema, "Age", "Age", help="The customer's age in years.")
+    estimated_salary = field_input(row2[2], schema, "EstimatedSalary", "Estimated Salary", help="The customer's estimated annual salary.")
+    geography = field_input(row2[3], schema, "Geography", "Geography", help="The country where the customer resides.")
+    gender = field_input(row2[4], schema, "Gender", "Gender", help="The customer's gender.")
+
+    # Raw customer fields, encoded with the schema's one-hot vocabularies
+    data = schema.encode({
+        "HasCrCard": has_cr_card,
+        "CreditScore": credit_score,
+        "Tenure": tenure,
+        "Balance": balance,
+        "NumOfProducts": num_of_products,
+        "Age": age,
+        "IsActiveMember": is_active_member,
+        "EstimatedSalary": estimated_salary,
+        "Geography": geography,
+        "Gender": gender,
     })
+    raw_input = schema.to_frame(data)
 
     st.markdown("#### Input Data Summary")
     st.dataframe(raw_input)
 
-    # Ensure all features from the training dataset are present
-    for col in expected_cols:
-        if col not in raw_input.columns:
-            raw_input[col] = 0
-
-    data = raw_input[expected_cols]
-
     if st.button("Predict Churn"):
-        pred = model.predict(data)
-        prob = model.predict_proba(data)
+        pred = cached_predict(model_path, data)
+        prob = cached_predict(model_path, data, "predict_proba")
         churn_label = "Churn" if pred[0] == 1 else "Not Churn"
         churn_prob = round(prob[0][1] * 100, 2)
         not_churn_prob = round(prob[0][0] * 100, 2)
@@ -108,26 +99,16 @@ def prediction_churn():
         # Save to history with the prediction result
         raw_input["Not Churn Probability"] = not_churn_prob
         raw_input["Churn Probability"] = churn_prob
-        st.session_state.history.append(raw_input)
+        history.append(raw_input.iloc[0].to_dict())
+
+    st.caption(prediction_cache.describe())
 
     # Display input history
     st.markdown("#### Input History")
-    if isinstance(st.session_state.history, list) and all(isinstance(df, pd.DataFrame) for df in st.session_state.history):
-        if st.session_state.history:  # Check if the list is not empty
-            history_df = pd.concat(st.session_state.history, ignore_index=True)
-        else:
-            history_df = pd.DataFrame()
-    else:
-        history_df = pd.DataFrame()
-        st.warning("Warning: `st.session_state.history` contains invalid data and has been reset.")
-
-    if not history_df.empty:  
-        st.dataframe(history_df)  
-    else:
-        st.info("No history available.") 
+    render_history(history, "history", "No history available.")
 
     if st.button("🔄 Reset History"):
-        st.session_state.history = []
+        history.clear()
         st.rerun()
 
 if __name__ == "__main__":
@@ -1,34 +1,25 @@
 import streamlit as st
 import pandas as pd
-import re
 import plotly.express as px
-import nltk
 import os
-from nltk.sentiment import SentimentIntensityAnalyzer
+from shared.datasets import cached_dataset
+from shared.history import render_history, session_history
+from shared.rendering import paged_dataframe
+from shared.review_index import ReviewIndex
+from shared.sentiment import REVIEWS_DATASET, cleansing_text, predict_vader, scored_reviews
 # st.write("Current working directory:", os.getcwd())
 # st.write("Files in cwd:", os.listdir())
-# Clear Streamlit cache (you can clear cache programmatically here if needed)
-st.cache_data.clear()
-st.cache_resource.clear()
 
-# Download lexicon untuk analisis sentimen
-nltk.download("vader_lexicon")
+# Kolom turunan dataset: teks bersih, skor dan label VADER (dari score store; hanya teks baru/berubah yang dihitung)
+def score_reviews(df):
+    df["overall_text"] = df["overall_text"].fillna("").astype(str)
+    return scored_reviews(df[df["overall_text"].str.strip() != ""], REVIEWS_DATASET)
 
-# Inisialisasi model VADER
-vader_model = SentimentIntensityAnalyzer()
+# Indeks token untuk pencarian ulasan (dibangun sekali per versi dataset, dibagi antar sesi)
+def build_review_index(df):
+    return ReviewIndex.from_frame(df)
 
-# Fungsi membersihkan teks
-def cleansing_text(text):
-    text = re.sub(r"\s+", " ", text).strip()
-    text = re.sub(r"http\S+|www\S+", "http", text)
-    text = re.sub(r"@\S+", "@user", text)
-    return text
-
-# Fungsi prediksi sentimen menggunakan VADER
-def predict_vader(text):
-    score = vader_model.polarity_scores(text)
-    compound = score["compound"]
-    return "Positive" if compound >= 0.05 else "Negative" if compound <= -0.05 else "Neutral"
+REVIEW_PAGE_SIZE = 20
 
 # Menampilkan hasil prediksi dengan ikon emosi
 def show_prediction_result(sentiment):
@@ -46,24 +37,23 @@ def prediction_sentiment():
 
     tab1, tab2 = st.tabs(["📊 Default Data", "✍️ Manual Input"])
 
-    if "history" not in st.session_state:
-        st.session_state["history"] = []
-
-    if "manual_history" not in st.session_state:
-        st.session_state["manual_history"] = []
+    # "history" belongs to the churn page; each review is recorded once
+    history = session_history("sentiment_history", unique=True)
+    manual_history = session_history("manual_history", unique=True)
 
     if "show_reset_button" not in st.session_state:
         st.session_state["show_reset_button"] = False
 
     with tab1:
-        file_path = "Project_/dataset/ticket_system_review_processed.csv"
+        file_path = REVIEWS_DATASET
 
         if not os.path.exists(file_path):
             st.error(f"⚠️ Dataset not found: {file_path}")
             return
 
         try:
-            df = pd.read_csv(file_path, parse_dates=["date_of_survey"])
+            df = cached_dataset(file_path, score_reviews, columns=["overall_text"])
+            review_index = cached_dataset(file_path, score_reviews, columns=["overall_text"], build=build_review_index)
         except Exception as e:
             st.error(f"⚠️ Failed to load dataset. Error: {e}")
             return
@@ -72,34 +62,32 @@ def prediction_sentiment():
             st.error("⚠️ The dataset must have a column 'overall_text'.")
             return
 
-        df["overall_text"] = df["overall_text"].fillna("").astype(str)
-        df["clean_text"] = df["overall_text"].apply(cleansing_text)
-        df["predicted_sentiment"] = df["clean_text"].apply(predict_vader)
-
-        df = df[df["overall_text"].str.strip() != ""]
-
         selected_reviews = []
 
         def sentiment_tab_ui(sentiment_label):
             nonlocal selected_reviews
-            filtered_df = df[df["predicted_sentiment"] == sentiment_label]
-
-            if filtered_df.empty:
+            if not (review_index.labels == sentiment_label).any():
                 st.warning(f"No data available with {sentiment_label} sentiment.")
                 return
 
-            st.dataframe(filtered_df[["overall_text"]], height=300)
+            # Ranked matches from the index; only the current page is sent to the browser
+            query = st.text_input("Search reviews:", key=f"review_search_{sentiment_label}",
+                                  placeholder="e.g. support, easy to use")
+            matches = review_index.search(query, sentiment_label)
+            page_df = paged_dataframe(df[["overall_text"]], f"reviews_{sentiment_label}", rows=matches,
+                                      page_size=REVIEW_PAGE_SIZE, height=300)
+            if page_df.empty:
+                return
 
             selected_reviews = st.multiselect(
-                f"Select reviews with {sentiment_label} sentiment:",
-                filtered_df["overall_text"].unique(),
+                f"Select reviews with {sentiment_label} sentiment (current page):",
+                page_df["overall_text"].unique(),
             )
 
             if selected_reviews:
                 for review in selected_reviews:
                     sentiment_result = predict_vader(review)
-                    if {"Review": review, "Sentiment": sentiment_result} not in st.session_state["history"]:
-                        st.session_state["history"].append({"Review": review, "Sentiment": sentiment_result})
+                    if history.append({"Review": review, "Sentiment": sentiment_result}):
                         st.session_state["show_reset_button"] = True
 
         tab_pos, tab_neu, tab_neg = st.tabs(["😀 Positive", "😐 Neutral", "😡 Negative"])
@@ -113,26 +101,23 @@ def prediction_sentiment():
         with tab_neg:
             sentiment_tab_ui("Negative")
 
-        if st.session_state["history"]:
+        if history:
             st.markdown("#### Prediction Results")
-            history_df = pd.DataFrame(st.session_state["history"])
-
-            if not history_df.empty:
-                sentiment_counts = history_df["Sentiment"].value_counts().reset_index()
-                sentiment_counts.columns = ["Sentiment", "Count"]
-                fig_pie = px.pie(sentiment_counts, names="Sentiment", values="Count", title="Sentiment Distribution")
-                st.plotly_chart(fig_pie)
+            sentiment_counts = pd.Series(history.column("Sentiment")).value_counts().reset_index()
+            sentiment_counts.columns = ["Sentiment", "Count"]
+            fig_pie = px.pie(sentiment_counts, names="Sentiment", values="Count", title="Sentiment Distribution")
+            st.plotly_chart(fig_pie)
 
-                st.markdown("#### Prediction History")
-                st.dataframe(history_df, use_container_width=True)
+            st.markdown("#### Prediction History")
+            render_history(history, "sentiment_history", use_container_width=True)
 
-                if selected_reviews:
-                    st.warning("⚠️ Reset is disabled while reviews are selected. Please deselect all reviews first.")
-                elif st.session_state["show_reset_button"]:
-                    if st.button("🔄 Reset History", help="If the reset button doesn't work, deselect all selected reviews first."):
-                        st.session_state["history"] = []
-                        st.session_state["show_reset_button"] = False
-                        st.rerun()
+            if selected_reviews:
+                st.warning("⚠️ Reset is disabled while reviews are selected. Please deselect all reviews first.")
+            elif st.session_state["show_reset_button"]:
+                if st.button("🔄 Reset History", help="If the reset button doesn't work, deselect all selected reviews first."):
+                    history.clear()
+                    st.session_state["show_reset_button"] = False
+                    st.rerun()
 
     with tab2:
         review_text = st.text_area(
@@ -147,20 +132,18 @@ def prediction_sentiment():
                 sentiment_result = predict_vader(clean_text)
                 show_prediction_result(sentiment_result)
 
-                if {"Review": review_text, "Sentiment": sentiment_result} not in st.session_state["manual_history"]:
-                    st.session_state["manual_history"].append({"Review": review_text, "Sentiment": sentiment_result})
+                if manual_history.append({"Review": review_text, "Sentiment": sentiment_result}):
                     st.session_state["show_reset_button"] = True
             else:
                 st.warning("⚠️ Please enter a review before predicting.")
 
-        if st.session_state["manual_history"]:
+        if manual_history:
             st.markdown("#### Manual Input History")
-            manual_df = pd.DataFrame(st.session_state["manual_history"])
-            st.dataframe(manual_df, use_container_width=True)
+            render_history(manual_history, "manual_history", use_container_width=True)
 
             if st.session_state["show_reset_button"]:
                 if st.button("🔄 Reset History"):
-                    st.session_state["manual_history"] = []
+                    manual_history.clear()
                     st.session_state["show_reset_button"] = False
                     st.rerun()
 
@@ -2,17 +2,19 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from shared.datasets import cached_dataset
+from shared.rendering import histogram, paged_dataframe
 # import os
 # st.write("Current working directory:", os.getcwd())
 # st.write("Files in cwd:", os.listdir())
-# Clear Streamlit cache (you can clear cache programmatically here if needed)
-st.cache_data.clear()
-st.cache_resource.clear() 
+
+def prepare_churn(df):
+    df["Exited"] = df["Exited"].replace({0: "No Churn", 1: "Churn"})
+    return df
 
 def dashboard():
     st.title("Dashboard")    
-    df = pd.read_csv("Project_Portofolio/df_churn_cleaned.csv")
-    df["Exited"] = df["Exited"].replace({0: "No Churn", 1: "Churn"})
+    df = cached_dataset("Project_Portofolio/df_churn_cleaned.csv", prepare_churn)
 
     st.sidebar.header("🔍 Filter Options")
     gender_filter = st.sidebar.selectbox("Select Gender:", options=["All"] + list(df["Gender"].unique()))
@@ -95,13 +97,7 @@ def dashboard():
         
         # a. Credit Score and Bank Products Used
         st.markdown("Credit Score and Bank Products Used")
-        skor_jumlah_produk = pd.crosstab(
-            index=[filtered_df["CreditScore"], filtered_df["NumOfProducts"]],
-            columns=filtered_df["Exited"]
-        )
-        data_long = skor_jumlah_produk.stack().reset_index()
-        data_long.columns = ['CreditScore', 'NumOfProducts', 'Exited', 'Count']
-        fig = px.histogram(data_long, x='CreditScore', y='Count', color='Exited', facet_col='NumOfProducts', nbins=20)
+        fig = histogram(filtered_df, x='CreditScore', color='Exited', facet_col='NumOfProducts', nbins=20)
         fig.update_layout(yaxis_title="", legend_title_text="")        
         st.plotly_chart(fig, use_container_width=True)
         
@@ -120,4 +116,4 @@ def dashboard():
         st.plotly_chart(fig)
 
     st.subheader("📄 Data Displayed")
-    st.dataframe(filtered_df)
+    paged_dataframe(filtered_df, "dashboard_rows")
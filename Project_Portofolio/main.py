@@ -1,9 +1,13 @@
+import sys
+from pathlib import Path
 import streamlit as st
 from streamlit_option_menu import option_menu
 
-# Clear Streamlit cache (you can clear cache programmatically here if needed)
-st.cache_data.clear()
-st.cache_resource.clear() 
+# Make the repo-level `shared` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.admin import render_cache_admin
+# Pages are imported when first selected (shared.page_loader), not at startup
+from shared.page_loader import load_page
 
 # Set page config
 st.set_page_config(page_title="Portofolio", page_icon="📌", layout="centered")
@@ -22,21 +26,21 @@ with st.sidebar:
         }
     )
 
+
 # Display content based on sidebar menu selection
 if menu == "About Me":
-    import about
-    about.about_me()
+    load_page("about").about_me()
 elif menu == "Dashboard":
-    import dashboard
-    dashboard.dashboard()
+    load_page("dashboard").dashboard()
 elif menu == "Prediction":
-    import prediction
-    prediction.prediction()
+    load_page("prediction").prediction()
 elif menu == "Contact Me":
-    import contact
-    contact.contact_me()
+    load_page("contact").contact_me()
 
 # Add some interactivity by displaying a welcome message or a footer message
 if menu != "Contact Me":  # Avoid cluttering the Contact page
     st.markdown("---")
     st.write(f"**You are viewing the {menu} page!**")
+
+# Cache state and flush controls (admin only), rendered after the page so the numbers are current
+render_cache_admin()
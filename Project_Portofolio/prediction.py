@@ -1,15 +1,14 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
 import plotly.express as px
 import plotly.graph_objects as go
+from shared.datasets import cached_dataset
+from shared.history import render_history, session_history
+from shared.model_registry import get_model
 # import os
 # st.write("Current working directory:", os.getcwd())
 # st.write("Files in cwd:", os.listdir())
-# Clear Streamlit cache (you can clear cache programmatically here if needed)
-st.cache_data.clear()
-st.cache_resource.clear() 
 
 def prediction():
     st.title("Churn Prediction")
@@ -19,13 +18,12 @@ def prediction():
     uploaded_file = st.sidebar.file_uploader("Upload CSV (optional)", type=["csv"], help="Ensure the CSV format matches the training dataset. The column names should be the same to avoid errors.")
 
     # Load the model and reference dataset to ensure column order
-    model = joblib.load("Project_Portofolio/xgboost_model.pkl")
-    df_ref = pd.read_csv("Project_Portofolio/df_churn_processed.csv")
+    model = get_model("Project_Portofolio/xgboost_model.pkl")
+    df_ref = cached_dataset("Project_Portofolio/df_churn_processed.csv")
     expected_cols = [col for col in df_ref.columns.tolist() if col != "Exited"] # exclude the target feature
 
     # Initialize session state to store input history
-    if "history" not in st.session_state:
-        st.session_state.history = []
+    history = session_history("history")
     
     if uploaded_file:
         data = pd.read_csv(uploaded_file)
@@ -115,18 +113,14 @@ def prediction():
         # Save to history with the prediction result
         raw_input["Not Churn Probability"] = not_churn_prob
         raw_input["Churn Probability"] = churn_prob
-        st.session_state.history.append(raw_input)
+        history.append(raw_input.iloc[0].to_dict())
     
     # Display input history
     st.markdown("#### Input History")
-    if st.session_state.history:
-        history_df = pd.concat(st.session_state.history, ignore_index=True)
-        st.dataframe(history_df)
-    else:
-        st.write("No input history yet.")
+    render_history(history, "history", "No input history yet.")
     
     if st.button("Reset History"):
-        st.session_state.history = []
+        history.clear()
         st.rerun()
 
 if __name__ == "__main__":
@@ -1,8 +1,13 @@
+import sys
+from pathlib import Path
 import streamlit as st
 from streamlit_option_menu import option_menu
 
-# Import pages from my_pages
-from my_pages import (dashboard, prediction, about, insights) 
+# Make the repo-level `shared` package importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.admin import render_cache_admin
+# Pages are imported when first selected (shared.page_loader), not at startup
+from shared.page_loader import load_page
 
 # Page configuration
 st.set_page_config(page_title="Zomato Delivery Time Operation", page_icon="🛵️", layout="wide")
@@ -40,14 +45,17 @@ with st.sidebar:
 st.empty()  # spacing
 
 if st.session_state.selected_page == "Dashboard":
-    dashboard.app()
+    load_page("my_pages.dashboard").app()
 elif st.session_state.selected_page == "Prediction":
-    prediction.app()
+    load_page("my_pages.prediction").app()
 elif st.session_state.selected_page == "Insights": 
-    insights.app()
+    load_page("my_pages.insights").app()
 elif st.session_state.selected_page == "About Application":
-    about.app()
+    load_page("my_pages.about").app()
 
 # Footer
 st.markdown("---")
-st.write(f"**You are viewing the `{st.session_state.selected_page}` page!**")
\ No newline at end of file
+st.write(f"**You are viewing the `{st.session_state.selected_page}` page!**")
+
+# Cache state and flush controls (admin only), rendered after the page so the numbers are current
+render_cache_admin()
@@ -1,73 +1,57 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-
-def app():
-    st.title("📊 Zomato Delivery Time Operation Dashboard")
-
-    # Load dataset
-    df_zomato = pd.read_csv("Zomato_Delivery_Time/dataset/df_zomato_dashboard.csv")
-
-    # Sidebar filters
-    st.sidebar.header("🔍 Filter Options")
-    city_opts = df_zomato['City'].dropna().unique()
-    city_filter = st.sidebar.multiselect("City Category:", city_opts, default=city_opts)
-
-    speed_filter = []
-    for option in df_zomato['delivery_speed_category'].dropna().unique():
-        if st.sidebar.checkbox(option, True, key=f"speed_{option}"):
-            speed_filter.append(option)
-
-    weather_opts = df_zomato['Weather_conditions'].dropna().unique()
-    weather_filter = st.sidebar.multiselect("Weather Conditions:", weather_opts, default=weather_opts)
-
-    traffic_opts = df_zomato['Road_traffic_density'].dropna().unique()
-    traffic_filter = st.sidebar.multiselect("Traffic Density:", traffic_opts, default=traffic_opts)
-
+from shared.bitmap_index import ZOMATO_DATE, ZOMATO_FILTERS, BitmapIndex
+from shared.datasets import cached_dataset, cached_rows, dataset_version
+from shared.lazy_tabs import lazy_tabs, memoized_tab
+from shared.rendering import histogram, paged_dataframe
+from shared.time_index import sort_by_time
+
+DATASET = "Zomato_Delivery_Time/dataset/df_zomato_dashboard.csv"
+TABS = [
+    "⏱️ Time Distribution",
+    "🚀 Speed Categories",
+    "📈 Avg Speed by Category",
+    "🌦️ Weather & Traffic",
+    "⏳ Distance vs Time",
+    "🗓️ Time & Orders",
+    "⭐ Courier Performance"
+]
+# Columns each tab reads (prepare_orders also needs Order_Date and Speed_kmph)
+TAB_COLUMNS = {tab: ["Order_Date", "Speed_kmph", *columns] for tab, columns in zip(TABS, [
+    ["Time_taken (min)"],
+    ["Time_taken (min)", "delivery_speed_category"],
+    ["delivery_speed_category"],
+    ["Time_taken (min)", "Weather_conditions", "Road_traffic_density"],
+    ["Time_taken (min)", "distance_km"],
+    ["Time_taken (min)", "day_of_week", "hour_of_day"],
+    ["Time_taken (min)", "Delivery_person_Ratings", "Vehicle_condition"],
+])}
+
+def prepare_orders(df_zomato):
     df_zomato['Order_Date'] = pd.to_datetime(df_zomato['Order_Date'])
-    min_date = df_zomato['Order_Date'].min()
-    max_date = df_zomato['Order_Date'].max()
-    date_filter = st.sidebar.date_input("Order Date Range:", [min_date, max_date], min_value=min_date, max_value=max_date)
-
-    if date_filter and len(date_filter) == 2:
-        start_date, end_date = pd.to_datetime(date_filter[0]), pd.to_datetime(date_filter[1])
-    else:
-        st.warning("⚠️ Please select a valid date range.")
-        return
+    df_zomato['Speed_kmph'] = pd.to_numeric(df_zomato['Speed_kmph'], errors='coerce')
+    # Kept in date order so a date range is one contiguous slice
+    return sort_by_time(df_zomato, 'Order_Date')
 
-    # Apply filters
-    df = df_zomato[
-        df_zomato['City'].isin(city_filter) &
-        df_zomato['delivery_speed_category'].isin(speed_filter) &
-        df_zomato['Weather_conditions'].isin(weather_filter) &
-        df_zomato['Road_traffic_density'].isin(traffic_filter) &
-        df_zomato['Order_Date'].between(start_date, end_date)
-    ]
+def build_order_index(df_zomato):
+    # Bitmap index over the sidebar filter columns and order dates
+    return BitmapIndex(df_zomato, ZOMATO_FILTERS, ZOMATO_DATE)
 
-    if df.empty:
-        st.warning("⚠️ No data found for the selected filters. Please adjust the filters to see the data.")
-        return
+@memoized_tab
+def render_dashboard_tab(tab, selection, version, _rows):
+    # Only this tab's columns are loaded, and the selected rows taken, on a cache miss
+    df = cached_rows(DATASET, _rows, TAB_COLUMNS[tab], prepare_orders)
 
-    # Tabs layout
-    tabs = st.tabs([
-        "⏱️ Time Distribution",
-        "🚀 Speed Categories",
-        "📈 Avg Speed by Category",
-        "🌦️ Weather & Traffic",
-        "⏳ Distance vs Time",
-        "🗓️ Time & Orders",
-        "⭐ Courier Performance"
-    ])
-
-    with tabs[0]:
+    if tab == TABS[0]:
         st.subheader("⏱️ Delivery Time Distribution")
         basic_stats = df["Time_taken (min)"].describe().to_frame().T
-        fig = px.histogram(df, x='Time_taken (min)', nbins=40, color_discrete_sequence=px.colors.qualitative.T10, text_auto=True)
+        fig = histogram(df, x='Time_taken (min)', nbins=40, color_discrete_sequence=px.colors.qualitative.T10, text_auto=True)
         fig.update_layout(title="Distribution of Delivery Time (min)", xaxis_title="Time Taken (min)", yaxis_title="", template="plotly_white")
         st.plotly_chart(fig, use_container_width=True)
         st.dataframe(basic_stats)
 
-    with tabs[1]:
+    elif tab == TABS[1]:
         st.subheader("🚀 Delivery Speed Category Distribution")
         basic_stats = df.groupby('delivery_speed_category', observed=True)['Time_taken (min)'].describe()
         speed_dist = df['delivery_speed_category'].value_counts().reset_index()
@@ -78,20 +62,19 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
         st.dataframe(basic_stats)
 
-    with tabs[2]:
+    elif tab == TABS[2]:
         st.subheader("📈 Average Speed by Category")
         avg_speed = df.groupby('delivery_speed_category', observed=True)['Speed_kmph'].mean().round(2).reset_index()
         avg_speed.columns = ['Delivery Speed Category', 'Average Speed (km/h)']
-        df['Speed_kmph'] = pd.to_numeric(df['Speed_kmph'], errors='coerce')
-        fig = px.histogram(df, x='Speed_kmph', color='delivery_speed_category', barmode="stack", nbins=24, text_auto=True,
-                           title='Distribution of Delivery Speed (Fast vs Slow)',
-                           labels={'Speed_kmph': 'Speed (km/h)', 'delivery_speed_category': ''},
-                           color_discrete_sequence=px.colors.qualitative.T10)
+        fig = histogram(df, x='Speed_kmph', color='delivery_speed_category', barmode="stack", nbins=24, text_auto=True,
+                        title='Distribution of Delivery Speed (Fast vs Slow)',
+                        labels={'Speed_kmph': 'Speed (km/h)', 'delivery_speed_category': ''},
+                        color_discrete_sequence=px.colors.qualitative.T10)
         fig.update_layout(showlegend=True, xaxis_title="Speed (km/h)", yaxis_title="", template="plotly_white")
         st.plotly_chart(fig, use_container_width=True)
         st.dataframe(avg_speed.T)
 
-    with tabs[3]:
+    elif tab == TABS[3]:
         st.subheader("🌦️ Impact of Weather and Traffic")
         grouped = df.groupby(['Weather_conditions', 'Road_traffic_density'])['Time_taken (min)'].mean().reset_index()
         fig = px.density_heatmap(grouped, x='Road_traffic_density', y='Weather_conditions', z='Time_taken (min)', text_auto='.1f',
@@ -101,7 +84,7 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
         st.dataframe(grouped.T)
 
-    with tabs[4]:
+    elif tab == TABS[4]:
         st.subheader("⏳ Distance vs Delivery Time")
         distance_avg = df.groupby('distance_km')['Time_taken (min)'].mean().reset_index()
         fig = px.area(distance_avg, x='distance_km', y='Time_taken (min)', title="Avg Delivery Time by Distance")
@@ -115,7 +98,7 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
         st.dataframe(distance_avg.T)
 
-    with tabs[5]:
+    elif tab == TABS[5]:
         st.subheader("🗓️ Delivery Time by Order Date")
         hourly_daily = df.groupby(["day_of_week", "hour_of_day"])["Time_taken (min)"].mean().reset_index()
         hourly_daily.columns = ["day_of_week", "hour_of_day", "avg_time_taken"]
@@ -135,7 +118,7 @@ def app():
         st.plotly_chart(fig2, use_container_width=True)
         st.dataframe(combined.T)
 
-    with tabs[6]:
+    elif tab == TABS[6]:
         st.subheader("⭐ Courier Performance Distribution")
         perf = df.groupby(["Delivery_person_Ratings", "Vehicle_condition"])["Time_taken (min)"].agg(avg_time_taken="mean", order_count="count").reset_index()
         fig = px.bar(perf, x="Delivery_person_Ratings", y="avg_time_taken", color="Delivery_person_Ratings",
@@ -146,7 +129,56 @@ def app():
         st.plotly_chart(fig, use_container_width=True)
         st.dataframe(perf.T)
 
-    # Final data display
+def app():
+    st.title("📊 Zomato Delivery Time Operation Dashboard")
+
+    # Load dataset and its filter index (shared across sessions, reloaded when the file changes)
+    df_zomato = cached_dataset(DATASET, prepare_orders)
+    order_index = cached_dataset(DATASET, prepare_orders, build=build_order_index)
+
+    # Sidebar filters
+    st.sidebar.header("🔍 Filter Options")
+    city_opts = order_index.options('City')
+    city_filter = st.sidebar.multiselect("City Category:", city_opts, default=city_opts)
+
+    speed_filter = []
+    for option in order_index.options('delivery_speed_category'):
+        if st.sidebar.checkbox(option, True, key=f"speed_{option}"):
+            speed_filter.append(option)
+
+    weather_opts = order_index.options('Weather_conditions')
+    weather_filter = st.sidebar.multiselect("Weather Conditions:", weather_opts, default=weather_opts)
+
+    traffic_opts = order_index.options('Road_traffic_density')
+    traffic_filter = st.sidebar.multiselect("Traffic Density:", traffic_opts, default=traffic_opts)
+
+    min_date, max_date = order_index.date_bounds()
+    date_filter = st.sidebar.date_input("Order Date Range:", [min_date, max_date], min_value=min_date, max_value=max_date)
+
+    if date_filter and len(date_filter) == 2:
+        start_date, end_date = pd.to_datetime(date_filter[0]), pd.to_datetime(date_filter[1])
+    else:
+        st.warning("⚠️ Please select a valid date range.")
+        return
+
+    # Apply filters: bitwise AND/OR over the index gives the selected row positions
+    selection = {
+        'City': city_filter,
+        'delivery_speed_category': speed_filter,
+        'Weather_conditions': weather_filter,
+        'Road_traffic_density': traffic_filter,
+    }
+    rows = order_index.rows(selection, (start_date, end_date))
+
+    if len(rows) == 0:
+        st.warning("⚠️ No data found for the selected filters. Please adjust the filters to see the data.")
+        return
+
+    # Tabs layout: only the selected tab is computed, memoized per filter selection
+    tab = lazy_tabs(TABS, key="zomato_dashboard_tab")
+    render_dashboard_tab(tab, (selection, start_date, end_date), dataset_version(DATASET), rows)
+
+    # Final data display: only the visible page of the selected rows is taken from the frame
     st.markdown("#### 📋 Data Displayed")
-    st.dataframe(df)
+    paged_dataframe(df_zomato, "zomato_dashboard_rows", rows=rows)
 
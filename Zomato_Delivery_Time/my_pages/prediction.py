@@ -1,27 +1,200 @@
+import os
+import time
 import streamlit as st
 from PIL import Image
 import pandas as pd
 import numpy as np
-import joblib
+from shared.feature_schema import load_schema
+from shared.history import render_history, session_history
+from shared.batch_scoring import ResultWriter, iter_chunks, run_batch
+from shared.model_registry import get_model, model_info, describe, preload_available
+from shared.prediction_cache import cached_predict, prediction_cache
+from shared.schema_form import field_input
+from shared.tree_compiler import prefer_compiled
 import plotly.graph_objects as go
 
-# Clear cache (optional during development)
-st.cache_data.clear()
-st.cache_resource.clear()
+XGB_REG_MODEL = "Zomato_Delivery_Time/models/xgb_reg_model.pkl"
+XGB_CLAS_MODEL = "Zomato_Delivery_Time/models/xgb_class_model.pkl"
+RF_REG_MODEL = "Zomato_Delivery_Time/models/rf_reg_model.pkl"
+RF_CLAS_MODEL = "Zomato_Delivery_Time/models/rf_class_model.pkl"
+
+# Compiled feature schemas (python -m shared.build_feature_schemas); both tasks share the same 14-field order form
+SCHEMA_REG = "Zomato_Delivery_Time/models/xgb_reg_model.schema.json"
+SCHEMA_CLAS = "Zomato_Delivery_Time/models/xgb_class_model.schema.json"
+
+
+def show_model_info(model_path):
+    """Caption with the model's registry info; an error (and False) when its file is not in the checkout."""
+    if not os.path.exists(model_path):
+        st.error(f"⚠️ Model file not found: `{model_path}`. Please select another model.")
+        return False
+    st.caption(describe(model_info(model_path)))
+    return True
+
+
+def order_form(suffix):
+    """Render the 14-field order form (widget keys end with `_{suffix}`) and return the raw inputs."""
+    # Ranges, defaults and choices come from the schema, so the form cannot drift from the models' vocabularies
+    schema = load_schema(SCHEMA_REG)
+    row1 = st.columns(4)
+    row2 = st.columns(4)
+    row3 = st.columns(4)
+    row4 = st.columns(4)
+
+    age = field_input(row1[0], schema, "Delivery_person_Age", "Delivery Person Age", help="Delivery person's age.", key=f'age_{suffix}')
+    ratings = field_input(row1[1], schema, "Delivery_person_Ratings", "Delivery Person Ratings", help="Delivery person rating.", key=f'ratings_{suffix}')
+    vehicle_condition = field_input(row1[2], schema, "Vehicle_condition", "Vehicle Condition", help="Condition of the vehicle.", key=f'vehicle_{suffix}')
+    multiple_deliveries = field_input(row1[3], schema, "multiple_deliveries", "Multiple Deliveries", help="If multiple deliveries are happening in a single trip.", key=f'multi_{suffix}')
+
+    day_of_week = field_input(row2[0], schema, "day_of_week", "Day of the Week", help="Day of the week for the delivery.", key=f'dow_{suffix}')
+    hour_of_day = field_input(row2[1], schema, "hour_of_day", "Hour of the Day", help="Hour at which delivery is made.", key=f'hour_{suffix}')
+    waiting_time = field_input(row2[2], schema, "waiting_time", "Waiting Time (minutes)", help="Waiting time before delivery.", key=f'wait_{suffix}')
+    distance_km = field_input(row2[3], schema, "distance_km", "Delivery Distance (km)", help="Distance to the delivery address.", key=f'dist_{suffix}')
+
+    traffic_density = field_input(row3[0], schema, "traffic_density_score", "Traffic Density", help="Traffic density during delivery (0=Low, 1=Medium, 2=High, 3=Very High).", key=f'traffic_{suffix}')
+    weather_condition = field_input(row3[1], schema, "Weather_conditions", "Weather Condition", help="Weather condition.", key=f'weather_{suffix}')
+    road_traffic_density = field_input(row3[2], schema, "Road_traffic_density", "Road Traffic Density", help="Road traffic density.", key=f'road_{suffix}')
+    type_of_order = field_input(row3[3], schema, "Type_of_order", "Type of Order", help="Type of order for delivery.", key=f'order_{suffix}')
+
+    vehicle_type = field_input(row4[0], schema, "Type_of_vehicle", "Type of Vehicle", help="Type of vehicle used for delivery.", key=f'vehicle_type_{suffix}')
+    city_type = field_input(row4[1], schema, "City", "City Type", help="The type of city where delivery occurs.", key=f'city_{suffix}')
+
+    # Raw order fields, encoded with the schema's one-hot vocabularies
+    return {
+        "Delivery_person_Age": age,
+        "Delivery_person_Ratings": ratings,
+        "Vehicle_condition": vehicle_condition,
+        "multiple_deliveries": multiple_deliveries,
+        "day_of_week": day_of_week,
+        "hour_of_day": hour_of_day,
+        "waiting_time": waiting_time,
+        "distance_km": distance_km,
+        "traffic_density_score": traffic_density,
+        "Weather_conditions": weather_condition,
+        "Road_traffic_density": road_traffic_density,
+        "Type_of_order": type_of_order,
+        "Type_of_vehicle": vehicle_type,
+        "City": city_type,
+    }
+
+
+def predict_joint(raw_input):
+    """Encode one order once and score delivery time and delivery speed on the same features."""
+    schema = load_schema(SCHEMA_REG)
+    if load_schema(SCHEMA_CLAS).columns != schema.columns:
+        raise ValueError("Regression and classification models expect different feature columns.")
+    features = schema.encode(raw_input)
+    # One after the other: the compiled ensembles are pure NumPy, a thread pool only added hand-off latency
+    pred_time = float(cached_predict(prefer_compiled(XGB_REG_MODEL), features)[0])
+    fast_prob, slow_prob = (float(p) for p in cached_predict(prefer_compiled(XGB_CLAS_MODEL), features, "predict_proba")[0])
+    return {
+        "Predicted Delivery Time (min)": pred_time,
+        "Delivery Speed": "Slow Delivery" if slow_prob > 0.5 else "Fast Delivery",
+        "Fast Delivery Probability": round(fast_prob * 100, 2),
+        "Slow Delivery Probability": round(slow_prob * 100, 2),
+    }
+
+
+def joint_tab():
+    st.subheader("🔗 Delivery Time & Speed")
+    st.markdown("Encode one order once and run the **XGBoost** regressor and classifier together.")
+    st.markdown("#### Form Order")
+    raw_input = order_form("joint")
+
+    if st.button("Predict Time & Speed", key="predict_joint"):
+        try:
+            start = time.perf_counter()
+            result = predict_joint(raw_input)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            st.error(f"Prediction failed: {e}")
+            return
+
+        if result["Delivery Speed"] == "Slow Delivery":
+            st.error(f"**{result['Delivery Speed']}** · Estimated Delivery Time: **{result['Predicted Delivery Time (min)']:.2f} minutes**")
+        else:
+            st.success(f"**{result['Delivery Speed']}** · Estimated Delivery Time: **{result['Predicted Delivery Time (min)']:.2f} minutes**")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Estimated Time", f"{result['Predicted Delivery Time (min)']:.2f} min")
+        col2.metric("Fast Delivery Probability", f"{result['Fast Delivery Probability']:.2f}%")
+        col3.metric("Slow Delivery Probability", f"{result['Slow Delivery Probability']:.2f}%")
+        st.caption(f"Joint inference took {elapsed_ms:.1f} ms")
+
+
+def score_orders(orders, reg_model, clas_model, schema):
+    """Append predicted delivery time and delivery speed to a chunk of raw orders."""
+    features = schema.encode_frame(orders)
+    result = orders.copy()
+    result["Predicted Delivery Time (min)"] = reg_model.predict(features)
+    slow_prob = clas_model.predict_proba(features)[:, 1]
+    result["Slow Delivery Probability"] = (slow_prob * 100).round(2)
+    result["Predicted Delivery Speed"] = pd.Series(slow_prob > 0.5, index=orders.index).map({True: "Slow Delivery", False: "Fast Delivery"})
+    return result
+
+
+def batch_tab():
+    st.subheader("📦 Batch Scoring")
+    st.markdown(
+        "Upload a CSV or Parquet file of raw orders to score them with **XGBoost** (delivery time and delivery speed). "
+        f"Required columns: `{'`, `'.join(load_schema(SCHEMA_REG).field_names)}`."
+    )
+    uploaded = st.file_uploader("Orders file", type=["csv", "parquet"], key="batch_file")
+    col1, col2 = st.columns(2)
+    chunk_size = col1.number_input("Chunk size (rows)", 1_000, 200_000, 20_000, 1_000, key="batch_chunk_size",
+                                   help="Rows scored per chunk. Scoring memory is bounded by this, not by the file size; the finished result is held in memory for the download.")
+    out_format = col2.radio("Result format", ["csv", "parquet"], horizontal=True, key="batch_format")
+
+    if uploaded is None or not st.button("Score File", key="batch_score"):
+        return
+
+    schema = load_schema(SCHEMA_REG)
+    # Large chunks stay on the sklearn wrapper, which predicts on all cores
+    reg_model = get_model(XGB_REG_MODEL)
+    clas_model = get_model(XGB_CLAS_MODEL)
+
+    status = st.empty()
+    def on_progress(rows, seconds):
+        status.info(f"Scored **{rows:,}** orders in {seconds:.1f}s ({rows / max(seconds, 1e-9):,.0f} orders/s)")
+
+    writer = ResultWriter(out_format)
+    try:
+        stats = run_batch(iter_chunks(uploaded, uploaded.name, int(chunk_size)),
+                          lambda chunk: score_orders(chunk, reg_model, clas_model, schema),
+                          writer, on_progress)
+    except KeyError as e:
+        st.error(f"Missing column in uploaded file: {e}")
+    except Exception as e:
+        st.error(f"Batch scoring failed: {e}")
+    else:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Orders Scored", f"{stats['rows']:,}")
+        col2.metric("Elapsed", f"{stats['seconds']:.2f} s")
+        col3.metric("Throughput", f"{stats['rows_per_second']:,.0f} orders/s")
+
+        # st.download_button reads the whole result into Streamlit's in-memory media store (no streaming)
+        with open(writer.path, "rb") as f:
+            st.download_button("Download Results", f, file_name=f"zomato_predictions.{out_format}",
+                               mime="text/csv" if out_format == "csv" else "application/octet-stream", key="batch_download")
+    finally:
+        os.remove(writer.path)
+
 
 def app():
     st.title("⏱️ Delivery Time - 🛵️ Delivery Speed Prediction")
     st.info("Prediction models using **Random Forest** and **XGBoost** to estimate delivery time and classify delivery speed.")
 
-    tab_reg, tab_cls = st.tabs(["⏱️ Regression", "🛵️ Classification"])
+    # Every model the selectors can pick is loaded once per process, so switching models never waits on unpickling
+    preload_available([prefer_compiled(path) for path in (XGB_REG_MODEL, XGB_CLAS_MODEL, RF_REG_MODEL, RF_CLAS_MODEL)])
+
+    tab_reg, tab_cls, tab_joint, tab_batch = st.tabs(["⏱️ Regression", "🛵️ Classification", "🔗 Time & Speed", "📦 Batch Scoring"])
 
     # === Regression Tab ===
     with tab_reg:
         st.subheader("⏱️ Regression")
         # Model selection for regression
-        reg_model_option = st.radio("Select Model", ["Random Forest", "XGBoost"], horizontal=True, help="Choose a prediction model to use.", key="reg_model_option")
-        reg_model_path = ("Zomato_Delivery_Time/models/rf_reg_model.pkl" if reg_model_option == "Random Forest" else "Zomato_Delivery_Time/models/xgb_reg_model.pkl")
-        reg_model = joblib.load(reg_model_path)
+        reg_model_option = st.radio("Select Model", ["Random Forest", "XGBoost"], index=1, horizontal=True, help="Choose a prediction model to use.", key="reg_model_option")
+        reg_model_path = prefer_compiled(RF_REG_MODEL if reg_model_option == "Random Forest" else XGB_REG_MODEL)
+        reg_model_ready = show_model_info(reg_model_path)
 
         # === Performance Info ===
         if reg_model_option == "Random Forest":
@@ -59,78 +232,24 @@ def app():
                 with col2:
                     st.image(Image.open("Zomato_Delivery_Time/img/xg_SHAP_reg.png"), caption="SHAP Summary Plot", use_container_width=True)
 
-        # Reference columns (exclude target)
-        df_ref_reg = pd.read_csv("Zomato_Delivery_Time/dataset/df_zomato_test_reg.csv")
-        expected_cols_reg = [ col for col in df_ref_reg.columns  if col not in ("Time_taken (min)", "delivery_time")]
+        # Column order, dtypes and one-hot vocabularies come from the compiled schema
+        schema_reg = load_schema(SCHEMA_REG)
 
         # Input form for regression
         st.markdown("#### Form Delivery Time")
-        row1 = st.columns(4)
-        row2 = st.columns(4)
-        row3 = st.columns(4)
-        row4 = st.columns(4)
-
-        # Tambahkan key unik dengan suffix _reg
-        age_reg = row1[0].slider("Delivery Person Age", 15, 50, 30, help="Delivery person's age.", key='age_reg')
-        ratings_reg = row1[1].slider("Delivery Person Ratings", 0.0, 6.0, 4.5, help="Delivery person rating.", key='ratings_reg')
-        vehicle_condition_reg = row1[2].slider("Vehicle Condition", 0, 3, 1, help="Condition of the vehicle.", key='vehicle_reg')
-        multiple_deliveries_reg = row1[3].selectbox("Multiple Deliveries", [0, 1, 2, 3], help="If multiple deliveries are happening in a single trip.", key='multi_reg')
-
-        day_of_week_reg = row2[0].selectbox("Day of the Week", list(range(7)), help="Day of the week for the delivery.", key='dow_reg')
-        hour_of_day_reg = row2[1].slider("Hour of the Day", 0, 23, 12, help="Hour at which delivery is made.", key='hour_reg')
-        waiting_time_reg = row2[2].slider("Waiting Time (minutes)", 10.0, 60.0, 26.0, 1.0, help="Waiting time before delivery.", key='wait_reg')
-        distance_km_reg = row2[3].slider("Delivery Distance (km)", 1.5, 30.0, 10.0, 0.1, help="Distance to the delivery address.", key='dist_reg')
-
-        traffic_density_reg = row3[0].selectbox("Traffic Density", [0, 1, 2, 3], help="Traffic density during delivery (0=Low, 1=Medium, 2=High, 3=Very High).", key='traffic_reg')
-        weather_condition_reg = row3[1].selectbox("Weather Condition", ["Fog", "Sandstorms", "Stormy", "Sunny", "Windy"], help="Weather condition.", key='weather_reg')
-        road_traffic_density_reg = row3[2].selectbox("Road Traffic Density", ["Medium", "Very High"], help="Road traffic density.", key='road_reg')
-        type_of_order_reg = row3[3].selectbox("Type of Order", ["Drinks", "Meal", "Snack"], help="Type of order for delivery.", key='order_reg')
-
-        vehicle_type_reg = row4[0].selectbox("Type of Vehicle", ["Electric Scooter", "Motorcycle"], help="Type of vehicle used for delivery.", key='vehicle_type_reg')
-        city_type_reg = row4[1].selectbox("City Type", ["Urban"], help="The type of city where delivery occurs.", key='city_reg')
-
-        # Construct feature dictionary
-        raw_input_reg = {
-            "Delivery_person_Age": age_reg,
-            "Delivery_person_Ratings": ratings_reg,
-            "Vehicle_condition": vehicle_condition_reg,
-            "multiple_deliveries": multiple_deliveries_reg,
-            "day_of_week": day_of_week_reg,
-            "hour_of_day": hour_of_day_reg,
-            "waiting_time": waiting_time_reg,
-            "distance_km": distance_km_reg,
-            "traffic_density_score": traffic_density_reg,
-        }
-
-        # One-hot encoding manual (dataset sudah ter-encoding)
-        for weather in ["Fog", "Sandstorms", "Stormy", "Sunny", "Windy"]:
-            raw_input_reg[f"Weather_conditions_{weather}"] = 1 if weather_condition_reg == weather else 0
-
-        for traffic in ["Medium", "Very High"]:
-            raw_input_reg[f"Road_traffic_density_{traffic}"] = 1 if road_traffic_density_reg == traffic else 0
-
-        for order in ["Drinks", "Meal", "Snack"]:
-            raw_input_reg[f"Type_of_order_{order}"] = 1 if type_of_order_reg == order else 0
-
-        for vehicle in ["electric_scooter", "motorcycle"]:
-            raw_input_reg[f"Type_of_vehicle_{vehicle}"] = 1 if vehicle_type_reg.lower().replace(" ", "_") == vehicle else 0
-
-        for city in ["Urban"]:
-            raw_input_reg[f"City_{city}"] = 1 if city_type_reg == city else 0
-
-        input_df_reg = pd.DataFrame([raw_input_reg])
-        input_df_reg = input_df_reg.reindex(columns=expected_cols_reg, fill_value=0)
+        raw_input_reg = order_form("reg")
+        features_reg = schema_reg.encode(raw_input_reg)
+        input_df_reg = schema_reg.to_frame(features_reg)
 
         # Show input summary
         with st.expander("📋 Input Summary (Regression)"):
             st.dataframe(input_df_reg)
 
-        if "history_reg" not in st.session_state:
-            st.session_state.history_reg = []
+        history_reg = session_history("history_reg")
 
-        if st.button("Predict Delivery Time", key='predict_reg'):
+        if st.button("Predict Delivery Time", key='predict_reg', disabled=not reg_model_ready):
             try:
-                pred_time = reg_model.predict(input_df_reg)[0]
+                pred_time = float(cached_predict(reg_model_path, features_reg)[0])
 
                 if pred_time > 30:
                     st.error(f"**Estimated Delivery Time: {pred_time:.2f} minutes**")
@@ -161,29 +280,27 @@ def app():
                     st.plotly_chart(fig, use_container_width=True)
 
                 input_df_reg["Predicted Delivery Time (min)"] = pred_time
-                st.session_state.history_reg.append(input_df_reg)
+                history_reg.append(input_df_reg.iloc[0].to_dict())
 
             except Exception as e:
                 st.error(f"Prediction failed: {e}")
 
+        st.caption(prediction_cache.describe())
+
         st.markdown("#### Regression History")
-        if st.session_state.history_reg:
-            hist_df_reg = pd.concat(st.session_state.history_reg, ignore_index=True)
-            st.dataframe(hist_df_reg)
-        else:
-            st.info("No regression history available.")
+        render_history(history_reg, "history_reg", "No regression history available.")
 
         # Tombol reset history
         if st.button("Reset History", key='reset_reg'):
-            st.session_state.history_reg = []
+            history_reg.clear()
             st.rerun()
 
     # === Classification Tab ===
     with tab_cls:
         st.subheader("🛵️ Classification")
-        model_option_clas = st.radio("Select Model", ["Random Forest", "XGBoost"], horizontal=True, help="Choose a prediction model to use.", key="model_option_clas")
-        model_path_clas = "Zomato_Delivery_Time/models/rf_class_model.pkl" if model_option_clas == "Random Forest" else "Zomato_Delivery_Time/models/xgb_class_model.pkl"
-        model_clas = joblib.load(model_path_clas)
+        model_option_clas = st.radio("Select Model", ["Random Forest", "XGBoost"], index=1, horizontal=True, help="Choose a prediction model to use.", key="model_option_clas")
+        model_path_clas = prefer_compiled(RF_CLAS_MODEL if model_option_clas == "Random Forest" else XGB_CLAS_MODEL)
+        clas_model_ready = show_model_info(model_path_clas)
 
         # Model Performance
         if model_option_clas == "Random Forest":
@@ -218,80 +335,23 @@ def app():
                     st.image(Image.open("Zomato_Delivery_Time/img/xg_SHAP_class.png"), caption="SHAP Summary Plot", use_container_width=True)
 
         # Input Form
-        df_ref_clas = pd.read_csv("Zomato_Delivery_Time/dataset/df_zomato_test_clas.csv")
-        expected_cols_clas = [col for col in df_ref_clas.columns if col != "delivery_speed_category"]
+        schema_clas = load_schema(SCHEMA_CLAS)
 
-        if "history_clas" not in st.session_state:
-            st.session_state.history_clas = []
+        history_clas = session_history("history_clas")
 
         st.markdown("#### Form Delivery Speed")
 
-        row1_clas = st.columns(4)
-        row2_clas = st.columns(4)
-        row3_clas = st.columns(4)
-        row4_clas = st.columns(4)
-
-        # Input fields dengan suffix _clas
-        age_clas = row1_clas[0].slider("Delivery Person Age", 15, 50, 30, help="Delivery person's age.", key='age_clas')
-        ratings_clas = row1_clas[1].slider("Delivery Person Ratings", 0.0, 6.0, 4.5, help="Delivery person rating.", key='ratings_clas')
-        vehicle_condition_clas = row1_clas[2].slider("Vehicle Condition", 0, 3, 1, help="Condition of the vehicle.", key='vehicle_clas')
-        multiple_deliveries_clas = row1_clas[3].selectbox("Multiple Deliveries", [0, 1, 2, 3], help="If multiple deliveries are happening in a single trip.", key='multi_clas')
-
-        day_of_week_clas = row2_clas[0].selectbox("Day of the Week", list(range(7)), help="Day of the week for the delivery.", key='dow_clas')
-        hour_of_day_clas = row2_clas[1].slider("Hour of the Day", 0, 23, 12, help="Hour at which delivery is made.", key='hour_clas')
-        waiting_time_clas = row2_clas[2].slider("Waiting Time (minutes)", 10.0, 60.0, 26.0, 1.0, help="Waiting time before delivery.", key='wait_clas')
-        distance_km_clas = row2_clas[3].slider("Delivery Distance (km)", 1.5, 30.0, 10.0, 0.1, help="Distance to the delivery address.", key='dist_clas')
-
-        traffic_density_clas = row3_clas[0].selectbox("Traffic Density", [0, 1, 2, 3], help="Traffic density during delivery (0=Low, 1=Medium, 2=High, 3=Very High).", key='traffic_clas')
-        weather_condition_clas = row3_clas[1].selectbox("Weather Condition", ["Fog", "Sandstorms", "Stormy", "Sunny", "Windy"], help="Weather condition.", key='weather_clas')
-        road_traffic_density_clas = row3_clas[2].selectbox("Road Traffic Density", ["Medium", "Very High"], help="Road traffic density.", key='road_clas')
-        type_of_order_clas = row3_clas[3].selectbox("Type of Order", ["Drinks", "Meal", "Snack"], help="Type of order for delivery.", key='order_clas')
-
-        vehicle_type_clas = row4_clas[0].selectbox("Type of Vehicle", ["Electric Scooter", "Motorcycle"], help="Type of vehicle used for delivery.", key='vehicle_type_clas')
-        city_type_clas = row4_clas[1].selectbox("City Type", ["Urban"], help="The type of city where delivery occurs.", key='city_clas')
-
-        # Construct feature dictionary
-        raw_input_clas = {
-            "Delivery_person_Age": age_clas,
-            "Delivery_person_Ratings": ratings_clas,
-            "Vehicle_condition": vehicle_condition_clas,
-            "multiple_deliveries": multiple_deliveries_clas,
-            "day_of_week": day_of_week_clas,
-            "hour_of_day": hour_of_day_clas,
-            "waiting_time": waiting_time_clas,
-            "distance_km": distance_km_clas,
-            "traffic_density_score": traffic_density_clas,
-        }
-
-        # One-hot encoding manual (dataset sudah ter-encoding)
-        for weather in ["Fog", "Sandstorms", "Stormy", "Sunny", "Windy"]:
-            raw_input_clas[f"Weather_conditions_{weather}"] = 1 if weather_condition_clas == weather else 0
-
-        for traffic in ["Medium", "Very High"]:
-            raw_input_clas[f"Road_traffic_density_{traffic}"] = 1 if road_traffic_density_clas == traffic else 0
-
-        for order in ["Drinks", "Meal", "Snack"]:
-            raw_input_clas[f"Type_of_order_{order}"] = 1 if type_of_order_clas == order else 0
-
-        for vehicle in ["electric_scooter", "motorcycle"]:
-            raw_input_clas[f"Type_of_vehicle_{vehicle}"] = 1 if vehicle_type_clas.lower().replace(" ", "_") == vehicle else 0
-
-        for city in ["Urban"]:
-            raw_input_clas[f"City_{city}"] = 1 if city_type_clas == city else 0
-
-        input_df_clas = pd.DataFrame([raw_input_clas])
-        input_df_clas = input_df_clas.reindex(columns=expected_cols_clas, fill_value=0)
+        raw_input_clas = order_form("clas")
+        features_clas = schema_clas.encode(raw_input_clas)
+        input_df_clas = schema_clas.to_frame(features_clas)
 
         with st.expander("📋 Input Summary (Classification)"):
             st.dataframe(input_df_clas)
 
-        if "history_clas" not in st.session_state:
-            st.session_state.history_clas = []
-
-        if st.button("Predict Delivery Speed", key='predict_clas'):
+        if st.button("Predict Delivery Speed", key='predict_clas', disabled=not clas_model_ready):
             try:
-                pred_clas = model_clas.predict(input_df_clas)
-                prob_clas = model_clas.predict_proba(input_df_clas)
+                pred_clas = cached_predict(model_path_clas, features_clas)
+                prob_clas = cached_predict(model_path_clas, features_clas, "predict_proba")
                 label_clas = "Slow Delivery" if pred_clas[0] == 1 else "Fast Delivery"
                 fast_prob_clas = round(prob_clas[0][0] * 100, 2)  # prob untuk class 0 (Fast)
                 slow_prob_clas = round(prob_clas[0][1] * 100, 2)  # prob untuk class 1 (Slow)
@@ -327,21 +387,27 @@ def app():
 
                 input_df_clas["Fast Delivery Probability"] = fast_prob_clas
                 input_df_clas["Slow Delivery Probability"] = slow_prob_clas
-                st.session_state.history_clas.append(input_df_clas)
+                history_clas.append(input_df_clas.iloc[0].to_dict())
 
             except Exception as e:
                 st.error(f"Prediction failed: {str(e)}")
 
+        st.caption(prediction_cache.describe())
+
         st.markdown("#### History Data")
-        if st.session_state.history_clas:
-            hist_df_clas = pd.concat(st.session_state.history_clas, ignore_index=True)
-            st.dataframe(hist_df_clas)
-        else:
-            st.info("No input history available.")
+        render_history(history_clas, "history_clas")
 
         if st.button("Reset History", key='reset_clas'):
-            st.session_state.history_clas = []
+            history_clas.clear()
             st.rerun()
 
+    # === Joint Tab ===
+    with tab_joint:
+        joint_tab()
+
+    # === Batch Tab ===
+    with tab_batch:
+        batch_tab()
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
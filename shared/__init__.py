@@ -0,0 +1,2 @@
+# shared/__init__.py
+# Helpers shared by the Streamlit apps (Zomato_Delivery_Time, Bank_Card, Project_).
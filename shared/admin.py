@@ -0,0 +1,38 @@
+import os
+
+import streamlit as st
+
+from shared.lazy_tabs import clear_tab_cache
+from shared.page_loader import describe as describe_pages
+
+
+def admin_enabled():
+    """Admin controls are shown with `?admin=1` in the URL or APP_ADMIN=1 in the environment."""
+    return st.query_params.get("admin") == "1" or os.environ.get("APP_ADMIN") == "1"
+
+
+def render_cache_admin():
+    """Sidebar panel with the process-wide cache state and explicit flush buttons."""
+    if not admin_enabled():
+        return
+    # Imported here: every router calls this, and the caches pull in pandas
+    from shared.datasets import dataset_cache
+    from shared.prediction_cache import prediction_cache
+
+    with st.sidebar.expander("⚙️ Cache admin"):
+        st.caption(dataset_cache.describe())
+        for (path, columns, prepare, build), info in sorted(dataset_cache.loaded().items(), key=lambda item: item[0][0]):
+            step = build or prepare
+            st.caption(f"`{info.path}` · {info.rows} rows · sha256 `{info.sha256[:12]}` · "
+                       f"{info.load_seconds * 1000:.0f} ms{' · ' + step.rsplit('.', 1)[-1] if step else ''}")
+        if st.button("Flush dataset cache", key="admin_flush_datasets"):
+            dataset_cache.clear()
+            st.rerun()
+        st.caption(prediction_cache.describe())
+        if st.button("Flush prediction cache", key="admin_flush_predictions"):
+            prediction_cache.clear()
+            st.rerun()
+        if st.button("Flush dashboard tab cache", key="admin_flush_tabs"):
+            clear_tab_cache()
+            st.rerun()
+        st.caption(describe_pages())
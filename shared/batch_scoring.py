@@ -0,0 +1,65 @@
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+
+def iter_chunks(file, file_name, chunk_size):
+    """Yield DataFrames of at most `chunk_size` rows from a CSV or Parquet file."""
+    if file_name.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file, chunksize=chunk_size)
+
+
+class ResultWriter:
+    """Append scored chunks to a temporary CSV or Parquet file."""
+
+    def __init__(self, fmt="csv"):
+        self.fmt = fmt
+        fd, self.path = tempfile.mkstemp(suffix=f".{fmt}", prefix="batch_scoring_")
+        os.close(fd)
+        self._parquet = None
+        self._header = True
+
+    def write(self, df):
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+
+def run_batch(chunks, score_fn, writer, on_progress=None):
+    """Score every chunk with `score_fn` and stream the results into `writer`.
+
+    Only one chunk is held in memory at a time. `on_progress(rows, seconds)` is
+    called after each chunk. Returns a dict with the final row count and timing.
+    """
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk in chunks:
+            writer.write(score_fn(chunk))
+            rows += len(chunk)
+            if on_progress is not None:
+                on_progress(rows, time.perf_counter() - start)
+    finally:
+        writer.close()
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": seconds, "rows_per_second": rows / seconds if seconds > 0 else 0.0}
@@ -0,0 +1,198 @@
+"""Packed bitmap index answering dashboard filter combinations.
+
+    python -m shared.bitmap_index check   # index selection vs pandas isin/between masks
+    python -m shared.bitmap_index bench   # filter latency, masks vs bitmaps, at 10k to 2M orders
+
+A `BitmapIndex` is built once per dataset load. For every value of every
+filter column it keeps one bitmap, packed 64 rows per uint64 word. A filter
+combination is an OR over the selected values of each column, ANDed across
+columns, and never touches the frame. The frame is sorted by date
+(`shared.time_index`), so a date range first narrows the work to the words
+of one contiguous row slice. The result is a vector of row positions for
+`DataFrame.take`.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from shared.cli import best_ms, run_commands
+from shared.paths import resolve
+from shared.time_index import TimeIndex, sort_by_time
+
+# Filter columns of Zomato_Delivery_Time/my_pages/dashboard.py
+ZOMATO_FILTERS = ("City", "delivery_speed_category", "Weather_conditions", "Road_traffic_density")
+ZOMATO_DATE = "Order_Date"
+ZOMATO_DATASET = "Zomato_Delivery_Time/dataset/df_zomato_dashboard.csv"
+
+
+def _pack(mask):
+    """Bool array -> little-endian bitmap of uint64 words."""
+    bits = np.packbits(mask, bitorder="little")
+    return np.pad(bits, (0, -len(bits) % 8)).view(np.uint64)
+
+
+class BitmapIndex:
+    """Equality-encoded bitmaps per filter value, plus a `TimeIndex` over the (sorted) date column."""
+
+    def __init__(self, df, columns, date_column=None):
+        self.n_rows = len(df)
+        self.levels = {}
+        self._bitmaps = {}
+        self._present = {}
+        for col in columns:
+            codes, uniques = pd.factorize(df[col])   # order of first appearance, like Series.unique()
+            self.levels[col] = list(uniques)
+            self._bitmaps[col] = np.stack([_pack(codes == k) for k in range(len(uniques))] or [self._empty()])
+            self._present[col] = _pack(codes >= 0)
+
+        self.time_index = None if date_column is None else TimeIndex(df, date_column)
+
+    def _empty(self):
+        return np.zeros(-(-self.n_rows // 64), dtype=np.uint64)
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def nbytes(self):
+        total = sum(array.nbytes for array in [*self._bitmaps.values(), *self._present.values()])
+        return total + (0 if self.time_index is None else self.time_index.nbytes)
+
+    def options(self, col):
+        """Distinct non-missing values of `col`, in order of first appearance."""
+        return list(self.levels[col])
+
+    def date_bounds(self):
+        return self.time_index.bounds()
+
+    def _column_bitmap(self, col, values, words):
+        levels = self.levels[col]
+        selected = np.isin(np.arange(len(levels)), [levels.index(v) for v in values if v in levels])
+        if selected.all():
+            return self._present[col][words]
+        if selected.sum() > len(levels) / 2:
+            # Fewer words to touch: present AND NOT (unselected values)
+            return self._present[col][words] & ~np.bitwise_or.reduce(self._bitmaps[col][~selected, words], axis=0)
+        if not selected.any():
+            return self._empty()[words]
+        return np.bitwise_or.reduce(self._bitmaps[col][selected, words], axis=0)
+
+    def select(self, filters, date_range=None):
+        """(bitmap, rows) for rows whose value is in `filters[col]` for every column (missing values never match).
+
+        With a `date_range` (calendar days, both included) the bitmap only covers
+        the words of the matching row slice `rows`, starting at word `rows.start // 64`.
+        """
+        rows = slice(0, self.n_rows) if date_range is None else self.time_index.slice(*date_range)
+        words = slice(rows.start // 64, -(-rows.stop // 64))
+        bitmap = ~self._empty()[words]
+        for col, values in filters.items():
+            bitmap &= self._column_bitmap(col, values, words)
+        return bitmap, rows
+
+    def rows(self, filters, date_range=None):
+        """Positions of the selected rows, in frame order."""
+        bitmap, rows = self.select(filters, date_range)
+        first = rows.start // 64 * 64
+        bits = np.unpackbits(bitmap.view(np.uint8), count=rows.stop - first, bitorder="little")
+        bits[:rows.start - first] = 0
+        return np.flatnonzero(bits) + first
+
+    def count(self, filters, date_range=None):
+        return len(self.rows(filters, date_range))
+
+
+def _mask(df, filters, date_range=None):
+    """The pandas filter the index replaces."""
+    mask = pd.Series(True, index=df.index)
+    for col, values in filters.items():
+        mask &= df[col].isin(values)
+    if date_range is not None:
+        start, end = pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1])
+        mask &= df[ZOMATO_DATE].between(start, end)
+    return mask
+
+
+def synthetic_orders(n_rows, seed=0):
+    """Orders with the dashboard's filter columns, for checking and benchmarking at scale."""
+    rng = np.random.default_rng(seed)
+    levels = {
+        "City": ["Metropolitian", "Urban", "Semi-Urban", np.nan],
+        "delivery_speed_category": ["Fast", "Slow"],
+        "Weather_conditions": ["Sunny", "Stormy", "Sandstorms", "Cloudy", "Fog", "Windy", np.nan],
+        "Road_traffic_density": ["Low", "Medium", "High", "Jam", np.nan],
+    }
+    df = pd.DataFrame({col: pd.Series(values, dtype=object).take(rng.integers(0, len(values), n_rows)).to_numpy()
+                       for col, values in levels.items()})
+    df[ZOMATO_DATE] = pd.Timestamp("2022-02-11") + pd.to_timedelta(rng.integers(0, 50, n_rows), unit="D")
+    return sort_by_time(df, ZOMATO_DATE).reset_index(drop=True)
+
+
+def _datasets():
+    yield "synthetic (100k orders)", synthetic_orders(100_000)
+    if resolve(ZOMATO_DATASET).exists():
+        from shared.datasets import load_dataset
+
+        df = load_dataset(ZOMATO_DATASET)
+        df[ZOMATO_DATE] = pd.to_datetime(df[ZOMATO_DATE])
+        yield ZOMATO_DATASET, sort_by_time(df, ZOMATO_DATE)
+    else:
+        print(f"{ZOMATO_DATASET}: skipped (not in the repository)")
+
+
+def _random_filters(index, rng):
+    filters = {}
+    for col in ZOMATO_FILTERS:
+        options = index.options(col)
+        filters[col] = [value for value in options if rng.random() < 0.6]
+    first, last = index.date_bounds()
+    start, end = sorted(first + pd.to_timedelta(rng.integers(0, (last - first).days + 1, size=2), unit="D"))
+    return filters, (start, end)
+
+
+def check(n_selections=200, seed=0):
+    ok = True
+    rng = np.random.default_rng(seed)
+    for name, df in _datasets():
+        index = BitmapIndex(df, ZOMATO_FILTERS, ZOMATO_DATE)
+        mismatches = 0
+        for _ in range(n_selections):
+            filters, date_range = _random_filters(index, rng)
+            expected = np.flatnonzero(_mask(df, filters, date_range).to_numpy())
+            if not np.array_equal(index.rows(filters, date_range), expected):
+                mismatches += 1
+        print(f"{name}: {n_selections} random filter combinations, {mismatches} mismatches, "
+              f"index {index.nbytes / 1e6:.1f} MB")
+        ok &= mismatches == 0
+    return ok
+
+
+def bench(sizes=(10_000, 100_000, 1_000_000, 2_000_000), repeat=5):
+    print(f"{'orders':>10} {'build':>9} {'masks + unique()':>17} {'bitmaps':>9} {'row positions':>14}")
+    for n_rows in sizes:
+        df = synthetic_orders(n_rows)
+        start = time.perf_counter()
+        index = BitmapIndex(df, ZOMATO_FILTERS, ZOMATO_DATE)
+        build_ms = (time.perf_counter() - start) * 1000
+        filters, date_range = _random_filters(index, np.random.default_rng(1))
+
+        def pandas_filter():
+            for col in ZOMATO_FILTERS:
+                df[col].dropna().unique()
+            df[_mask(df, filters, date_range)]
+
+        print(f"{n_rows:>10,} {build_ms:>6.0f} ms {best_ms(pandas_filter, repeat):>14.1f} ms "
+              f"{best_ms(lambda: index.select(filters, date_range), repeat):>6.2f} ms "
+              f"{best_ms(lambda: index.rows(filters, date_range), repeat):>11.2f} ms")
+
+
+def main():
+    run_commands(__doc__, {
+        "check": (check, "Compare index selections with pandas masks.", {"--selections": ("n_selections", 200)}),
+        "bench": (bench, "Filter latency: pandas masks vs bitmaps.", {"--repeat": ("repeat", 5)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
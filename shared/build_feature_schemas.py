@@ -0,0 +1,129 @@
+"""Compile the feature schema of every model from its reference dataset.
+
+Run from the repository root after retraining a model or changing a form:
+
+    python -m shared.build_feature_schemas
+
+Each `<App>/models/<model>.pkl` gets a `<model>.schema.json` next to it, so the
+pages never have to read the reference CSVs at request time. The prediction
+forms build their widgets from the fields below (`shared.schema_form`), so a
+slider range, default or choice list is changed here, not on the page.
+"""
+import json
+
+import pandas as pd
+
+from shared.feature_schema import FeatureSchema, schema_path_for
+from shared.paths import resolve
+
+
+def numeric(name, min_value, max_value, default, step=None, choices=None):
+    field = {"name": name, "kind": "numeric", "min": min_value, "max": max_value, "default": default}
+    if step is not None:
+        field["step"] = step
+    if choices is not None:
+        field["choices"] = choices
+    return field
+
+
+def binary(name, mapping, choices):
+    return {"name": name, "kind": "binary", "mapping": mapping, "choices": choices}
+
+
+def onehot(name, choices, prefix=None, labels=None, normalize=None):
+    prefix = f"{name}_" if prefix is None else prefix
+    labels = choices if labels is None else labels
+    field = {"name": name, "kind": "onehot", "choices": choices, "columns": {label: f"{prefix}{label}" for label in labels}}
+    if normalize is not None:
+        field["normalize"] = normalize
+    return field
+
+
+ZOMATO_FIELDS = [
+    numeric("Delivery_person_Age", 15, 50, 30),
+    numeric("Delivery_person_Ratings", 0.0, 6.0, 4.5),
+    numeric("Vehicle_condition", 0, 3, 1),
+    numeric("multiple_deliveries", 0, 3, 0, choices=[0, 1, 2, 3]),
+    numeric("day_of_week", 0, 6, 0, choices=list(range(7))),
+    numeric("hour_of_day", 0, 23, 12),
+    numeric("waiting_time", 10.0, 60.0, 26.0, step=1.0),
+    numeric("distance_km", 1.5, 30.0, 10.0, step=0.1),
+    numeric("traffic_density_score", 0, 3, 0, choices=[0, 1, 2, 3]),
+    onehot("Weather_conditions", ["Fog", "Sandstorms", "Stormy", "Sunny", "Windy"]),
+    onehot("Road_traffic_density", ["Medium", "Very High"]),
+    onehot("Type_of_order", ["Drinks", "Meal", "Snack"]),
+    onehot("Type_of_vehicle", ["Electric Scooter", "Motorcycle"], labels=["electric_scooter", "motorcycle"], normalize="snake_lower"),
+    onehot("City", ["Urban"]),
+]
+
+BANK_CARD_FIELDS = [
+    numeric("Customer_Age", 26, 73, 40),
+    binary("Gender", {"F": 1, "M": 0}, ["M", "F"]),
+    numeric("Dependent_count", 0, 5, 1),
+    numeric("Total_Relationship_Count", 1, 6, 3),
+    numeric("Months_Inactive_12_mon", 0, 6, 2),
+    numeric("Contacts_Count_12_mon", 0, 6, 2),
+    numeric("Credit_Limit", 1438.0, 34516.0, 10000.0),
+    numeric("Total_Revolving_Bal", 0.0, 2517.0, 800.0),
+    numeric("Total_Amt_Chng_Q4_Q1", 0.0, 3.397, 1.2),
+    numeric("Total_Ct_Chng_Q4_Q1", 0.0, 3.714, 0.8),
+    numeric("Total_Trans_Amt", 510.0, 18484.0, 5000.0),
+    numeric("Total_Trans_Ct", 10, 139, 60),
+    numeric("Avg_Utilization_Ratio", 0.0, 0.999, 0.3),
+    onehot("Education_Level", ["College", "Graduate", "High School", "Post-Graduate", "Uneducated", "Unknown"]),
+    onehot("Marital_Status", ["Divorced", "Married", "Single", "Unknown"]),
+    onehot("Income_Category", ["$120K +", "$40K - $60K", "$60K - $80K", "$80K - $120K", "Less than $40K", "Unknown"]),
+]
+
+PROJECT_CHURN_FIELDS = [
+    binary("HasCrCard", {"Yes": 1, "No": 0}, ["Yes", "No"]),
+    numeric("CreditScore", 300, 900, 650),
+    numeric("Tenure", 0, 10, 5),
+    numeric("Balance", 0.0, 250000.0, 50000.0),
+    numeric("NumOfProducts", 1, 4, 1, choices=[1, 2, 3, 4]),
+    binary("IsActiveMember", {"Yes": 1, "No": 0}, ["Yes", "No"]),
+    numeric("Age", 18, 80, 40),
+    numeric("EstimatedSalary", 0.0, 200000.0, 50000.0),
+    onehot("Geography", ["France", "Germany", "Spain"]),
+    onehot("Gender", ["Female", "Male"]),
+]
+
+# (model, reference dataset, target column(s) to drop, raw input fields)
+MODELS = [
+    ("Zomato_Delivery_Time/models/xgb_reg_model.pkl", "Zomato_Delivery_Time/dataset/df_zomato_test_reg.csv",
+     ["Time_taken (min)", "delivery_time"], ZOMATO_FIELDS),
+    ("Zomato_Delivery_Time/models/xgb_class_model.pkl", "Zomato_Delivery_Time/dataset/df_zomato_test_clas.csv",
+     ["delivery_speed_category"], ZOMATO_FIELDS),
+    ("Bank_Card/models/xgb_model.pkl", "Bank_Card/dataset/df_churn_test_scaled.csv", ["Attrition_Flag"], BANK_CARD_FIELDS),
+    ("Bank_Card/models/svm_model.pkl", "Bank_Card/dataset/df_churn_test_scaled.csv", ["Attrition_Flag"], BANK_CARD_FIELDS),
+    ("Project_/models/xgboost_model.pkl", "Project_/dataset/df_churn_processed.csv", ["Exited"], PROJECT_CHURN_FIELDS),
+]
+
+
+def build_schema(model_path, reference_csv, targets, fields):
+    sample = pd.read_csv(resolve(reference_csv), nrows=1000)
+    target = next((col for col in targets if col in sample.columns), None)
+    columns = [{"name": col, "dtype": str(dtype)} for col, dtype in sample.dtypes.items() if col not in targets]
+    spec = {
+        "model": schema_path_for(model_path).name.replace(".schema.json", ".pkl"),
+        "source": reference_csv,
+        "target": target,
+        "columns": columns,
+        "fields": fields,
+    }
+    FeatureSchema(spec)  # validate that every field maps onto existing columns
+    return spec
+
+
+def main():
+    for model_path, reference_csv, targets, fields in MODELS:
+        spec = build_schema(model_path, reference_csv, targets, fields)
+        out = resolve(schema_path_for(model_path))
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(spec, f, indent=2)
+            f.write("\n")
+        print(f"{out.relative_to(resolve('.'))}: {len(spec['columns'])} columns, {len(fields)} fields")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Command-line plumbing shared by the `python -m shared.<module> check / bench` tools.
+
+Each module describes its subcommands and hands them to `run_commands`:
+
+    def main():
+        run_commands(__doc__, {
+            "check": (check, "Compare ... with ...", {"--selections": ("n_selections", 50)}),
+            "bench": (bench, "Latency: ... vs ...", {"--repeat": ("repeat", 5)}),
+        })
+
+Every `--flag` maps to a keyword argument of the command and takes the type
+of its default; a `False` default makes it a switch. An option may add a
+dict of further `add_argument` settings as a third item, e.g.
+`{"--format": ("fmt", "ubj", {"choices": ["ubj", "json"]})}`, and a name
+without dashes is a required positional argument. Commands run from the
+repository root, and a command that returns True or False (checks, exports
+that can be refused) sets the exit status.
+"""
+import argparse
+import os
+import time
+
+from shared.paths import REPO_ROOT
+
+
+def best_ms(fn, repeat):
+    """Fastest of `repeat` calls to `fn`, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _add_option(parser, flag, keyword, default, settings=None):
+    settings = dict(settings or {})
+    if not flag.startswith("-"):
+        parser.add_argument(keyword, metavar=flag, **settings)
+        return
+    if isinstance(default, bool):
+        settings.setdefault("action", "store_true")
+    elif default is not None and "action" not in settings:
+        settings.setdefault("type", type(default))
+    parser.add_argument(flag, dest=keyword, default=default, **settings)
+
+
+def run_commands(doc, commands):
+    """Parse the command line against `commands` ({name: (function, help, {flag: (keyword, default[, settings])})}) and run it."""
+    parser = argparse.ArgumentParser(description=doc.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text, options) in commands.items():
+        command_parser = sub.add_parser(name, help=help_text)
+        for flag, option in options.items():
+            _add_option(command_parser, flag, *option)
+    args = vars(parser.parse_args())
+    name = args.pop("command")
+    os.chdir(REPO_ROOT)
+    result = commands[name][0](**args)
+    if isinstance(result, bool):
+        raise SystemExit(0 if result else 1)
@@ -0,0 +1,278 @@
+"""Pre-aggregated row counts for dashboard crosstabs.
+
+    python -m shared.count_cube check   # cube answers vs pd.crosstab on filtered rows (Bank_Card churn)
+    python -m shared.count_cube bench   # crosstab time per dashboard rerun, rows vs cube, at 1x/10x/100x rows
+
+A `CountCube` is built once per dataset. Filter dimensions (multiselects) and
+binned range columns (sliders) are axes of every cuboid. Each cuboid adds the
+group-by columns of one chart. Range axes are stored as prefix sums, so each
+slider costs two lookups and no scan over rows. A filter change is answered
+by slicing and summing arrays whose size depends on the number of levels, not
+on the number of customers. Ranges are bin-aligned: `[lo, hi)` with bounds
+rounded outward to the bin edges. Pages therefore step their sliders by the
+bin width, and `mask` selects the same rows when the raw table is shown.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from shared.cli import best_ms, run_commands
+from shared.paths import resolve
+
+# Dimensions of Bank_Card/my_pages/dashboard_churn.py
+BANK_CHURN_CUBE = {
+    "dims": ("Gender", "Attrition_Flag"),
+    "ranges": {"Customer_Age": 5, "Total_Trans_Ct": 10, "Total_Trans_Amt": 1000},
+    "cuboids": [
+        ("Customer_Age",),
+        ("Education_Level", "Income_Category"),
+        ("Marital_Status", "Dependent_count"),
+        ("Months_on_book",),
+        ("Credit_Limit_Category",),
+        ("Total_Revolving_Bal_Category",),
+        ("Avg_Open_To_Buy_Category", "Avg_Utilization_Category"),
+        ("Total_Amt_Chng_Q4_Q1_Category", "Total_Ct_Chng_Q4_Q1_Category"),
+        ("Total_Trans_Amt_Category", "Total_Trans_Ct_Category"),
+        ("Card_Category", "Total_Relationship_Count"),
+        ("Months_Inactive_12_mon", "Contacts_Count_12_mon"),
+    ],
+}
+BANK_CHURN_DATASET = "Bank_Card/dataset/df_churn.csv"
+
+
+def _levels(values):
+    """Sorted distinct non-missing values (the categories, in order, for Categoricals)."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return pd.CategoricalIndex(values.cat.categories, dtype=values.dtype, name=values.name)
+    return pd.Index(np.sort(values.dropna().unique()), name=values.name)
+
+
+def _edges(values, width):
+    """Bin edges of `width` covering every value; the last edge lies above the maximum."""
+    edges = np.arange(np.floor(values.min() / width), np.floor(values.max() / width) + 2) * width
+    return edges.astype(np.int64) if pd.api.types.is_integer_dtype(values) else edges
+
+
+class CountCube:
+    """Dense count arrays over `dims` x binned `ranges` x the columns of each cuboid.
+
+    Group-by columns carry one extra trailing slot for missing values. Rolling a
+    cuboid up to fewer columns therefore keeps rows that are missing in the
+    dropped column, as pd.crosstab on those columns would.
+    """
+
+    def __init__(self, df, dims, ranges, cuboids):
+        self.dims = tuple(dims)
+        self.ranges = tuple(ranges)
+        self.n_rows = len(df)
+        self.edges = {col: _edges(df[col], width) for col, width in ranges.items()}
+        group = {col for cuboid in cuboids for col in cuboid}
+        self.levels = {col: _levels(df[col]) for col in (*self.dims, *sorted(group))}
+
+        codes = {col: self.levels[col].get_indexer(df[col]) for col in self.levels}
+        for col in group:
+            codes[col] = np.where(codes[col] < 0, len(self.levels[col]), codes[col])
+        bins = {col: np.searchsorted(self.edges[col], df[col].to_numpy(), side="right") - 1 for col in self.ranges}
+        for col in self.ranges:
+            bins[col][df[col].isna().to_numpy()] = -1
+        dtype = np.min_scalar_type(self.n_rows)
+        self._cuboids = {tuple(cuboid): self._build(codes, bins, tuple(cuboid), dtype) for cuboid in [(), *cuboids]}
+
+    def _build(self, codes, bins, cuboid, dtype):
+        columns = [codes[col] for col in self.dims] + [bins[col] for col in self.ranges] + [codes[col] for col in cuboid]
+        shape = ([len(self.levels[col]) for col in self.dims] + [len(self.edges[col]) - 1 for col in self.ranges]
+                 + [len(self.levels[col]) + 1 for col in cuboid])
+        valid = np.logical_and.reduce([column >= 0 for column in columns]) if columns else slice(None)
+        flat = np.ravel_multi_index([column[valid] for column in columns], shape)
+        counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+        # Prefix sums over each range axis, with a leading zero: [i, j) is counts[j] - counts[i]
+        first_range = len(self.dims)
+        pad = [(1, 0) if first_range <= axis < first_range + len(self.ranges) else (0, 0) for axis in range(counts.ndim)]
+        counts = np.pad(counts, pad)
+        for axis in range(first_range, first_range + len(self.ranges)):
+            counts = np.cumsum(counts, axis=axis)
+        return counts.astype(dtype)
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._cuboids.values())
+
+    @property
+    def cells(self):
+        return sum(array.size for array in self._cuboids.values())
+
+    def bin_bounds(self, col, lo, hi):
+        """Bin indices `[i, j)` covering `lo..hi`, rounded outward to bin edges."""
+        edges = self.edges[col]
+        i = int(np.clip(np.searchsorted(edges, lo, side="right") - 1, 0, len(edges) - 1))
+        j = int(np.clip(np.searchsorted(edges, hi, side="left"), i, len(edges) - 1))
+        return i, j
+
+    def _cuboid_for(self, group):
+        covering = [cuboid for cuboid in self._cuboids if set(group) <= set(cuboid)]
+        if not covering:
+            raise ValueError(f"No cuboid covers {list(group)}; add it to the cube's cuboids.")
+        return min(covering, key=lambda cuboid: self._cuboids[cuboid].size)
+
+    def _count_array(self, by, where):
+        where = where or {}
+        unknown = set(where) - set(self.dims) - set(self.ranges)
+        if unknown:
+            raise ValueError(f"Can only filter on {self.dims + self.ranges}, got {sorted(unknown)}")
+        group = [col for col in by if col not in self.dims]
+        cuboid = self._cuboid_for(group)
+        counts = self._cuboids[cuboid]
+        names = [*self.dims, *self.ranges, *cuboid]
+
+        for col in self.ranges:
+            edges = self.edges[col]
+            i, j = self.bin_bounds(col, *where.get(col, (edges[0], edges[-1])))
+            axis = names.index(col)
+            counts = np.take(counts, j, axis=axis).astype(np.int64) - np.take(counts, i, axis=axis)
+            names.pop(axis)
+        for col in self.dims:
+            axis = names.index(col)
+            selected = np.ones(len(self.levels[col]), dtype=bool)
+            if col in where:
+                selected = self.levels[col].isin(list(where[col]))
+            if col in by:
+                counts = counts * selected.reshape([-1 if a == axis else 1 for a in range(counts.ndim)])
+            else:
+                counts = np.compress(selected, counts, axis=axis).sum(axis=axis)
+                names.pop(axis)
+        for col in cuboid:
+            axis = names.index(col)
+            if col in by:
+                counts = np.take(counts, np.arange(len(self.levels[col])), axis=axis)   # drop the missing slot
+            else:
+                counts = counts.sum(axis=axis)
+                names.pop(axis)
+        return np.transpose(counts, [names.index(col) for col in by])
+
+    def _index(self, by):
+        if len(by) == 1:
+            return self.levels[by[0]]
+        return pd.MultiIndex.from_product([self.levels[col] for col in by], names=list(by))
+
+    def count(self, where=None):
+        """Number of rows matching `where`."""
+        return int(self._count_array((), where))
+
+    def counts(self, by, where=None):
+        """Row counts per combination of `by`, including zero combinations, as a Series named "Count"."""
+        by = [by] if isinstance(by, str) else list(by)
+        return pd.Series(self._count_array(by, where).ravel(), index=self._index(by), name="Count")
+
+    def crosstab(self, index, columns, where=None):
+        """`pd.crosstab(index, columns)` over the rows matching `where` (all-zero rows and columns dropped)."""
+        index = [index] if isinstance(index, str) else list(index)
+        counts = self._count_array([*index, columns], where)
+        counts = counts.reshape(-1, counts.shape[-1])
+        rows, cols = counts.any(axis=1), counts.any(axis=0)
+        return pd.DataFrame(counts[np.ix_(rows, cols)], index=self._index(index)[rows],
+                            columns=self.levels[columns][cols])
+
+    def mask(self, df, where=None):
+        """Boolean row mask selecting exactly the rows counted for `where`."""
+        where = where or {}
+        mask = pd.Series(True, index=df.index)
+        for col in self.dims:
+            if col in where:
+                mask &= df[col].isin(list(where[col]))
+        for col in self.ranges:
+            if col in where:
+                i, j = self.bin_bounds(col, *where[col])
+                mask &= (df[col] >= self.edges[col][i]) & (df[col] < self.edges[col][j])
+        return mask
+
+    def describe(self):
+        return (f"Count cube: {len(self._cuboids)} cuboids · {self.cells:,} cells · "
+                f"{self.nbytes / 1e6:.1f} MB for {self.n_rows:,} rows")
+
+
+def _random_where(cube, rng):
+    where = {}
+    for col in cube.dims:
+        levels = list(cube.levels[col])
+        where[col] = [level for level in levels if rng.random() < 0.7] or levels[:1]
+    for col in cube.ranges:
+        edges = cube.edges[col]
+        i, j = sorted(rng.choice(len(edges), size=2, replace=False))
+        where[col] = (edges[i], edges[j])
+    return where
+
+
+def _queries(spec):
+    """(index, columns) of every crosstab the spec can answer: each cuboid's columns, and each one alone."""
+    queries = {((col,), spec["dims"][0]) for cuboid in spec["cuboids"] for col in cuboid}
+    queries |= {(tuple(cuboid), spec["dims"][0]) for cuboid in spec["cuboids"]}
+    queries.add(((spec["dims"][0],), spec["dims"][1]))
+    return sorted(queries)
+
+
+def check(n_selections=50, seed=0):
+    df = pd.read_csv(resolve(BANK_CHURN_DATASET))
+    cube = CountCube(df, **BANK_CHURN_CUBE)
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+    queries = _queries(BANK_CHURN_CUBE)
+    for _ in range(n_selections):
+        where = _random_where(cube, rng)
+        rows = df[cube.mask(df, where)]
+        if len(rows) != cube.count(where):
+            mismatches += 1
+        for index, columns in queries:
+            expected = pd.crosstab([rows[col] for col in index], rows[columns])
+            got = cube.crosstab(index, columns, where)
+            if expected.empty and got.empty:
+                continue
+            try:
+                pd.testing.assert_frame_equal(got, expected, check_names=False, check_index_type=False,
+                                              check_column_type=False)
+            except AssertionError as exc:
+                mismatches += 1
+                print(f"{index} x {columns}: {str(exc).splitlines()[0]}")
+    print(f"{BANK_CHURN_DATASET}: {n_selections} random selections x {len(queries)} crosstabs, "
+          f"{mismatches} mismatches · {cube.describe()}")
+    return mismatches == 0
+
+
+def bench(scales=(1, 10, 100), repeat=5):
+    base = pd.read_csv(resolve(BANK_CHURN_DATASET))
+    queries = _queries(BANK_CHURN_CUBE)
+    print(f"{len(queries)} crosstabs per rerun")
+    print(f"{'rows':>9} {'build':>9} {'filter + crosstab rows':>23} {'cube':>9}")
+    for scale in scales:
+        df = pd.concat([base] * scale, ignore_index=True)
+        start = time.perf_counter()
+        cube = CountCube(df, **BANK_CHURN_CUBE)
+        build_ms = (time.perf_counter() - start) * 1000
+        where = _random_where(cube, np.random.default_rng(0))
+
+        def from_rows():
+            rows = df[cube.mask(df, where)]
+            for index, columns in queries:
+                pd.crosstab([rows[col] for col in index], rows[columns])
+
+        def from_cube():
+            for index, columns in queries:
+                cube.crosstab(index, columns, where)
+
+        print(f"{len(df):>9,} {build_ms:>6.0f} ms {best_ms(from_rows, repeat):>20.1f} ms "
+              f"{best_ms(from_cube, repeat):>6.1f} ms")
+
+
+def main():
+    run_commands(__doc__, {
+        "check": (check, "Compare cube crosstabs with pd.crosstab on random selections.",
+                  {"--selections": ("n_selections", 50)}),
+        "bench": (bench, "Crosstab time per rerun: filtered rows vs cube.", {"--repeat": ("repeat", 5)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
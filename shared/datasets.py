@@ -0,0 +1,346 @@
+"""Typed columnar copies of the dashboard datasets.
+
+    python -m shared.datasets convert   # write <dataset>.arrow next to each CSV
+    python -m shared.datasets bench     # load time: pd.read_csv vs memory-mapped Arrow
+
+Each CSV is parsed once and written as an uncompressed Arrow IPC file:
+numbers keep their dtypes, date columns are native timestamps and repetitive
+string columns are dictionary-encoded. `load_dataset` memory-maps that file
+and materializes only the requested columns; without it (or without pyarrow)
+it falls back to `pd.read_csv` with the same parsing options. `convert`
+stamps the copy with the CSV's size, mtime and SHA-256; a copy whose CSV has
+changed since is ignored (the CSV is read instead) until `convert` runs again.
+
+Pages get their DataFrames through `cached_dataset`, which keeps one prepared
+copy per (dataset, columns, prepare function) for the whole process and
+reloads it only when the CSV or its Arrow copy changes on disk. Dashboard
+tabs take their selected rows from a projection of just the columns they
+read (`cached_rows`).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from shared.cli import best_ms, run_commands
+from shared.paths import relative, resolve
+
+# CSV path -> pd.read_csv options
+DATASETS = {
+    "Bank_Card/dataset/df_churn.csv": {},
+    "Project_/dataset/df_churn_cleaned.csv": {},
+    "Project_/dataset/ticket_system_review.csv": {"parse_dates": ["date_of_survey"]},
+    "Project_/dataset/ticket_system_review_processed.csv": {"parse_dates": ["date_of_survey"]},
+    "Project_Portofolio/df_churn_cleaned.csv": {},
+    "Zomato_Delivery_Time/dataset/df_zomato_dashboard.csv": {"parse_dates": ["Order_Date"]},
+}
+
+# String columns with at most this share of distinct values are dictionary-encoded
+MAX_DICTIONARY_RATIO = 0.5
+
+
+def columnar_path_for(csv_path):
+    return Path(csv_path).with_suffix(".arrow")
+
+
+def read_csv(csv_path, columns=None):
+    """The original parsing path: `pd.read_csv` with the dataset's options."""
+    options = dict(DATASETS.get(relative(csv_path), {}))
+    if columns is not None:
+        options["usecols"] = columns
+        options["parse_dates"] = [col for col in options.get("parse_dates", []) if col in columns]
+    df = pd.read_csv(resolve(csv_path), **options)
+    return df if columns is None else df[columns]
+
+
+def to_table(df):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        column = table.column(i)
+        if pa.types.is_string(field.type) and len(column) and \
+                pa.compute.count_distinct(column).as_py() <= MAX_DICTIONARY_RATIO * len(column):
+            table = table.set_column(i, field.name, column.dictionary_encode())
+    return table
+
+
+def _csv_stamp(csv_path):
+    stat = os.stat(resolve(csv_path))
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+# (path, size, mtime_ns) -> SHA-256, least recently used first
+_file_hashes = OrderedDict()
+_file_hashes_lock = threading.Lock()
+MAX_FILE_HASHES = 64
+
+
+def _file_sha256(path, stamp=None):
+    """SHA-256 of a CSV or Arrow file, computed once per (path, size, mtime)."""
+    stamp = stamp or _csv_stamp(path)
+    key = (relative(path), stamp["size"], stamp["mtime_ns"])
+    with _file_hashes_lock:
+        if key in _file_hashes:
+            _file_hashes.move_to_end(key)
+            return _file_hashes[key]
+    # Hashed outside the lock: two threads may hash the same new file, never block each other
+    digest = _sha256(resolve(path))
+    with _file_hashes_lock:
+        _file_hashes[key] = digest
+        while len(_file_hashes) > MAX_FILE_HASHES:
+            _file_hashes.popitem(last=False)
+    return digest
+
+
+def current_columnar_path(csv_path):
+    """The Arrow copy of `csv_path` if it was converted from the CSV as it is now, else None.
+
+    Size and mtime settle it in the common case; a copied or checked-out CSV
+    (new mtime, same size) is compared by content hash.
+    """
+    path = resolve(columnar_path_for(csv_path))
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    if not path.exists():
+        return None
+    try:
+        stamp = _csv_stamp(csv_path)
+    except FileNotFoundError:
+        return path
+    with pa.memory_map(str(path)) as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    converted = json.loads(metadata.get(b"source_csv", b"null"))
+    if converted is None or converted["size"] != stamp["size"]:
+        return None
+    if converted["mtime_ns"] == stamp["mtime_ns"] or converted["sha256"] == _file_sha256(csv_path, stamp):
+        return path
+    return None
+
+
+def convert(csv_path):
+    import pyarrow.feather as feather
+
+    stamp = _csv_stamp(csv_path)
+    table = to_table(read_csv(csv_path))
+    stamp["sha256"] = _file_sha256(csv_path, stamp)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"source_csv": json.dumps(stamp)})
+    out = resolve(columnar_path_for(csv_path))
+    feather.write_feather(table, out, compression="uncompressed")
+    return table, out
+
+
+def load_dataset(csv_path, columns=None, categorical=False):
+    """Load a dashboard dataset, memory-mapped from its Arrow copy when it is current.
+
+    Dictionary columns come back as plain strings (like `read_csv`) unless
+    `categorical=True`, which returns them as pandas Categoricals.
+    """
+    path = current_columnar_path(csv_path)
+    if path is None:
+        return read_csv(csv_path, columns)
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    if not categorical:
+        table = table.cast(pa.schema([
+            pa.field(field.name, field.type.value_type) if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ]))
+    df = table.to_pandas()
+    for name in df.columns[df.dtypes == object]:
+        # read_csv marks missing strings with NaN, Arrow with None
+        if df[name].hasnans:
+            df[name] = df[name].fillna(np.nan)
+    return df
+
+
+@dataclass(frozen=True)
+class DatasetInfo:
+    path: str             # repo-relative path of the file actually read (CSV or Arrow copy)
+    sha256: str
+    rows: int
+    memory_bytes: int
+    load_seconds: float   # load + prepare
+    loaded_at: float
+
+
+class _Entry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.fingerprint = None
+        self.frame = None
+        self.info = None
+
+
+def _fingerprint(csv_path):
+    """(mtime_ns, size) of the CSV and of its Arrow copy; any change invalidates cached frames."""
+    stats = []
+    for path in (resolve(csv_path), resolve(columnar_path_for(csv_path))):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stats.append(None)
+        else:
+            stats.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stats)
+
+
+def _sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _qualname(function):
+    return None if function is None else f"{function.__module__}.{function.__qualname__}"
+
+
+class DatasetCache:
+    """Process-wide cache of prepared dashboard DataFrames.
+
+    `prepare(df)` adds the page's derived columns once per load. Every caller
+    gets a shallow copy of the shared frame, so assigning columns on it never
+    leaks into other sessions; frames must not be modified in place.
+    `build(frame)` derives a read-only object (e.g. a `CountCube` with
+    `__len__` and `nbytes`) from that cached prepared frame, once per dataset
+    version, and shares it as is.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            return entry
+
+    def get(self, csv_path, prepare=None, columns=None, build=None):
+        key = (relative(csv_path), None if columns is None else tuple(columns), _qualname(prepare), _qualname(build))
+        entry = self._entry(key)
+        fingerprint = _fingerprint(csv_path)
+        with entry.lock:
+            if entry.fingerprint != fingerprint:
+                start = time.perf_counter()
+                if build is not None:
+                    # The prepared frame comes from its own entry, so prepare runs once for every builder
+                    df = build(self.get(csv_path, prepare, columns))
+                else:
+                    df = load_dataset(csv_path, columns)
+                    if prepare is not None:
+                        df = prepare(df)
+                source = current_columnar_path(csv_path) or csv_path
+                entry.frame = df
+                entry.fingerprint = fingerprint
+                entry.info = DatasetInfo(
+                    path=relative(source),
+                    sha256=_file_sha256(source),
+                    rows=len(df),
+                    memory_bytes=int(df.memory_usage(deep=True).sum()) if isinstance(df, pd.DataFrame) else int(df.nbytes),
+                    load_seconds=time.perf_counter() - start,
+                    loaded_at=time.time(),
+                )
+                with self._lock:
+                    self.misses += 1
+            else:
+                with self._lock:
+                    self.hits += 1
+            frame = entry.frame
+            return frame.copy(deep=False) if isinstance(frame, pd.DataFrame) else frame
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def loaded(self):
+        with self._lock:
+            entries = list(self._entries.items())
+        return {key: entry.info for key, entry in entries if entry.info is not None}
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def describe(self):
+        stats = self.stats()
+        memory = sum(info.memory_bytes for info in self.loaded().values())
+        return (f"Dataset cache: {stats['hits']} hits · {stats['misses']} loads · "
+                f"{stats['entries']} frames · {memory / 1e6:.1f} MB")
+
+
+dataset_cache = DatasetCache()
+
+
+def cached_dataset(csv_path, prepare=None, columns=None, build=None):
+    """Prepared DataFrame for `csv_path` (or `build` of it), shared across sessions until the file changes."""
+    return dataset_cache.get(csv_path, prepare, columns, build)
+
+
+def cached_rows(csv_path, rows, columns, prepare=None):
+    """Rows at positions `rows` of the prepared `columns` of `csv_path`, for a dashboard tab.
+
+    A tab reads only its own columns from the Arrow copy. They go through the
+    same `prepare` as the page's full frame, so positions computed on that
+    frame select the same rows here: `columns` must hold every column
+    `prepare` reads, and it may only reorder rows with a stable sort.
+    """
+    return cached_dataset(csv_path, prepare, columns).take(rows)
+
+
+def dataset_version(csv_path):
+    """Hashable token that changes whenever `cached_dataset` would reload `csv_path`."""
+    return _fingerprint(csv_path)
+
+
+def _existing():
+    return [path for path in DATASETS if resolve(path).exists()]
+
+
+def convert_all():
+    for csv_path in DATASETS:
+        if not resolve(csv_path).exists():
+            print(f"{csv_path}: skipped (not in the repository)")
+            continue
+        table, out = convert(csv_path)
+        dictionary = [field.name for field in table.schema if str(field.type).startswith("dictionary")]
+        print(f"{relative(out)}: {table.num_rows} rows, {table.num_columns} columns "
+              f"({len(dictionary)} dictionary-encoded), {out.stat().st_size / 1024:.0f} KB "
+              f"(CSV {resolve(csv_path).stat().st_size / 1024:.0f} KB)")
+
+
+def bench(repeat=10):
+    print(f"{'dataset':<55} {'read_csv':>9} {'arrow':>9} {'arrow, 3 cols':>14} {'same frame':>11}")
+    for csv_path in _existing():
+        if not resolve(columnar_path_for(csv_path)).exists():
+            continue
+        columns = list(pd.read_csv(resolve(csv_path), nrows=0).columns[:3])
+        csv_ms = best_ms(lambda: read_csv(csv_path), repeat)
+        arrow_ms = best_ms(lambda: load_dataset(csv_path), repeat)
+        projected_ms = best_ms(lambda: load_dataset(csv_path, columns), repeat)
+        same = read_csv(csv_path).equals(load_dataset(csv_path))
+        print(f"{csv_path:<55} {csv_ms:>6.1f} ms {arrow_ms:>6.1f} ms {projected_ms:>11.1f} ms {str(same):>11}")
+
+
+def main():
+    run_commands(__doc__, {
+        "convert": (convert_all, "Write the Arrow copy of every dashboard dataset.", {}),
+        "bench": (bench, "Compare CSV and Arrow load times.", {"--repeat": ("repeat", 10)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
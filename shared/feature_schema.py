@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from shared.paths import relative, resolve
+
+# Field kinds understood by FeatureSchema:
+#   numeric - value is written as-is into the column of the same name
+#   binary  - value is mapped through `mapping` into the column of the same name
+#   onehot  - value selects one column from `columns` ({label: column}); unknown
+#             labels leave every column at 0, like the pages' manual loops
+# Columns that no field writes to (e.g. dropped engineered features) stay 0.
+# `encode` rejects a binary value outside `mapping`, or a value outside a field's
+# `choices`, with a ValueError naming the field; a missing field is a KeyError.
+
+_NORMALIZERS = {
+    None: lambda value: value,
+    "snake_lower": lambda value: str(value).lower().replace(" ", "_"),
+}
+
+
+def _unknown_value(name, value, allowed):
+    return ValueError(f"Unknown value {value!r} for field {name!r}, expected one of {allowed}")
+
+
+class FeatureSchema:
+    """Column order, dtypes, vocabularies and input ranges of one model's features."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.model = spec.get("model")
+        self.target = spec.get("target")
+        self.columns = [col["name"] for col in spec["columns"]]
+        self.dtypes = {col["name"]: col["dtype"] for col in spec["columns"]}
+        self.fields = spec["fields"]
+        self.n_features = len(self.columns)
+
+        index = {name: i for i, name in enumerate(self.columns)}
+        self._numeric = []
+        self._binary = []
+        self._onehot = []
+        for field in self.fields:
+            kind = field["kind"]
+            if kind == "numeric":
+                self._numeric.append((field["name"], index[field["name"]]))
+            elif kind == "binary":
+                self._binary.append((field["name"], index[field["name"]], field["mapping"]))
+            elif kind == "onehot":
+                lookup = {label: index[col] for label, col in field["columns"].items()}
+                self._onehot.append((field["name"], lookup, _NORMALIZERS[field.get("normalize")], field.get("choices")))
+            else:
+                raise ValueError(f"Unknown field kind {kind!r} in schema for {self.model}")
+
+    @property
+    def field_names(self):
+        return [field["name"] for field in self.fields]
+
+    def field(self, name):
+        for field in self.fields:
+            if field["name"] == name:
+                return field
+        raise KeyError(name)
+
+    def encode(self, inputs):
+        """Encode one raw input dict into a C-contiguous float32 array of shape (1, n_features)."""
+        row = np.zeros((1, self.n_features), dtype=np.float32)
+        for name, i in self._numeric:
+            row[0, i] = inputs[name]
+        for name, i, mapping in self._binary:
+            value = inputs[name]
+            if value not in mapping:
+                raise _unknown_value(name, value, list(mapping))
+            row[0, i] = mapping[value]
+        for name, lookup, normalize, choices in self._onehot:
+            value = inputs[name]
+            if choices is not None and value not in choices:
+                raise _unknown_value(name, value, choices)
+            i = lookup.get(normalize(value))
+            if i is not None:
+                row[0, i] = 1.0
+        return row
+
+    def encode_frame(self, frame):
+        """Encode a DataFrame of raw inputs into a float32 matrix of shape (len(frame), n_features)."""
+        out = np.zeros((len(frame), self.n_features), dtype=np.float32)
+        for name, i in self._numeric:
+            out[:, i] = pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+        for name, i, mapping in self._binary:
+            out[:, i] = frame[name].map(mapping).to_numpy(dtype=np.float32, na_value=np.nan)
+        rows = np.arange(len(frame))
+        for name, lookup, normalize, _ in self._onehot:
+            values = frame[name] if normalize is _NORMALIZERS[None] else frame[name].map(normalize)
+            labels = list(lookup)
+            codes = pd.Categorical(values, categories=labels).codes
+            known = codes >= 0
+            targets = np.fromiter((lookup[label] for label in labels), dtype=np.intp, count=len(labels))
+            out[rows[known], targets[codes[known]]] = 1.0
+        return out
+
+    def to_frame(self, matrix):
+        """Wrap an encoded matrix as a DataFrame with the model's column names (for display)."""
+        return pd.DataFrame(matrix, columns=self.columns)
+
+
+def schema_path_for(model_path):
+    """`<App>/models/foo.pkl` (or `foo.ubj`, `foo.trees.npz`) -> `<App>/models/foo.schema.json`."""
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.name.split(".")[0] + ".schema.json")
+
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def load_schema(path):
+    """Load a schema file once per process (reloaded only when the file changes)."""
+    key = relative(path)
+    mtime = os.stat(resolve(key)).st_mtime_ns
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    with open(resolve(key), encoding="utf-8") as f:
+        schema = FeatureSchema(json.load(f))
+    with _lock:
+        _cache[key] = (mtime, schema)
+    return schema
+
+
+def schema_for_model(model_path):
+    return load_schema(schema_path_for(model_path))
@@ -0,0 +1,201 @@
+"""Per-session prediction history stored column by column.
+
+Each page keeps a `HistoryBuffer` in `st.session_state` instead of a list of
+one-row DataFrames. Rows are written into preallocated NumPy columns whose
+capacity doubles when full, up to `cap` rows; past the cap the oldest rows are
+overwritten (ring buffer). Rendering builds a DataFrame for the visible page
+only, and exports are produced once, on demand.
+"""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DEFAULT_CAP = int(os.environ.get("PREDICTION_HISTORY_CAP", "5000"))
+PAGE_SIZE = 25
+
+
+def _dtype_of(value):
+    if isinstance(value, (bool, np.bool_)):
+        return np.dtype(bool)
+    if isinstance(value, (int, np.integer)):
+        return np.dtype(np.int64)
+    if isinstance(value, (float, np.floating)):
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+def _common_dtype(current, value):
+    """dtype able to hold both the column's values and `value` (int -> float -> object)."""
+    incoming = _dtype_of(value)
+    if current == incoming or current == object:
+        return current
+    if {current, incoming} == {np.dtype(np.int64), np.dtype(np.float64)}:
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+def _missing(dtype):
+    return np.nan if dtype == np.float64 else None
+
+
+def _empty(dtype, n):
+    if dtype == np.float64 or dtype == object:
+        return np.full(n, _missing(dtype), dtype=dtype)
+    return np.zeros(n, dtype=dtype)
+
+
+class HistoryBuffer:
+    """Append-only columnar table with geometric growth and a row cap.
+
+    `unique=True` skips rows identical to one already stored (the sentiment
+    pages record each review once).
+    """
+
+    def __init__(self, cap=DEFAULT_CAP, capacity=16, unique=False):
+        self.cap = cap
+        self.unique = unique
+        self._capacity = min(capacity, cap)
+        self._columns = {}
+        self._keys = np.empty(self._capacity, dtype=object) if unique else None
+        self._seen = set()
+        self._head = 0
+        self._size = 0
+        self.dropped = 0      # rows overwritten once the cap was reached
+        self.version = 0      # bumped on every change, used to invalidate prepared exports
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self._columns.values())
+
+    def _physical(self, start=0, stop=None):
+        stop = self._size if stop is None else min(stop, self._size)
+        return (self._head + np.arange(start, stop)) % self._capacity
+
+    def _grow(self):
+        order = self._physical()
+        self._capacity = min(self._capacity * 2, self.cap)
+        for name, column in self._columns.items():
+            grown = _empty(column.dtype, self._capacity)
+            grown[:self._size] = column[order]
+            self._columns[name] = grown
+        if self._keys is not None:
+            keys = np.empty(self._capacity, dtype=object)
+            keys[:self._size] = self._keys[order]
+            self._keys = keys
+        self._head = 0
+
+    def _set(self, name, slot, value, first_row):
+        column = self._columns.get(name)
+        if column is None:
+            # A column first seen after other rows needs a dtype that can hold their missing values
+            dtype = _dtype_of(value) if first_row else _common_dtype(np.dtype(np.float64), value)
+            column = self._columns[name] = _empty(dtype, self._capacity)
+        else:
+            dtype = _common_dtype(column.dtype, value)
+            if dtype != column.dtype:
+                column = self._columns[name] = column.astype(dtype)
+        column[slot] = value
+
+    def append(self, row):
+        """Add one row (a mapping of column -> scalar). Returns False if skipped as a duplicate."""
+        key = tuple(row.items()) if self.unique else None
+        if key is not None and key in self._seen:
+            return False
+        if self._size == self._capacity and self._capacity < self.cap:
+            self._grow()
+        first_row = self._size == 0
+        if self._size < self._capacity:
+            slot = (self._head + self._size) % self._capacity
+            self._size += 1
+        else:
+            slot = self._head
+            self._head = (self._head + 1) % self._capacity
+            self.dropped += 1
+            if self._keys is not None:
+                self._seen.discard(self._keys[slot])
+        for name, column in self._columns.items():
+            if name not in row:
+                if column.dtype == np.int64:
+                    column = self._columns[name] = column.astype(np.float64)
+                elif column.dtype == bool:
+                    column = self._columns[name] = column.astype(object)
+                column[slot] = _missing(column.dtype)
+        for name, value in row.items():
+            self._set(name, slot, value, first_row)
+        if key is not None:
+            self._keys[slot] = key
+            self._seen.add(key)
+        self.version += 1
+        return True
+
+    def column(self, name, start=0, stop=None):
+        """Values of one column in insertion order."""
+        return self._columns[name][self._physical(start, stop)]
+
+    def frame(self, start=0, stop=None):
+        """DataFrame of rows `start:stop` (all rows by default), indexed by their running row number."""
+        order = self._physical(start, stop)
+        index = pd.RangeIndex(self.dropped + start, self.dropped + start + len(order))
+        return pd.DataFrame({name: column[order] for name, column in self._columns.items()}, index=index)
+
+    def clear(self):
+        self._columns.clear()
+        self._seen.clear()
+        self._capacity = min(16, self.cap)
+        self._keys = np.empty(self._capacity, dtype=object) if self.unique else None
+        self._head = self._size = self.dropped = 0
+        self.version += 1
+
+    def to_csv(self):
+        return self.frame().to_csv(index=False).encode("utf-8")
+
+    def to_parquet(self):
+        buffer = io.BytesIO()
+        self.frame().to_parquet(buffer, index=False)
+        return buffer.getvalue()
+
+
+def session_history(key, **kwargs):
+    """The session's `HistoryBuffer` under `key` (legacy list values are replaced)."""
+    history = st.session_state.get(key)
+    if not isinstance(history, HistoryBuffer):
+        history = st.session_state[key] = HistoryBuffer(**kwargs)
+    return history
+
+
+EXPORT_FORMATS = {"CSV": ("csv", "text/csv"), "Parquet": ("parquet", "application/vnd.apache.parquet")}
+
+
+def render_history(history, key, empty_message="No input history available.", page_size=PAGE_SIZE, **dataframe_kwargs):
+    """Show one page of `history` with a pager and a one-shot CSV/Parquet export."""
+    if not history:
+        st.info(empty_message)
+        return
+    n_pages = -(-len(history) // page_size)
+    page = st.number_input("Page", 1, n_pages, n_pages, key=f"{key}_page") if n_pages > 1 else 1
+    start = (page - 1) * page_size
+    st.dataframe(history.frame(start, start + page_size), **dataframe_kwargs)
+    st.caption(f"Rows {history.dropped + start + 1}–{history.dropped + min(start + page_size, len(history))} "
+               f"of {history.dropped + len(history)} · keeps the latest {history.cap}")
+
+    format_col, button_col, download_col = st.columns([1, 1, 1])
+    fmt = format_col.selectbox("Export format", list(EXPORT_FORMATS), key=f"{key}_export_format", label_visibility="collapsed")
+    export_key = f"{key}_export"
+    if button_col.button("Prepare export", key=f"{key}_prepare_export"):
+        data = history.to_csv() if fmt == "CSV" else history.to_parquet()
+        st.session_state[export_key] = (history.version, fmt, data)
+    prepared = st.session_state.get(export_key)
+    if prepared is not None and prepared[:2] == (history.version, fmt):
+        extension, mime = EXPORT_FORMATS[fmt]
+        download_col.download_button(f"⬇️ Download {fmt}", prepared[2], file_name=f"{key}.{extension}", mime=mime,
+                                     key=f"{key}_download")
@@ -0,0 +1,35 @@
+"""Dashboard tabs that only run the tab being looked at.
+
+`st.tabs` executes every tab body on every rerun. `lazy_tabs` draws a
+horizontal tab strip and returns the selected label, so a page runs a single
+tab body. Bodies decorated with `memoized_tab` are recorded by
+`st.cache_data` (charts, tables and metrics are replayed, not rebuilt) and
+keyed on their hashable arguments: the tab, the filter selection and the
+dataset version. Arguments starting with an underscore carry the shared
+frames and indexes and are not hashed.
+"""
+import os
+
+import streamlit as st
+
+# Memoized renders kept per tab body function (shared across sessions)
+MAX_ENTRIES = int(os.environ.get("TAB_CACHE_ENTRIES", "64"))
+
+_memoized = []
+
+
+def lazy_tabs(labels, key):
+    """Tab strip returning the selected label; only the caller's branch for it runs."""
+    return st.radio("Section", labels, horizontal=True, key=key, label_visibility="collapsed")
+
+
+def memoized_tab(render):
+    """Decorator for `render(tab, state, version, _data...)`, a tab body without widgets."""
+    cached = st.cache_data(max_entries=MAX_ENTRIES, show_spinner=False)(render)
+    _memoized.append(cached)
+    return cached
+
+
+def clear_tab_cache():
+    for cached in _memoized:
+        cached.clear()
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass
+
+import joblib
+
+from shared.paths import relative, resolve
+
+
+def _load_native_booster(path):
+    from shared.xgb_native import NativeBooster
+
+    return NativeBooster.load(path)
+
+
+def _load_compiled_ensemble(path):
+    from shared.tree_compiler import CompiledEnsemble
+
+    return CompiledEnsemble.load(path)
+
+
+def _load_fast_svm(path):
+    from shared.svm_fast import RBFSVM
+
+    return RBFSVM.load(path)
+
+
+# File suffix -> loader. Native XGBoost boosters (python -m shared.xgb_native export),
+# compiled tree ensembles (python -m shared.tree_compiler compile) and fast SVMs
+# (python -m shared.svm_fast export) are served through the same registry as the pickles.
+LOADERS = {
+    ".pkl": joblib.load,
+    ".ubj": _load_native_booster,
+    ".json": _load_native_booster,
+    ".trees.npz": _load_compiled_ensemble,
+    ".svm.npz": _load_fast_svm,
+    ".nystroem.npz": _load_fast_svm,
+}
+
+
+def _loader_for(path):
+    """Match the longest registered suffix, so `foo.trees.npz` and `foo.svm.npz` get their own loaders."""
+    loader = LOADERS.get("".join(path.suffixes[-2:]))
+    return loader if loader is not None else LOADERS[path.suffix]
+
+
+@dataclass(frozen=True)
+class ModelInfo:
+    path: str             # repo-relative path of the pickle
+    sha256: str           # hash of the file contents
+    file_bytes: int       # size on disk
+    memory_bytes: int     # size of the loaded object (approximated by re-serializing it)
+    load_seconds: float   # time spent in joblib.load
+    mtime_ns: int
+    loaded_at: float
+
+
+class _Entry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.model = None
+        self.info = None
+
+
+class ModelRegistry:
+    """Process-wide store of loaded models.
+
+    Every model is loaded once and the same object is handed to every caller
+    (all Streamlit sessions, the scoring server, ...). A model is reloaded only
+    when its file changes on disk, which also gives it a new `sha256`.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            return entry
+
+    def _load(self, key, stat):
+        path = resolve(key)
+        with open(path, "rb") as f:
+            sha256 = hashlib.file_digest(f, "sha256").hexdigest()
+        start = time.perf_counter()
+        model = _loader_for(path)(path)
+        load_seconds = time.perf_counter() - start
+        info = ModelInfo(
+            path=key,
+            sha256=sha256,
+            file_bytes=stat.st_size,
+            memory_bytes=len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+            load_seconds=load_seconds,
+            mtime_ns=stat.st_mtime_ns,
+            loaded_at=time.time(),
+        )
+        return model, info
+
+    def _ensure(self, path):
+        key = relative(path)
+        entry = self._entry(key)
+        stat = os.stat(resolve(key))
+        info = entry.info
+        if info is not None and info.mtime_ns == stat.st_mtime_ns and info.file_bytes == stat.st_size:
+            return entry
+        with entry.lock:
+            info = entry.info
+            if info is None or info.mtime_ns != stat.st_mtime_ns or info.file_bytes != stat.st_size:
+                entry.model, entry.info = self._load(key, stat)
+        return entry
+
+    def get(self, path):
+        """Return the shared model object stored at `path`."""
+        return self._ensure(path).model
+
+    def info(self, path):
+        """Return the ModelInfo of the model stored at `path` (loading it if needed)."""
+        return self._ensure(path).info
+
+    def preload(self, paths):
+        """Load every model in `paths` now, so the first request does not pay for it."""
+        return [self.info(path) for path in paths]
+
+    def loaded(self):
+        """ModelInfo of every model currently held by the registry."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return [entry.info for entry in entries if entry.info is not None]
+
+
+registry = ModelRegistry()
+
+
+def get_model(path):
+    return registry.get(path)
+
+
+def model_info(path):
+    return registry.info(path)
+
+
+def preload_available(paths):
+    """Preload the models of `paths` whose files are in the checkout (pages list every model they can select)."""
+    return registry.preload([path for path in paths if resolve(path).exists()])
+
+
+def describe(info):
+    """One-line summary of a ModelInfo for display under the model selector."""
+    return (f"`{info.path}` · sha256 `{info.sha256[:12]}` · loaded in {info.load_seconds * 1000:.0f} ms"
+            f" · {info.memory_bytes / 1024:.0f} KB in memory")
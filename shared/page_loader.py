@@ -0,0 +1,160 @@
+"""Lazy page imports for the multi-page apps, and their import-time profile.
+
+    python -m shared.page_loader profile          # per-package import time of every page, each in a fresh interpreter
+    python -m shared.page_loader profile --save   # ... and record the times as the cold-start budget
+    python -m shared.page_loader check            # fail when a page outgrows its budget or a light page pulls in heavy packages
+
+The routers (`<App>/main.py`) call `load_page("my_pages.dashboard")` in the
+branch of the selected page instead of importing every page at startup. A
+session on About or Contact therefore never imports plotly, joblib, nltk or
+the models' libraries. Each module is imported once per process (Python
+caches it), and the first import time is kept for the cache admin panel.
+
+`profile` imports each page in a fresh interpreter under `python -X
+importtime`, after `streamlit` is already imported, so the times are the
+page's own cost. `--save` writes them to `shared/import_budget.json`.
+`check` re-measures and fails when a page is slower than its recorded time
+times BUDGET_FACTOR (plus BUDGET_SLACK_MS for noise). It also fails when the
+router or a light page (about, contact, insights) imports any of
+HEAVY_PACKAGES, whatever the budget file says.
+"""
+import importlib
+import json
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from shared.cli import run_commands
+from shared.paths import REPO_ROOT, resolve
+
+BUDGET_PATH = "shared/import_budget.json"
+BUDGET_FACTOR = 1.5
+BUDGET_SLACK_MS = 50
+# Measured after `import streamlit`, which already loads PIL, so PIL could never be flagged
+HEAVY_PACKAGES = ("pandas", "plotly", "joblib", "nltk", "sklearn", "xgboost")
+
+# Page modules of each app, as its router imports them (the app directory is on sys.path)
+APPS = {
+    "Project_": ["my_pages.about", "my_pages.contact", "my_pages.dashboard_churn", "my_pages.dashboard_sentiment",
+                 "my_pages.prediction_churn", "my_pages.prediction_sentiment"],
+    "Bank_Card": ["my_pages.about", "my_pages.insights", "my_pages.dashboard_churn", "my_pages.prediction_churn"],
+    "Zomato_Delivery_Time": ["my_pages.about", "my_pages.insights", "my_pages.dashboard", "my_pages.prediction"],
+    "Project_Portofolio": ["about", "contact", "dashboard", "prediction"],
+}
+# What every router imports before any page is selected
+ROUTER_IMPORTS = ["streamlit_option_menu", "shared.admin", "shared.page_loader"]
+LIGHT_PAGES = ("about", "contact", "insights")
+
+_load_times = {}
+_load_lock = threading.Lock()
+
+
+def load_page(module):
+    """Import the page `module` on first use and return it."""
+    page = sys.modules.get(module)
+    if page is not None:
+        return page
+    with _load_lock:
+        start = time.perf_counter()
+        page = importlib.import_module(module)
+        _load_times.setdefault(module, time.perf_counter() - start)
+    return page
+
+
+def describe():
+    loaded = ", ".join(f"{module.rsplit('.', 1)[-1]} {seconds * 1000:.0f} ms"
+                       for module, seconds in sorted(_load_times.items()))
+    return f"Pages imported: {loaded or 'none yet'}"
+
+
+_IMPORT_LINE = re.compile(r"import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)")
+_MARKER = "--- page import ---"
+
+
+def _measure(app, modules):
+    """Wall time, per-package self time and newly imported packages for `modules`, in a fresh interpreter."""
+    code = "\n".join([
+        "import sys, time",
+        f"sys.path[:0] = [{str(REPO_ROOT)!r}, {str(resolve(app))!r}]",
+        "import streamlit",
+        "before = set(sys.modules)",
+        f"sys.stderr.write({_MARKER!r} + '\\n')",
+        "start = time.perf_counter()",
+        *[f"import {module}" for module in modules],
+        "print(time.perf_counter() - start)",
+        "print(' '.join(sorted({name.split('.')[0] for name in set(sys.modules) - before})))",
+    ])
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines() or [f"exit code {result.returncode}"]
+        raise RuntimeError(f"{app}: importing {', '.join(modules)} failed: {error[-1]}")
+    seconds, packages = result.stdout.splitlines()[-2:]
+    self_us = defaultdict(int)
+    for line in result.stderr.split(_MARKER, 1)[-1].splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us[match.group(4).split(".")[0]] += int(match.group(1))
+    return float(seconds) * 1000, dict(self_us), packages.split()
+
+
+def _targets():
+    for app, modules in APPS.items():
+        yield app, "(router)", ROUTER_IMPORTS
+        for module in modules:
+            yield app, module, [module]
+
+
+def profile(top=5, save=False):
+    times = {}
+    print(f"{'app':<22} {'page':<32} {'import':>9}  top packages (self time)")
+    for app, page, modules in _targets():
+        ms, self_us, _ = _measure(app, modules)
+        times[f"{app}:{page}"] = round(ms, 1)
+        heaviest = sorted(self_us.items(), key=lambda item: -item[1])[:top]
+        breakdown = ", ".join(f"{name} {us / 1000:.0f}" for name, us in heaviest)
+        print(f"{app:<22} {page:<32} {ms:>6.0f} ms  {breakdown}")
+    if save:
+        with open(resolve(BUDGET_PATH), "w") as f:
+            json.dump(times, f, indent=2)
+            f.write("\n")
+        print(f"Budget written to {BUDGET_PATH}")
+
+
+def check():
+    path = resolve(BUDGET_PATH)
+    budget = json.loads(path.read_text()) if path.exists() else {}
+    if not budget:
+        print(f"{BUDGET_PATH}: no budget recorded (run `profile --save`); checking heavy imports only")
+    ok = True
+    for app, page, modules in _targets():
+        ms, _, packages = _measure(app, modules)
+        problems = []
+        if page == "(router)" or page.rsplit(".", 1)[-1] in LIGHT_PAGES:
+            heavy = sorted(set(packages) & set(HEAVY_PACKAGES))
+            if heavy:
+                problems.append(f"imports {', '.join(heavy)}")
+        limit = budget.get(f"{app}:{page}")
+        if limit is not None and ms > limit * BUDGET_FACTOR + BUDGET_SLACK_MS:
+            problems.append(f"over budget ({limit:.0f} ms recorded)")
+        limit_text = "" if limit is None else f" / {limit:.0f} ms"
+        print(f"{app:<22} {page:<32} {ms:>6.0f} ms{limit_text}  {'; '.join(problems) or 'ok'}")
+        ok &= not problems
+    return ok
+
+
+def main():
+    run_commands(__doc__, {
+        "profile": (profile, "Per-package import time of every page.", {
+            "--top": ("top", 5),
+            "--save": ("save", False, {"help": f"Record the times in {BUDGET_PATH}."}),
+        }),
+        "check": (check, "Compare page import times with the recorded budget.", {}),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+# All dataset/model paths in the apps are written relative to the repository root
+# (the apps are started with `streamlit run <App>/main.py` from there).
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def resolve(path):
+    """Return an absolute Path for a repo-relative (or absolute) path."""
+    path = Path(path)
+    return path if path.is_absolute() else REPO_ROOT / path
+
+
+def relative(path):
+    """Return the repo-relative posix string used as a cache key for `path`."""
+    path = resolve(path)
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from shared.model_registry import registry
+
+
+class PredictionCache:
+    """Bounded, process-wide LRU cache of model outputs.
+
+    Entries are keyed on (model sha256, method, encoded feature bytes), so the
+    same form values give a hit from any session. When a model file changes
+    the registry reports a new hash and the old model's entries are dropped.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._hash_by_model = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop_model(self, sha256):
+        stale = [key for key in self._data if key[0] == sha256]
+        for key in stale:
+            del self._data[key]
+        self.evictions += len(stale)
+
+    def predict(self, model_path, features, method="predict"):
+        """Return `getattr(model, method)(features)`, served from the cache when possible."""
+        sha256 = registry.info(model_path).sha256
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        key = (sha256, method, features.shape, features.tobytes())
+        with self._lock:
+            previous = self._hash_by_model.get(model_path)
+            if previous != sha256:
+                if previous is not None:
+                    self._drop_model(previous)
+                self._hash_by_model[model_path] = sha256
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = np.asarray(getattr(registry.get(model_path), method)(features))
+        value.setflags(write=False)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._hash_by_model.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._data), "maxsize": self.maxsize}
+
+    def describe(self):
+        stats = self.stats()
+        return (f"Prediction cache: {stats['hits']} hits · {stats['misses']} misses · "
+                f"{stats['evictions']} evictions · {stats['size']}/{stats['maxsize']} entries")
+
+
+prediction_cache = PredictionCache()
+
+
+def cached_predict(model_path, features, method="predict"):
+    return prediction_cache.predict(model_path, features, method)
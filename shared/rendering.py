@@ -0,0 +1,168 @@
+"""Server-side histogram binning and paged data tables for the dashboards.
+
+    python -m shared.rendering check   # binned counts vs numpy.histogram, per colour/facet group
+    python -m shared.rendering bench   # figure JSON size and build time, px.histogram vs binned, at 10k to 2M rows
+
+`px.histogram` embeds every row of its frame in the figure and the browser
+does the binning. `histogram` takes the same arguments but bins on the
+server. It picks round, evenly spaced edges and counts rows per bin and per
+colour/facet group in NumPy. The counts are drawn as touching bars, so the
+figure holds one value per bin and group whatever the row count.
+`paged_dataframe` sends one window of rows at a time behind a pager, like the
+prediction history tables (`shared.history`).
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from shared.cli import best_ms, run_commands
+from shared.paths import resolve
+
+PAGE_SIZE = 100
+_NICE_STEPS = (1, 2, 2.5, 5, 10)
+
+
+def bin_edges(values, nbins):
+    """Round, evenly spaced edges giving about `nbins` bins; the last edge lies above the maximum."""
+    values = pd.Series(values).dropna()
+    if values.empty:
+        return np.array([0.0, 1.0])
+    lo, hi = float(values.min()), float(values.max())
+    raw = (hi - lo) / max(int(nbins), 1) or 1.0
+    magnitude = 10.0 ** np.floor(np.log10(raw))
+    width = next(step * magnitude for step in _NICE_STEPS if step * magnitude >= raw)
+    if pd.api.types.is_integer_dtype(values):
+        width = max(1.0, np.ceil(width))
+    first = np.floor(lo / width) * width
+    return first + width * np.arange(np.floor((hi - first) / width) + 2)
+
+
+def bin_counts(df, x, edges, by=(), y=None):
+    """Rows (or the sum of `y`) per bin of `x` and per combination of the `by` columns.
+
+    Bins include their left edge and exclude their right one, as in
+    `numpy.histogram`. Rows with a missing `x` are left out.
+    """
+    by = list(by)
+    values = df[x].to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    codes = np.clip(np.searchsorted(edges, values[valid], side="right") - 1, 0, len(edges) - 2)
+    counts = df.loc[valid, by].reset_index(drop=True)
+    counts["bin"] = codes
+    counts["count"] = 1 if y is None else np.nan_to_num(df[y].to_numpy(dtype=float)[valid])
+    return counts.groupby(by + ["bin"], observed=True)["count"].sum().reset_index()
+
+
+def histogram(df, x, y=None, color=None, facet_col=None, facet_row=None, nbins=20, **px_kwargs):
+    """`px.histogram` drop-in that bins on the server and draws one bar per bin and group."""
+    by = list(dict.fromkeys(col for col in (color, facet_col, facet_row) if col is not None))
+    edges = bin_edges(df[x], nbins)
+    counts = bin_counts(df, x, edges, by, y)
+    width = edges[1] - edges[0]
+    labels = np.array([f"{left:g} – {right:g}" for left, right in zip(edges[:-1], edges[1:])])
+
+    value = "count" if y is None else y
+    counts = counts.rename(columns={"count": value})
+    counts[x] = edges[counts["bin"].to_numpy()] + width / 2
+    counts["range"] = labels[counts["bin"].to_numpy()]
+    fig = px.bar(counts, x=x, y=value, color=color, facet_col=facet_col, facet_row=facet_row,
+                 hover_data={x: False, "range": True}, **px_kwargs)
+    fig.update_traces(width=width)
+    fig.update_layout(bargap=0)
+    return fig
+
+
+def paged_dataframe(df, key, rows=None, page_size=PAGE_SIZE, **dataframe_kwargs):
+    """Show one page of `df` (or of the row positions `rows`) with a pager; only that window is sent.
+
+    Returns the page shown (empty when there are no rows).
+    """
+    n_rows = len(df) if rows is None else len(rows)
+    if n_rows == 0:
+        st.info("No rows to display.")
+        return df.iloc[:0]
+    n_pages = -(-n_rows // page_size)
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        # The filters shrank the table: stay on its new last page
+        st.session_state[page_key] = n_pages
+    page = st.number_input("Page", 1, n_pages, key=page_key) if n_pages > 1 else 1
+    start = (page - 1) * page_size
+    window = slice(start, start + page_size)
+    page_df = df.iloc[window] if rows is None else df.take(rows[window])
+    st.dataframe(page_df, **dataframe_kwargs)
+    st.caption(f"Rows {start + 1:,}–{min(start + page_size, n_rows):,} of {n_rows:,}")
+    return page_df
+
+
+# Histogram columns of Zomato_Delivery_Time/my_pages/dashboard.py
+ZOMATO_DATASET = "Zomato_Delivery_Time/dataset/df_zomato_dashboard.csv"
+ZOMATO_HISTOGRAMS = [("Time_taken (min)", None, 40), ("Speed_kmph", "delivery_speed_category", 24)]
+
+
+def synthetic_orders(n_rows, seed=0):
+    """Orders with the dashboard's histogram columns, for checking and benchmarking at scale."""
+    rng = np.random.default_rng(seed)
+    speed = rng.gamma(4.0, 5.0, n_rows).round(2)
+    speed[rng.random(n_rows) < 0.01] = np.nan
+    return pd.DataFrame({
+        "Time_taken (min)": rng.integers(10, 55, n_rows),
+        "Speed_kmph": speed,
+        "delivery_speed_category": np.where(speed >= 20, "Fast", "Slow"),
+    })
+
+
+def _datasets():
+    yield "synthetic (100k orders)", synthetic_orders(100_000)
+    if resolve(ZOMATO_DATASET).exists():
+        from shared.datasets import load_dataset
+
+        yield ZOMATO_DATASET, load_dataset(ZOMATO_DATASET)
+    else:
+        print(f"{ZOMATO_DATASET}: skipped (not in the repository)")
+
+
+def check():
+    ok = True
+    for name, df in _datasets():
+        mismatches = 0
+        for x, color, nbins in ZOMATO_HISTOGRAMS:
+            edges = bin_edges(df[x], nbins)
+            by = [] if color is None else [color]
+            counts = bin_counts(df, x, edges, by)
+            groups = [(None, df)] if color is None else df.groupby(color, observed=True)
+            for level, group in groups:
+                got = counts if color is None else counts[counts[color] == level]
+                binned = np.zeros(len(edges) - 1, dtype=np.int64)
+                binned[got["bin"].to_numpy()] = got["count"].to_numpy()
+                expected, _ = np.histogram(group[x].dropna(), edges)
+                mismatches += int(not np.array_equal(binned, expected))
+            print(f"{name}: {x!r} in {len(edges) - 1} bins of {edges[1] - edges[0]:g}")
+        print(f"{name}: {mismatches} mismatching histograms")
+        ok &= mismatches == 0
+    return ok
+
+
+def bench(sizes=(10_000, 100_000, 1_000_000, 2_000_000), repeat=3):
+    x, color, nbins = ZOMATO_HISTOGRAMS[1]
+    print(f"{'rows':>10} {'px.histogram':>21} {'binned':>20}")
+    for n_rows in sizes:
+        df = synthetic_orders(n_rows)
+        raw = px.histogram(df, x=x, color=color, nbins=nbins).to_json()
+        binned = histogram(df, x=x, color=color, nbins=nbins).to_json()
+        raw_ms = best_ms(lambda: px.histogram(df, x=x, color=color, nbins=nbins).to_json(), repeat)
+        binned_ms = best_ms(lambda: histogram(df, x=x, color=color, nbins=nbins).to_json(), repeat)
+        print(f"{n_rows:>10,} {len(raw) / 1e6:>8.2f} MB {raw_ms:>7.0f} ms "
+              f"{len(binned) / 1e3:>7.1f} KB {binned_ms:>7.1f} ms")
+
+
+def main():
+    run_commands(__doc__, {
+        "check": (check, "Compare binned counts with numpy.histogram.", {}),
+        "bench": (bench, "Figure size and build time: px.histogram vs binned.", {"--repeat": ("repeat", 3)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
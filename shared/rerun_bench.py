@@ -0,0 +1,260 @@
+"""Rerun latency of every Streamlit page, driven headlessly with scripted widget interactions.
+
+    python -m shared.rerun_bench run                   # every page; writes rerun_bench.json, compares with the baseline
+    python -m shared.rerun_bench run --page Bank_Card/dashboard_churn --rounds 50
+    python -m shared.rerun_bench run --save-baseline   # ... and record the results as shared/rerun_baseline.json
+
+Each page runs in its own interpreter under `streamlit.testing.v1.AppTest`,
+called the way its router calls it, with the working directory at the
+repository root. Its STEPS are the interactions a user makes: move a
+slider, change a filter, switch a dashboard tab, press Predict. They are
+replayed for `--rounds` rounds, and every step is one timed rerun. The first
+run (imports, dataset and model loads) is reported apart as `first_ms`.
+
+Per page the results hold p50/p95 rerun time, peak RSS of its interpreter
+and the bytes sent to the frontend per rerun. Streamlit sends every element
+of the page on each rerun, so the bytes are the serialized size of the
+element tree after the rerun; the p95 over the steps is kept. A page fails
+when its p95 rerun time, bytes or peak RSS exceeds the baseline by more than
+the tolerances below, or when it raises. `run` then exits with status 1. A
+page whose data files are not in the checkout (REQUIRES) is reported as
+skipped and does not fail the run.
+"""
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from shared.cli import run_commands
+from shared.paths import REPO_ROOT, resolve
+
+RESULTS_PATH = "rerun_bench.json"
+BASELINE_PATH = "shared/rerun_baseline.json"
+# Allowed growth over the baseline: (factor, absolute slack)
+TOLERANCE = {"p95_ms": (1.5, 20.0), "bytes_p95": (1.1, 1024), "peak_rss_mb": (1.25, 25.0)}
+RUN_TIMEOUT = 60
+
+# page: (app directory, page module, entry function, [(widget kind, key or label, action)])
+# Actions: "click", "cycle" (next option), "toggle" (all options / all but the last),
+# "nudge" (slider between its minimum and a quarter of its range), or a list of values to cycle.
+PAGES = {
+    "Project_/dashboard_churn": ("Project_", "my_pages.dashboard_churn", "dashboard_churn", [
+        ("selectbox", "Select Gender:", "cycle"),
+        ("selectbox", "Select Geography:", "cycle"),
+        ("radio", "churn_dashboard_tab", "cycle"),
+    ]),
+    "Project_/dashboard_sentiment": ("Project_", "my_pages.dashboard_sentiment", "dashboard_sentiment", [
+        ("selectbox", "Select Ticket System:", "cycle"),
+        ("radio", "sentiment_dashboard_tab", "cycle"),
+    ]),
+    "Bank_Card/dashboard_churn": ("Bank_Card", "my_pages.dashboard_churn", "app", [
+        ("multiselect", "Select Gender:", "toggle"),
+        ("slider", "Customer Age Range:", "nudge"),
+        ("radio", "bank_dashboard_tab", "cycle"),
+    ]),
+    "Zomato_Delivery_Time/dashboard": ("Zomato_Delivery_Time", "my_pages.dashboard", "app", [
+        ("multiselect", "Weather Conditions:", "toggle"),
+        ("multiselect", "Traffic Density:", "toggle"),
+        ("radio", "zomato_dashboard_tab", "cycle"),
+    ]),
+    "Project_Portofolio/dashboard": ("Project_Portofolio", "dashboard", "dashboard", [
+        ("selectbox", "Select Gender:", "cycle"),
+        ("selectbox", "Select Geography:", "cycle"),
+    ]),
+    "Project_/prediction_churn": ("Project_", "my_pages.prediction_churn", "prediction_churn", [
+        ("slider", "Credit Score", "nudge"),
+        ("button", "Predict Churn", "click"),
+    ]),
+    "Bank_Card/prediction_churn": ("Bank_Card", "my_pages.prediction_churn", "app", [
+        ("radio", "Select Model", "cycle"),
+        ("slider", "Customer Age", "nudge"),
+        ("button", "Predict Churn", "click"),
+    ]),
+    "Zomato_Delivery_Time/prediction": ("Zomato_Delivery_Time", "my_pages.prediction", "app", [
+        ("radio", "reg_model_option", ["XGBoost"]),
+        ("slider", "age_reg", "nudge"),
+        ("button", "predict_reg", "click"),
+    ]),
+    "Project_Portofolio/prediction": ("Project_Portofolio", "prediction", "prediction", [
+        ("slider", "Credit Score", "nudge"),
+        ("button", "Predict Churn", "click"),
+    ]),
+    "Project_/prediction_sentiment": ("Project_", "my_pages.prediction_sentiment", "prediction_sentiment", [
+        ("text_input", "review_search_Positive", ["support", "easy to use", ""]),
+        ("text_area", "Enter your review here:", ["The support team solved my ticket fast.", "Slow and confusing."]),
+        ("button", "🔮 Predict", "click"),
+    ]),
+}
+# Files a page cannot run without that are not in the repository; the page is skipped when one is missing
+REQUIRES = {
+    "Zomato_Delivery_Time/dashboard": ["Zomato_Delivery_Time/dataset/df_zomato_dashboard.csv"],
+}
+
+
+def _script(app, module, function):
+    return "\n".join([
+        "import sys",
+        f"sys.path[:0] = [{str(REPO_ROOT)!r}, {str(resolve(app))!r}]",
+        "from shared.page_loader import load_page",
+        f"load_page({module!r}).{function}()",
+    ])
+
+
+def _widget(at, kind, selector):
+    for widget in getattr(at, kind):
+        if selector in (getattr(widget, "key", None), getattr(widget, "label", None)):
+            return widget
+    raise LookupError(f"no {kind} with key or label {selector!r} on the page")
+
+
+def _act(widget, action, round_):
+    if action == "click":
+        widget.click()
+    elif action == "cycle":
+        current = str(widget.value)
+        position = widget.options.index(current) if current in widget.options else -1
+        widget.set_value(widget.options[(position + 1) % len(widget.options)])
+    elif action == "toggle":
+        widget.set_value(widget.options if round_ % 2 else widget.options[:-1])
+    elif action == "nudge":
+        low, high = widget.min, widget.max
+        shifted = type(low)(low + (high - low) / 4)
+        if isinstance(widget.value, (list, tuple)):
+            widget.set_value((low, high) if round_ % 2 else (shifted, high))
+        else:
+            widget.set_value(low if round_ % 2 else shifted)
+    else:
+        widget.set_value(action[round_ % len(action)])
+
+
+def _tree_bytes(node):
+    """Serialized size of the elements under `node` (what a rerun sends to the browser)."""
+    proto = getattr(node, "proto", None)
+    size = proto.ByteSize() if proto is not None else 0
+    return size + sum(_tree_bytes(child) for child in getattr(node, "children", {}).values())
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def measure_page(name, rounds):
+    """Drive page `name` in this process; returns its result record."""
+    from streamlit.testing.v1 import AppTest
+
+    app, module, function, steps = PAGES[name]
+    at = AppTest.from_string(_script(app, module, function), default_timeout=RUN_TIMEOUT)
+    start = time.perf_counter()
+    at.run()
+    first_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"{name}: {at.exception[0].message}")
+
+    times, sizes = [], []
+    for round_ in range(rounds):
+        for kind, selector, action in steps:
+            _act(_widget(at, kind, selector), action, round_)
+            start = time.perf_counter()
+            at.run()
+            times.append((time.perf_counter() - start) * 1000)
+            if at.exception:
+                raise RuntimeError(f"{name}: {kind} {selector!r}: {at.exception[0].message}")
+            sizes.append(_tree_bytes(at._tree))
+    return {
+        "page": name,
+        "reruns": len(times),
+        "first_ms": round(first_ms, 1),
+        "p50_ms": round(float(np.percentile(times, 50)), 2),
+        "p95_ms": round(float(np.percentile(times, 95)), 2),
+        "bytes_p95": int(np.percentile(sizes, 95)),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _run_page(name, rounds):
+    """`measure_page` in a fresh interpreter, so peak RSS and caches belong to that page alone."""
+    missing = [path for path in REQUIRES.get(name, []) if not resolve(path).exists()]
+    if missing:
+        return {"page": name, "skipped": f"{', '.join(missing)} not found"}
+    result = subprocess.run([sys.executable, "-m", "shared.rerun_bench", "page", name, "--rounds", str(rounds)],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines() or [f"exit code {result.returncode}"]
+        return {"page": name, "error": error[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def regressions(result, baseline):
+    """Metrics of `result` beyond the tolerances of its `baseline` record."""
+    problems = []
+    for metric, (factor, slack) in TOLERANCE.items():
+        if metric in baseline and result[metric] > baseline[metric] * factor + slack:
+            problems.append(f"{metric} {result[metric]:g} > {baseline[metric]:g}")
+    return problems
+
+
+def print_page(name, rounds=20):
+    print(json.dumps(measure_page(name, rounds)))
+
+
+def run(pages=None, rounds=20, out=RESULTS_PATH, save_baseline=False):
+    pages = pages or list(PAGES)
+    path = resolve(BASELINE_PATH)
+    baseline = json.loads(path.read_text()) if path.exists() else {}
+    if not baseline:
+        print(f"{BASELINE_PATH}: no baseline recorded (run with --save-baseline); reporting only")
+    results, ok = [], True
+    print(f"{'page':<34} {'first':>8} {'p50':>8} {'p95':>8} {'sent p95':>10} {'peak RSS':>9}")
+    for name in pages:
+        result = _run_page(name, rounds)
+        results.append(result)
+        if "skipped" in result:
+            print(f"{name:<34} skipped: {result['skipped']}")
+            continue
+        if "error" in result:
+            print(f"{name:<34} FAILED: {result['error']}")
+            ok = False
+            continue
+        problems = regressions(result, baseline.get(name, {}))
+        result["regressions"] = problems
+        ok &= not problems
+        print(f"{name:<34} {result['first_ms']:>5.0f} ms {result['p50_ms']:>5.0f} ms {result['p95_ms']:>5.0f} ms "
+              f"{result['bytes_p95'] / 1e3:>7.1f} KB {result['peak_rss_mb']:>6.0f} MB"
+              f"{'  REGRESSION: ' + '; '.join(problems) if problems else ''}")
+
+    with open(resolve(out), "w") as f:
+        json.dump({"rounds": rounds, "python": sys.version.split()[0], "results": results}, f, indent=2)
+        f.write("\n")
+    print(f"Results written to {out}")
+    if save_baseline:
+        recorded = {result["page"]: {metric: result[metric] for metric in TOLERANCE}
+                    for result in results if "p95_ms" in result}
+        with open(path, "w") as f:
+            json.dump({**baseline, **recorded}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return all("error" not in result for result in results)
+    return ok
+
+
+def main():
+    pages = {"choices": list(PAGES)}
+    run_commands(__doc__, {
+        "run": (run, "Benchmark pages and compare with the baseline.", {
+            "--page": ("pages", None, {**pages, "action": "append", "help": "Only this page (repeatable)."}),
+            "--rounds": ("rounds", 20),
+            "--out": ("out", RESULTS_PATH),
+            "--save-baseline": ("save_baseline", False, {"help": f"Record the results in {BASELINE_PATH}."}),
+        }),
+        "page": (print_page, "Benchmark one page in this process and print its JSON record.",
+                 {"name": ("name", None, pages), "--rounds": ("rounds", 20)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Inverted token index for searching the review corpus on the sentiment page.
+
+    python -m shared.review_index check   # index matches vs a token scan of every review
+    python -m shared.review_index bench   # query latency: str.contains scan vs index, at 1x/10x/100x reviews
+
+A `ReviewIndex` is built once per dataset version (through `cached_dataset`).
+Reviews are lower-cased and split into word tokens. Each token keeps a
+postings list of (review, term frequency) pairs in CSR arrays over a sorted
+vocabulary. A query's words are looked up exactly, except the last one,
+which matches as a prefix so results follow the search box while typing.
+Matches are ranked by BM25 and restricted to one sentiment label. The page
+then sends only the current page of them to the browser.
+"""
+import re
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from shared.cli import best_ms, run_commands
+
+
+TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+K1, B = 1.2, 0.75
+
+
+def tokenize(text):
+    return TOKEN.findall(str(text).lower())
+
+
+class ReviewIndex:
+    """BM25-ranked token search over `texts`, each review tagged with one of `labels`."""
+
+    def __init__(self, texts, labels):
+        self.labels = np.asarray(labels, dtype=object)
+        vocab = {}
+        terms, docs, freqs = [], [], []
+        lengths = np.zeros(len(self.labels), dtype=np.float64)
+        for doc, text in enumerate(texts):
+            tokens = tokenize(text)
+            lengths[doc] = len(tokens)
+            for token, freq in Counter(tokens).items():
+                terms.append(vocab.setdefault(token, len(vocab)))
+                docs.append(doc)
+                freqs.append(freq)
+
+        # Renumber terms in sorted token order so prefixes are contiguous id ranges
+        tokens = np.array(list(vocab), dtype=object)
+        order = np.argsort(tokens, kind="stable")
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        self.vocab = tokens[order].astype(str)
+        terms = rank[np.asarray(terms, dtype=np.int64)]
+        by_term = np.lexsort((np.asarray(docs, dtype=np.int64), terms))
+        self.docs = np.asarray(docs, dtype=np.int32)[by_term]
+        self.freqs = np.asarray(freqs, dtype=np.float32)[by_term]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(terms, minlength=len(self.vocab)))])
+        self.lengths = lengths
+        self.avg_length = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+        doc_freq = np.diff(self.indptr)
+        self.idf = np.log1p((len(lengths) - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    @classmethod
+    def from_frame(cls, df, text="overall_text", label="predicted_sentiment"):
+        return cls(df[text].tolist(), df[label].to_numpy())
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def nbytes(self):
+        return (self.docs.nbytes + self.freqs.nbytes + self.indptr.nbytes + self.lengths.nbytes
+                + self.idf.nbytes + self.vocab.nbytes + self.labels.nbytes)
+
+    def _term_ids(self, token, prefix):
+        lo = int(np.searchsorted(self.vocab, token, side="left"))
+        if not prefix:
+            return range(lo, lo + 1) if lo < len(self.vocab) and self.vocab[lo] == token else range(0)
+        hi = int(np.searchsorted(self.vocab, token + "\uffff", side="left"))
+        return range(lo, hi)
+
+    def search(self, query, label=None):
+        """Positions of the reviews matching `query` (best first) within `label`.
+
+        An empty query returns every review of `label` in dataset order.
+        """
+        allowed = np.ones(len(self), dtype=bool) if label is None else self.labels == label
+        tokens = tokenize(query)
+        if not tokens:
+            return np.flatnonzero(allowed)
+        scores = np.zeros(len(self), dtype=np.float64)
+        norm = K1 * (1 - B + B * self.lengths / self.avg_length)
+        for i, token in enumerate(tokens):
+            for term in self._term_ids(token, prefix=i == len(tokens) - 1):
+                lo, hi = self.indptr[term], self.indptr[term + 1]
+                docs, freqs = self.docs[lo:hi], self.freqs[lo:hi]
+                scores[docs] += self.idf[term] * freqs * (K1 + 1) / (freqs + norm[docs])
+        hits = np.flatnonzero((scores > 0) & allowed)
+        return hits[np.argsort(-scores[hits], kind="stable")]
+
+
+def _scan(texts, labels, query, label):
+    """Reviews containing every query word (the last one as a prefix), by token scan."""
+    words = tokenize(query)
+    matches = []
+    for doc, text in enumerate(texts):
+        if label is not None and labels[doc] != label:
+            continue
+        tokens = set(tokenize(text))
+        if all(word in tokens for word in words[:-1]) and (
+                not words or any(token.startswith(words[-1]) for token in tokens)):
+            matches.append(doc)
+    return np.array(matches, dtype=np.int64)
+
+
+def _load_reviews(scale=1):
+    from shared.sentiment import REVIEWS_DATASET, load_reviews, scored_reviews
+
+    df = scored_reviews(load_reviews(), REVIEWS_DATASET).reset_index(drop=True)
+    if scale > 1:
+        df = pd.concat([df] * scale, ignore_index=True)
+    return df
+
+
+QUERIES = ["support", "ticket", "easy to use", "slow resp", "customer service", "price", "integration with"]
+
+
+def check():
+    df = _load_reviews()
+    index = ReviewIndex.from_frame(df)
+    texts, labels = df["overall_text"].tolist(), df["predicted_sentiment"].to_numpy()
+    mismatches = 0
+    for query in QUERIES:
+        for label in [None, "Positive", "Neutral", "Negative"]:
+            hits = index.search(query, label)
+            expected = _scan(texts, labels, query, label)
+            # Every review with all the words is found; ranking may add partial matches after them
+            ok = np.isin(expected, hits).all() and (label is None or (labels[hits] == label).all())
+            mismatches += not ok
+    print(f"{len(df)} reviews, {len(index.vocab)} tokens, index {index.nbytes / 1e6:.1f} MB: "
+          f"{len(QUERIES) * 4} queries, {mismatches} mismatches")
+    return mismatches == 0
+
+
+def bench(scales=(1, 10, 100), repeat=5):
+    print(f"{'reviews':>9} {'build':>9} {'str.contains':>13} {'index':>9}")
+    for scale in scales:
+        df = _load_reviews(scale)
+        start = time.perf_counter()
+        index = ReviewIndex.from_frame(df)
+        build_ms = (time.perf_counter() - start) * 1000
+        texts = df["overall_text"].str.lower()
+
+        def scan():
+            for query in QUERIES:
+                texts[texts.str.contains(query, regex=False)]
+
+        def lookup():
+            for query in QUERIES:
+                index.search(query, "Positive")
+
+        print(f"{len(df):>9,} {build_ms:>6.0f} ms {best_ms(scan, repeat):>10.1f} ms "
+              f"{best_ms(lookup, repeat):>6.2f} ms")
+
+
+def main():
+    run_commands(__doc__, {
+        "check": (check, "Compare index matches with a token scan.", {}),
+        "bench": (bench, "Query latency: scan vs index.", {"--repeat": ("repeat", 5)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
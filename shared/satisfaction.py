@@ -0,0 +1,164 @@
+"""NPS, CSAT and CES for the satisfaction dashboard from additive per-group statistics.
+
+    python -m shared.satisfaction check   # KPIs vs the former row-level formulas, overall and per group
+    python -m shared.satisfaction bench   # per-date NPS: groupby.apply vs one vectorized pass, at 1x/10x/100x rows
+
+Every KPI is a ratio of sums: responders, satisfied responders, promoters,
+passives and detractors, and the sum and non-missing count of each score
+given by a responder. `survey_stats` derives these per row in one
+vectorized pass. `survey_sums` adds them up under any grouping (date,
+ticket_system, date x ticket_system, or none). `survey_metrics` turns a
+Series or frame of sums into the KPIs. The dashboard's `DailyRollup`
+(`shared.time_index.survey_rollup`) keeps the same statistics per day, so
+its range totals and per-day rows go straight into `survey_metrics`.
+"""
+import numpy as np
+import pandas as pd
+
+from shared.cli import best_ms, run_commands
+
+SURVEY_DATASET = "Project_/dataset/ticket_system_review.csv"
+SURVEY_SCORES = ["likelihood_to_recommend", "overall_rating", "ease_of_use"]
+MAX_SCORE = {"likelihood_to_recommend": 10, "overall_rating": 5, "ease_of_use": 5}
+NPS_CATEGORIES = ["Promoter", "Passive", "Detractor", "Unknown"]
+
+
+def survey_flags(df):
+    """Per-row responder, CSAT and NPS class flags; only responders are flagged."""
+    rating, ltr = df["overall_rating"], df["likelihood_to_recommend"]
+    responded = rating.notna()
+    return {
+        "responders": responded,
+        "satisfied": responded & (rating >= 4),
+        "promoters": responded & (ltr >= 9),
+        "passives": responded & (ltr >= 7) & (ltr <= 8),
+        "detractors": responded & (ltr < 7),
+    }
+
+
+def responder_scores(df, responded):
+    """The score columns with non-responders' values masked out."""
+    return df[SURVEY_SCORES].where(responded, axis=0)
+
+
+def survey_stats(df):
+    """Per-row additive statistics, named as in `DailyRollup.stats`."""
+    flags = survey_flags(df)
+    scores = responder_scores(df, flags["responders"])
+    stats = {"rows": np.ones(len(df))}
+    for col in SURVEY_SCORES:
+        values = scores[col].to_numpy(dtype=np.float64)
+        stats[f"{col}_sum"] = np.nan_to_num(values)
+        stats[f"{col}_count"] = ~np.isnan(values)
+    stats.update({name: flag.to_numpy() for name, flag in flags.items()})
+    return pd.DataFrame(stats, index=df.index).astype(np.float64)
+
+
+def survey_sums(df, by=None):
+    """`survey_stats` summed over all rows (a Series) or per value of the `by` column(s)."""
+    stats = survey_stats(df)
+    if by is None:
+        return stats.sum()
+    keys = [by] if isinstance(by, str) else list(by)
+    return stats.groupby([df[col] for col in keys], observed=True).sum()
+
+
+def _ratio(num, den, scale):
+    return (num / den.where(den > 0) * scale).fillna(0.0)
+
+
+def survey_metrics(sums):
+    """KPIs, in percent, from a Series (one group) or frame (one group per row) of sums.
+
+    NPS and CSAT/CES are 0 for groups without responders; the mean of a
+    score is NaN where no responder gave it.
+    """
+    frame = sums.to_frame().T if isinstance(sums, pd.Series) else sums
+    responders = frame["responders"]
+    metrics = pd.DataFrame({
+        "responders": responders,
+        "nps": _ratio(frame["promoters"] - frame["detractors"], responders, 100),
+        "csat": _ratio(frame["overall_rating_sum"], responders, 100 / MAX_SCORE["overall_rating"]),
+        "positive_csat": _ratio(frame["satisfied"], responders, 100),
+        "ces_ease_of_use": _ratio(frame["ease_of_use_sum"], responders, 100 / MAX_SCORE["ease_of_use"]),
+        "ces_likelihood_to_recommend": _ratio(frame["likelihood_to_recommend_sum"], responders,
+                                              100 / MAX_SCORE["likelihood_to_recommend"]),
+    }, index=frame.index)
+    for col in SURVEY_SCORES:
+        metrics[f"{col}_mean"] = frame[f"{col}_sum"] / frame[f"{col}_count"].where(frame[f"{col}_count"] > 0)
+    return metrics.iloc[0] if isinstance(sums, pd.Series) else metrics
+
+
+def nps_categories(sums):
+    """Responders per NPS category (largest first, empty categories dropped), from one group's sums."""
+    unknown = sums["responders"] - sums["promoters"] - sums["passives"] - sums["detractors"]
+    counts = pd.Series([sums["promoters"], sums["passives"], sums["detractors"], unknown],
+                       index=pd.Index(NPS_CATEGORIES, name="nps_category"), name="count").astype(np.int64)
+    return counts[counts > 0].sort_values(ascending=False, kind="stable").reset_index()
+
+
+def _row_level(df):
+    """The dashboard's former per-rerun formulas, for checking."""
+    responded = df[df["overall_rating"].notnull()]
+    n = len(responded)
+    ltr = responded["likelihood_to_recommend"]
+    nps = ((ltr >= 9).sum() - (ltr < 7).sum()) / n * 100 if n > 0 else 0
+    return pd.Series({
+        "nps": nps,
+        "csat": responded["overall_rating"].sum() / (n * 5) * 100 if n > 0 else 0,
+        "positive_csat": (responded["overall_rating"] >= 4).mean() * 100 if n > 0 else 0,
+        "ces_ease_of_use": responded["ease_of_use"].sum() / (n * 5) * 100 if n > 0 else 0,
+        "ces_likelihood_to_recommend": ltr.sum() / (n * 10) * 100 if n > 0 else 0,
+    })
+
+
+def _load_survey(scale=1):
+    from shared.datasets import load_dataset
+
+    df = load_dataset(SURVEY_DATASET)
+    if scale > 1:
+        df = pd.concat([df] * scale, ignore_index=True)
+    return df
+
+
+def check():
+    df = _load_survey()
+    kpis = list(_row_level(df).index)
+    mismatches = 0
+    groupings = [None, "date_of_survey", "ticket_system", ["date_of_survey", "ticket_system"]]
+    for by in groupings:
+        metrics = survey_metrics(survey_sums(df, by))
+        if by is None:
+            expected = _row_level(df).to_frame().T
+            metrics = metrics.to_frame().T
+        else:
+            expected = df.groupby(by).apply(_row_level)
+        bad = int((~np.isclose(metrics[kpis].to_numpy(dtype=float), expected[kpis].to_numpy(dtype=float))).any(axis=1).sum())
+        print(f"{SURVEY_DATASET}: by {by or 'all rows'}, {len(expected)} groups, {bad} mismatches")
+        mismatches += bad
+    return mismatches == 0
+
+
+def bench(scales=(1, 10, 100), repeat=5):
+    print(f"{'rows':>9} {'groupby.apply':>14} {'vectorized':>11}")
+    for scale in scales:
+        df = _load_survey(scale)
+
+        def per_date_apply():
+            df.groupby("date_of_survey").apply(_row_level)
+
+        def per_date_sums():
+            survey_metrics(survey_sums(df, "date_of_survey"))
+
+        print(f"{len(df):>9,} {best_ms(per_date_apply, repeat):>11.1f} ms {best_ms(per_date_sums, repeat):>8.2f} ms")
+
+
+def main():
+    run_commands(__doc__, {
+        "check": (check, "Compare KPIs with the row-level formulas.", {}),
+        "bench": (bench, "Per-date KPIs: groupby.apply vs vectorized sums.", {"--repeat": ("repeat", 5)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
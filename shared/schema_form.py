@@ -0,0 +1,20 @@
+"""Streamlit inputs for the raw fields of a feature schema.
+
+The prediction forms take each widget's range, default, step and choices
+from the model's schema (written by `python -m shared.build_feature_schemas`),
+so the form and the vocabularies the model was compiled with cannot drift
+apart. Labels and help texts stay on the pages.
+"""
+
+
+def field_input(container, schema, name, label, help=None, key=None):
+    """Render the input for field `name` in `container` (a column or `st`) and return its value.
+
+    Fields with `choices` become a selectbox, numeric fields a slider over `min`..`max`.
+    """
+    field = schema.field(name)
+    choices = field.get("choices")
+    if choices is not None:
+        index = choices.index(field["default"]) if field.get("default") in choices else 0
+        return container.selectbox(label, choices, index=index, help=help, key=key)
+    return container.slider(label, field["min"], field["max"], field["default"], field.get("step"), help=help, key=key)
@@ -0,0 +1,225 @@
+"""Local HTTP scoring service for the churn and delivery models.
+
+    python -m shared.scoring_server --port 8600 --window-ms 5 --max-batch 256
+
+Endpoints (JSON):
+    GET  /models                 models served, with their registry info and input fields
+    GET  /stats                  queue depth and batch-size histogram per model
+    POST /predict/<model>        {"inputs": {...}} or {"instances": [{...}, ...]}
+
+Inputs are the raw form fields of the Streamlit pages and are encoded with the
+same compiled feature schemas, so predictions match the UI. Concurrent
+single-row requests are coalesced into micro-batches: the first request
+opens a window of `--window-ms`, everything that arrives within it (up to
+`--max-batch` rows) is scored with one predict/predict_proba call. XGBoost
+models are served from their compiled tree ensembles (or native boosters) and
+the SVM from its exported kernel path when those have been generated.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from shared.feature_schema import schema_for_model
+from shared.model_registry import registry
+from shared.svm_fast import prefer_fast_svm
+from shared.tree_compiler import prefer_compiled
+
+# name -> (model path, class labels or None for regression)
+MODELS = {
+    "zomato_delivery_time": ("Zomato_Delivery_Time/models/xgb_reg_model.pkl", None),
+    "zomato_delivery_speed": ("Zomato_Delivery_Time/models/xgb_class_model.pkl", ["Fast Delivery", "Slow Delivery"]),
+    "bank_card_churn_xgb": ("Bank_Card/models/xgb_model.pkl", ["Existing (Not Churn)", "Attrited (Churn)"]),
+    "bank_card_churn_svm": ("Bank_Card/models/svm_model.pkl", ["Existing (Not Churn)", "Attrited (Churn)"]),
+    "project_churn_xgb": ("Project_/models/xgboost_model.pkl", ["Not Churn", "Churn"]),
+}
+
+
+def serving_path(model_path):
+    """Fastest exported artifact for a model: compiled trees / native booster, fast SVM, else the pickle."""
+    return prefer_fast_svm(prefer_compiled(model_path))
+
+
+class MicroBatcher:
+    """Coalesce concurrent scoring requests for one model into batched calls."""
+
+    def __init__(self, name, model_path, labels, window_ms=5.0, max_batch=256):
+        self.name = name
+        self.model_path = serving_path(model_path)
+        self.labels = labels
+        self.schema = schema_for_model(model_path)
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        self.histogram = {}
+        self.requests = 0
+        self.batches = 0
+        self._stats_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._worker.start()
+
+    def submit(self, rows):
+        """Queue encoded rows (float32, shape (n, n_features)) and return a Future of their results."""
+        future = Future()
+        self.queue.put((rows, future))
+        return future
+
+    def _collect(self):
+        items = [self.queue.get()]
+        size = len(items[0][0])
+        deadline = time.perf_counter() + self.window
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items, size
+
+    def _score(self, features):
+        model = registry.get(self.model_path)
+        if self.labels is None:
+            return [{"prediction": float(value)} for value in model.predict(features)]
+        preds = model.predict(features)
+        probs = model.predict_proba(features)
+        return [{"prediction": int(pred), "label": self.labels[int(pred)], "probabilities": [float(p) for p in prob]}
+                for pred, prob in zip(preds, probs)]
+
+    def _run(self):
+        while True:
+            items, size = self._collect()
+            with self._stats_lock:
+                bucket = 1 << (size - 1).bit_length()
+                self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+                self.requests += len(items)
+                self.batches += 1
+            try:
+                results = self._score(np.vstack([rows for rows, _ in items]))
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            start = 0
+            for rows, future in items:
+                future.set_result(results[start:start + len(rows)])
+                start += len(rows)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "requests": self.requests,
+                "batches": self.batches,
+                "mean_batch_requests": self.requests / self.batches if self.batches else 0.0,
+                "batch_size_histogram": {f"<={bucket}": count for bucket, count in sorted(self.histogram.items())},
+            }
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    server_version = "DataScienceScoring/1.0"
+    batchers = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/models":
+            payload = {}
+            for name, batcher in self.batchers.items():
+                info = registry.info(batcher.model_path)
+                payload[name] = {
+                    "path": info.path,
+                    "sha256": info.sha256,
+                    "load_seconds": info.load_seconds,
+                    "memory_bytes": info.memory_bytes,
+                    "task": "regression" if batcher.labels is None else "classification",
+                    "fields": batcher.schema.fields,
+                }
+            self._send(HTTPStatus.OK, payload)
+        elif self.path == "/stats":
+            self._send(HTTPStatus.OK, {name: batcher.stats() for name, batcher in self.batchers.items()})
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        prefix = "/predict/"
+        if not self.path.startswith(prefix):
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+        batcher = self.batchers.get(self.path[len(prefix):])
+        if batcher is None:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown model, expected one of {sorted(self.batchers)}"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            single = "inputs" in body
+            instances = [body["inputs"]] if single else body["instances"]
+            rows = np.vstack([batcher.schema.encode(instance) for instance in instances])
+        except KeyError as e:
+            # Only a field that is absent; a value outside the schema's vocabulary is a ValueError below
+            self._send(HTTPStatus.BAD_REQUEST, {"error": f"Missing field {e}"})
+            return
+        except (ValueError, TypeError) as e:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": f"Invalid request: {e}"})
+            return
+        try:
+            results = batcher.submit(rows).result()
+        except Exception as e:
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Prediction failed: {e}"})
+            return
+        self._send(HTTPStatus.OK, results[0] if single else {"predictions": results})
+
+
+class ScoringServer(ThreadingHTTPServer):
+    # Many internal callers connect at once; the default listen backlog of 5 resets them
+    request_queue_size = 128
+
+
+def make_server(host="127.0.0.1", port=8600, window_ms=5.0, max_batch=256, models=None):
+    names = sorted(MODELS) if models is None else models
+    registry.preload([serving_path(MODELS[name][0]) for name in names])
+    handler = type("Handler", (ScoringHandler,), {
+        "batchers": {name: MicroBatcher(name, *MODELS[name], window_ms=window_ms, max_batch=max_batch) for name in names}
+    })
+    return ScoringServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--window-ms", type=float, default=5.0, help="Micro-batching window in milliseconds.")
+    parser.add_argument("--max-batch", type=int, default=256, help="Maximum rows per batched predict call.")
+    parser.add_argument("--models", nargs="*", choices=sorted(MODELS), help="Serve only these models.")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.window_ms, args.max_batch, args.models)
+    print(f"Serving {', '.join(server.RequestHandlerClass.batchers)} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""VADER sentiment for the review pages: parallel batch scoring and a persisted score store.
+
+    python -m shared.sentiment build   # score every review of the dataset and write its score store
+    python -m shared.sentiment check   # stored scores vs scoring every review from scratch
+    python -m shared.sentiment check --reference vader_lexicon.zip   # labels with another copy of the lexicon
+    python -m shared.sentiment score reviews.csv --column overall_text --out scored.csv
+    python -m shared.sentiment bench   # reviews per second at 1, 2, 4, ... worker processes
+    python -m shared.sentiment coldstart   # import + first score in a fresh process, bundled vs downloaded lexicon
+
+The VADER lexicon ships in `shared/nltk_data` (NLTK's data layout, MIT
+licensed, see VADER_LICENSE.txt), so no process ever downloads it. NLTK and
+the lexicon are loaded on the first score, not at import, and the analyzer
+is shared by every session of the process.
+
+`score_batch` takes any iterable of reviews. It scores each distinct text
+once, in chunks on a process pool (VADER is pure Python, so threads would
+not help), and returns the results in input order with a throughput report.
+`score` does the same for a CSV/Parquet column or a text file with one
+review per line.
+
+The store (`<dataset>.sentiment.arrow`, next to the CSV) has one row per
+distinct review text. Each row holds the text's content hash, the cleaned
+text, the VADER compound score and the label. `scored_reviews` joins a
+frame to the store on the hash of its text column and runs VADER only for
+texts that are new or changed, in the calling process: process pools are
+only started by the `build`, `score` and `bench` commands, never from a
+Streamlit server. It then rewrites the store with just the texts still in
+the dataset. Without pyarrow the store is skipped and every review is
+scored.
+"""
+import copy
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from shared.batch_scoring import iter_chunks
+from shared.cli import run_commands
+from shared.paths import REPO_ROOT, relative, resolve
+
+REVIEWS_DATASET = "Project_/dataset/ticket_system_review_processed.csv"
+SCORE_COLUMNS = ["clean_text", "vader_compound", "predicted_sentiment"]
+
+# Worker processes for batch scoring (0 = one per core) and distinct texts per task
+DEFAULT_WORKERS = int(os.environ.get("SENTIMENT_WORKERS", "0")) or os.cpu_count() or 1
+CHUNK_SIZE = 500
+
+# Lexicon VADER dikirim bersama proyek (tanpa download)
+NLTK_DATA = REPO_ROOT / "shared" / "nltk_data"
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def vader_analyzer():
+    """The process-wide `SentimentIntensityAnalyzer`, built on first use from the bundled lexicon."""
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                import nltk
+                from nltk.sentiment import SentimentIntensityAnalyzer
+
+                if str(NLTK_DATA) not in nltk.data.path:
+                    nltk.data.path.insert(0, str(NLTK_DATA))
+                _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def lexicon_text(path):
+    """Text of a VADER lexicon file, plain or zipped in NLTK's layout, one `word\tvalence...` line per entry."""
+    path = Path(path)
+    if path.suffix.lower() == ".zip":
+        with zipfile.ZipFile(path) as archive:
+            name = next(n for n in archive.namelist() if n.endswith("vader_lexicon.txt"))
+            data = archive.read(name)
+    else:
+        data = path.read_bytes()
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:  # vaderSentiment's first releases are Latin-1
+        text = data.decode("latin-1")
+    return "\n".join(line for line in text.splitlines() if line.strip())
+
+
+def reference_analyzer(path):
+    """A copy of `vader_analyzer()` that scores with the lexicon at `path` instead of the bundled one."""
+    analyzer = copy.copy(vader_analyzer())
+    analyzer.lexicon_file = lexicon_text(path)
+    analyzer.lexicon = analyzer.make_lex_dict()
+    return analyzer
+
+
+# Fungsi membersihkan teks
+def cleansing_text(text):
+    text = re.sub(r"\s+", " ", text).strip()
+    text = re.sub(r"http\S+|www\S+", "http", text)
+    text = re.sub(r"@\S+", "@user", text)
+    return text
+
+
+def vader_compound(text):
+    return vader_analyzer().polarity_scores(text)["compound"]
+
+
+def sentiment_label(compound):
+    return "Positive" if compound >= 0.05 else "Negative" if compound <= -0.05 else "Neutral"
+
+
+# Fungsi prediksi sentimen menggunakan VADER
+def predict_vader(text):
+    return sentiment_label(vader_compound(text))
+
+
+def text_hashes(texts):
+    """64-bit content hash of each text (pandas' fixed hash key, so stable across processes)."""
+    return pd.util.hash_pandas_object(pd.Series(texts, dtype=object), index=False).to_numpy()
+
+
+def _score_chunk(texts):
+    """Worker task: cleaned text and compound score of each raw text."""
+    clean = [cleansing_text(text) for text in texts]
+    return clean, [vader_compound(text) for text in clean]
+
+
+@dataclass(frozen=True)
+class BatchReport:
+    reviews: int
+    distinct: int
+    workers: int
+    seconds: float
+
+    @property
+    def reviews_per_second(self):
+        return self.reviews / self.seconds if self.seconds > 0 else float("inf")
+
+    def describe(self):
+        return (f"{self.reviews:,} reviews ({self.distinct:,} distinct) in {self.seconds:.2f} s "
+                f"on {self.workers} worker(s): {self.reviews_per_second:,.0f} reviews/s")
+
+
+def score_batch(texts, workers=None, chunk_size=CHUNK_SIZE):
+    """(`SCORE_COLUMNS` frame in input order, `BatchReport`) for an iterable of raw review texts.
+
+    Identical texts are scored once. With one worker, or a single chunk of
+    distinct texts, everything runs in this process.
+    """
+    start = time.perf_counter()
+    texts = pd.Series(list(texts), dtype=object).fillna("").astype(str)
+    codes, distinct = pd.factorize(texts)
+    chunks = [distinct[i:i + chunk_size].tolist() for i in range(0, len(distinct), chunk_size)]
+    workers = min(workers or DEFAULT_WORKERS, max(len(chunks), 1))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_score_chunk, chunks))
+    else:
+        results = [_score_chunk(chunk) for chunk in chunks]
+    clean = [text for chunk_clean, _ in results for text in chunk_clean]
+    compound = np.fromiter((score for _, chunk_scores in results for score in chunk_scores),
+                           dtype=np.float64, count=len(distinct))
+    scores = pd.DataFrame({"clean_text": pd.Series(clean, dtype=object), "vader_compound": compound})
+    scores["predicted_sentiment"] = scores["vader_compound"].map(sentiment_label)
+    scores = scores.take(codes).reset_index(drop=True)
+    return scores, BatchReport(len(texts), len(distinct), workers, time.perf_counter() - start)
+
+
+def score_texts(texts, workers=None):
+    """`SCORE_COLUMNS` for each raw text, keeping the index of `texts`."""
+    scores, _ = score_batch(texts, workers)
+    return scores.set_axis(texts.index)
+
+
+def store_path_for(csv_path):
+    return Path(csv_path).with_suffix(".sentiment.arrow")
+
+
+def _empty_store():
+    return pd.DataFrame({"clean_text": pd.Series(dtype=object), "vader_compound": pd.Series(dtype=np.float64),
+                         "predicted_sentiment": pd.Series(dtype=object)},
+                        index=pd.Index([], dtype=np.uint64, name="text_hash"))
+
+
+def load_store(csv_path):
+    """The score store of `csv_path`, indexed by text hash (empty when missing or unreadable)."""
+    path = resolve(store_path_for(csv_path))
+    try:
+        return pd.read_feather(path).set_index("text_hash")
+    except (ImportError, OSError, ValueError, KeyError):
+        return _empty_store()
+
+
+def save_store(csv_path, store):
+    """Write the store atomically; returns False when it cannot be written (no pyarrow, read-only tree)."""
+    path = resolve(store_path_for(csv_path))
+    tmp = None
+    try:
+        # A temporary file of its own per writer, so concurrent sessions never share one
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, suffix=".tmp", delete=False) as f:
+            tmp = f.name
+            store.reset_index().to_feather(f)
+        os.replace(tmp, path)
+    except (ImportError, OSError):
+        if tmp is not None and os.path.exists(tmp):
+            os.unlink(tmp)
+        return False
+    return True
+
+
+def scored_reviews(df, csv_path, column="overall_text"):
+    """`df` with `SCORE_COLUMNS` added, taken from the store and scoring only unseen texts."""
+    hashes = text_hashes(df[column])
+    distinct = pd.unique(hashes)
+    store = load_store(csv_path)
+    missing = distinct[~np.isin(distinct, store.index.to_numpy())]
+    if len(missing):
+        texts = pd.Series(df[column].to_numpy(), index=hashes)
+        texts = texts[~texts.index.duplicated()].loc[missing]
+        # In this process: pages call this from the server's threads, where forking a pool is unsafe
+        store = pd.concat([store, score_texts(texts, workers=1).rename_axis("text_hash")])
+    current = store.loc[distinct]
+    if len(missing) or len(current) != len(store):
+        save_store(csv_path, current)
+    scores = current.reindex(hashes)
+    return df.assign(**{col: scores[col].to_numpy() for col in SCORE_COLUMNS})
+
+
+def load_reviews():
+    from shared.datasets import load_dataset
+
+    texts = load_dataset(REVIEWS_DATASET, columns=["overall_text"])["overall_text"].fillna("").astype(str)
+    return texts[texts.str.strip() != ""].to_frame()
+
+
+def build(workers=None):
+    df = load_reviews()
+    path = resolve(store_path_for(REVIEWS_DATASET))
+    start = time.perf_counter()
+    hashes = text_hashes(df["overall_text"])
+    first = ~pd.Index(hashes).duplicated()
+    texts = pd.Series(df["overall_text"].to_numpy()[first], index=pd.Index(hashes[first], name="text_hash"))
+    save_store(REVIEWS_DATASET, score_texts(texts, workers))
+    print(f"{relative(path)}: {len(load_store(REVIEWS_DATASET))} distinct reviews of {len(df)}, "
+          f"scored in {time.perf_counter() - start:.1f} s")
+
+
+def compare_lexicon(texts, reference):
+    """Print how the labels of `texts` change when scored with the lexicon at `reference`; True if none do."""
+    bundled = vader_analyzer()
+    other = reference_analyzer(reference)
+    clean = [cleansing_text(text) for text in pd.unique(pd.Series(texts, dtype=object))]
+    ours = np.array([bundled.polarity_scores(text)["compound"] for text in clean])
+    theirs = np.array([other.polarity_scores(text)["compound"] for text in clean])
+    changed = sum(sentiment_label(a) != sentiment_label(b) for a, b in zip(ours, theirs))
+    words = set(bundled.lexicon) ^ set(other.lexicon)
+    valences = sum(bundled.lexicon[w] != other.lexicon[w] for w in set(bundled.lexicon) & set(other.lexicon))
+    print(f"{reference}: {len(other.lexicon)} entries vs {len(bundled.lexicon)} bundled "
+          f"({len(words)} words in only one, {valences} valences differ); "
+          f"{len(clean)} distinct reviews: {changed} labels change, "
+          f"{int((ours != theirs).sum())} compounds differ (max {np.abs(ours - theirs).max(initial=0):.4f})")
+    return changed == 0
+
+
+def check(changed=25, seed=0, reference=None):
+    df = load_reviews()
+    expected = score_texts(df["overall_text"])
+    stored = scored_reviews(df, REVIEWS_DATASET)
+    ok = stored[SCORE_COLUMNS].equals(expected[SCORE_COLUMNS])
+    print(f"{REVIEWS_DATASET}: {len(df)} reviews, stored scores match: {ok}")
+
+    # Edited reviews are the only ones scored again
+    rng = np.random.default_rng(seed)
+    edited = df.copy()
+    rows = rng.choice(len(df), size=min(changed, len(df)), replace=False)
+    edited.iloc[rows, 0] = edited["overall_text"].iloc[rows].to_numpy() + " Terrible support."
+    store = load_store(REVIEWS_DATASET)
+    new = ~np.isin(pd.unique(text_hashes(edited["overall_text"])), store.index.to_numpy())
+    result = scored_reviews(edited, REVIEWS_DATASET)
+    same = result[SCORE_COLUMNS].equals(score_texts(edited["overall_text"])[SCORE_COLUMNS])
+    print(f"{changed} edited reviews: {int(new.sum())} texts rescored, scores match: {same}")
+    scored_reviews(df, REVIEWS_DATASET)
+    if reference is not None:
+        return compare_lexicon(df["overall_text"], reference) and ok and same
+    return ok and same
+
+
+def read_reviews(path, column="overall_text"):
+    """Review texts of a CSV/Parquet `column`, or the lines of any other file."""
+    if Path(path).suffix.lower() in (".csv", ".parquet"):
+        for chunk in iter_chunks(path, str(path), 50_000):
+            yield from chunk[column].tolist()
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from (line.rstrip("\n") for line in f)
+
+
+def score(path, column="overall_text", out=None, workers=None):
+    texts = list(read_reviews(path, column))
+    scores, report = score_batch(texts, workers)
+    if out is not None:
+        scores.insert(0, column, pd.Series(texts, dtype=object))
+        scores.to_csv(out, index=False)
+    print(report.describe())
+
+
+def bench(scale=10, workers=None):
+    reviews = load_reviews()["overall_text"].tolist()
+    # Distinct copies, so deduplication does not hide the scoring cost
+    texts = [f"{text} #{i}" for i in range(scale) for text in reviews]
+    counts = sorted({1, *[2 ** k for k in range(1, 8) if 2 ** k < (workers or DEFAULT_WORKERS)],
+                     workers or DEFAULT_WORKERS})
+    base = None
+    for count in counts:
+        _, report = score_batch(texts, count)
+        base = base or report.reviews_per_second
+        print(f"{report.describe()} · speed-up {report.reviews_per_second / base:.1f}x")
+
+
+# Cold start before (download + eager analyzer at import) and after (bundled, lazy)
+COLD_STARTS = {
+    "download at import (before)": "import nltk; nltk.download('vader_lexicon', quiet=True); "
+                                   "from nltk.sentiment import SentimentIntensityAnalyzer; "
+                                   "SentimentIntensityAnalyzer().polarity_scores('ok')",
+    "import shared.sentiment (after)": "import shared.sentiment",
+    "import + first score (after)": "import shared.sentiment as s; s.predict_vader('ok')",
+}
+
+
+def coldstart(repeat=3):
+    for name, code in COLD_STARTS.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True)
+            best = min(best, time.perf_counter() - start)
+        # First line naming an error: the root cause, above NLTK's LookupError banner
+        lines = result.stderr.decode().strip().splitlines()
+        error = next((line.strip() for line in lines if "Error" in line), f"exit code {result.returncode}")
+        status = "" if result.returncode == 0 else f" (failed: {error})"
+        print(f"{name:<34} {best * 1000:>7.0f} ms{status}")
+
+
+def main():
+    workers = ("workers", None, {"type": int})
+    run_commands(__doc__, {
+        "build": (build, "Score every review and write the store.", {"--workers": workers}),
+        "check": (check, "Compare stored scores with scoring from scratch.", {
+            "--reference": ("reference", None, {"type": os.path.abspath, "help": "lexicon .txt or NLTK .zip"}),
+        }),
+        # Paths are made absolute before the commands run from the repository root
+        "score": (score, "Score the reviews of a file in parallel.", {
+            "path": ("path", None, {"type": os.path.abspath}),
+            "--column": ("column", "overall_text"),
+            "--out": ("out", None, {"type": os.path.abspath}),
+            "--workers": workers,
+        }),
+        "bench": (bench, "Reviews per second by worker count.", {"--scale": ("scale", 10), "--workers": workers}),
+        "coldstart": (coldstart, "Fresh-process import and first-score time.", {"--repeat": ("repeat", 3)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""Streaming ingestion of the ticket-system survey export for the satisfaction dashboard.
+
+    SURVEY_STREAM=exports/surveys.csv streamlit run Project_/main.py
+    python -m shared.survey_stream check   # incremental ingest vs a full rebuild (CSV, JSONL, directory drop)
+    python -m shared.survey_stream bench   # refresh cost as the export grows: full reload vs poll + frame
+
+`SURVEY_STREAM` names an append-only CSV or JSONL file, or a directory that
+new .csv/.jsonl files are dropped into. `SurveyStream.poll` stats the source
+and reads only the bytes past each file's last offset. It parses complete
+records only (a partial last line waits for the next poll). The new rows'
+`shared.satisfaction` statistics are added to the per-day `DailyRollup`, so
+the NPS/CSAT/CES tiles and the time series cost work proportional to the new
+rows. The row table is only updated when a page asks for it: the batches
+since the last request are merged into the date order and the `TimeIndex`
+(`merge_sorted`), which appends when they hold later dates than any row so
+far. A file that shrinks or is replaced is ingested again from the start.
+One stream per source is shared by all sessions.
+"""
+import copy
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from shared.cli import run_commands
+from shared.paths import relative, resolve
+from shared.satisfaction import SURVEY_DATASET, SURVEY_SCORES
+from shared.time_index import TimeIndex, merge_sorted, sort_by_time, survey_rollup, update_survey_rollup
+
+STREAM_SOURCE = os.environ.get("SURVEY_STREAM")
+POLL_SECONDS = float(os.environ.get("SURVEY_STREAM_POLL_SECONDS", "5"))
+DATE_COLUMN = "date_of_survey"
+SUFFIXES = (".csv", ".jsonl")
+
+
+class _Restart(Exception):
+    """A tailed file shrank or was replaced; everything is ingested again."""
+
+
+def _complete(data, quoted):
+    """Length of the complete records at the start of `data` (CSV quotes may span lines)."""
+    end = data.rfind(b"\n")
+    while end >= 0 and quoted and data.count(b'"', 0, end) % 2:
+        end = data.rfind(b"\n", 0, end)
+    return end + 1
+
+
+def _normalize(df):
+    df[DATE_COLUMN] = pd.to_datetime(df[DATE_COLUMN])
+    for col in SURVEY_SCORES:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype(np.float64)
+    return df
+
+
+class FileTail:
+    """Byte offset into one append-only CSV or JSONL file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.csv = self.path.suffix == ".csv"
+        self.offset = 0
+        self.inode = None
+        self.header = None
+
+    def read(self):
+        """Rows appended since the last read (None when there are none)."""
+        stat = os.stat(self.path)
+        if self.inode is not None and (stat.st_ino != self.inode or stat.st_size < self.offset):
+            raise _Restart(self.path)
+        self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        end = _complete(data, self.csv)
+        if end == 0:
+            return None
+        self.offset += end
+        data = data[:end]
+        if self.csv:
+            if self.header is None:
+                split = data.find(b"\n") + 1
+                self.header, data = data[:split], data[split:]
+            if not data.strip():
+                return None
+            df = pd.read_csv(io.BytesIO(self.header + data))
+        else:
+            lines = [line for line in data.splitlines() if line.strip()]
+            if not lines:
+                return None
+            df = pd.read_json(io.BytesIO(b"\n".join(lines)), lines=True, dtype=False, convert_dates=False)
+        return _normalize(df)
+
+
+class SurveyStream:
+    """Survey rows tailed from `source`, with `prepare(df)` applied to each new batch."""
+
+    def __init__(self, source, prepare=None):
+        self.source = resolve(source)
+        self.prepare = prepare
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._tails = {}
+        self._pending = []
+        self._rollup = None
+        self._frame = None
+        self._index = None
+        self.rows = 0
+        self.version = 0
+        self.last_batch_seconds = 0.0
+
+    def _files(self):
+        if self.source.is_dir():
+            return sorted(path for path in self.source.iterdir() if path.suffix in SUFFIXES)
+        return [self.source] if self.source.exists() else []
+
+    def _read_new(self):
+        batches = []
+        for path in self._files():
+            tail = self._tails.get(path)
+            if tail is None:
+                tail = self._tails[path] = FileTail(path)
+            df = tail.read()
+            if df is not None and len(df):
+                batches.append(df)
+        return batches
+
+    def poll(self):
+        """Ingest the rows appended since the last poll and return the stream version."""
+        with self.lock:
+            start = time.perf_counter()
+            try:
+                batches = self._read_new()
+            except _Restart:
+                version = self.version
+                self._reset()
+                self.version = version + 1
+                batches = self._read_new()
+            if batches:
+                df = pd.concat(batches, ignore_index=True)
+                if self.prepare is not None:
+                    df = self.prepare(df)
+                # Copy-on-write: sessions holding the previous rollup keep a consistent view
+                rollup = survey_rollup(df) if self._rollup is None else copy.copy(self._rollup)
+                if self._rollup is not None:
+                    update_survey_rollup(rollup, df)
+                self._rollup = rollup
+                self._pending.append(df)
+                self.rows += len(df)
+                self.version += 1
+                self.last_batch_seconds = time.perf_counter() - start
+            return self.version
+
+    def rollup(self):
+        """The per-day `survey_rollup` of every ingested row (None before the first row)."""
+        with self.lock:
+            return self._rollup
+
+    def frame(self):
+        """(date-sorted frame of every ingested row, its `TimeIndex`), extended by the new batches."""
+        with self.lock:
+            for df in self._pending:
+                if self._frame is None:
+                    self._frame = sort_by_time(df, DATE_COLUMN).reset_index(drop=True)
+                    self._index = TimeIndex(self._frame, DATE_COLUMN)
+                else:
+                    self._frame, self._index = merge_sorted(self._frame, self._index, df)
+            self._pending = []
+            return self._frame.copy(deep=False), self._index
+
+    def describe(self):
+        return (f"Survey stream `{relative(self.source)}`: {self.rows} rows · version {self.version} · "
+                f"last batch {self.last_batch_seconds * 1000:.0f} ms")
+
+
+_streams = {}
+_streams_lock = threading.Lock()
+
+
+def survey_stream(source, prepare=None):
+    """The process-wide `SurveyStream` for (`source`, `prepare`)."""
+    key = (relative(source), None if prepare is None else f"{prepare.__module__}.{prepare.__qualname__}")
+    with _streams_lock:
+        stream = _streams.get(key)
+        if stream is None:
+            stream = _streams[key] = SurveyStream(source, prepare)
+        return stream
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def live_updates(stream, version):
+    """Poll `stream` every POLL_SECONDS and rerun the page when rows arrived after `version`.
+
+    Fragments only draw into their own container: call it inside `with st.sidebar:`.
+    """
+    if stream.poll() != version:
+        st.rerun(scope="app")
+    st.caption(f"🟢 Live · {stream.rows:,} surveys · checks every {POLL_SECONDS:g} s")
+
+
+def _write_in_pieces(data, path, rng, pieces):
+    """Append `data` to `path` in `pieces` chunks cut at random bytes (mid-line too)."""
+    cuts = np.sort(rng.choice(np.arange(1, len(data)), size=pieces - 1, replace=False))
+    for chunk in np.split(np.frombuffer(data, dtype=np.uint8), cuts):
+        with open(path, "ab") as f:
+            f.write(chunk.tobytes())
+        yield
+
+
+def _same_rollup(left, right):
+    first, last = right.days[0], right.days[-1]
+    return (list(left.days) == list(right.days)
+            and all(np.allclose(left.daily(first, last, group), right.daily(first, last, group).to_numpy())
+                    for group in [None, *right.groups]))
+
+
+def check(pieces=40, seed=0):
+    from shared.datasets import read_csv
+
+    expected_df = read_csv(SURVEY_DATASET)
+    expected = survey_rollup(expected_df)
+    rng = np.random.default_rng(seed)
+    csv_bytes = resolve(SURVEY_DATASET).read_bytes()
+    jsonl_bytes = expected_df.to_json(orient="records", lines=True, date_format="iso").encode()
+    ok = True
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        cases = [("CSV file", workdir / "surveys.csv", csv_bytes),
+                 ("JSONL file", workdir / "surveys.jsonl", jsonl_bytes),
+                 ("directory drop", workdir / "drop" / "batch.jsonl", jsonl_bytes)]
+        for name, path, data in cases:
+            path.parent.mkdir(exist_ok=True)
+            stream = SurveyStream(path.parent if name == "directory drop" else path)
+            for _ in _write_in_pieces(data, path, rng, pieces):
+                stream.poll()
+                stream.frame()
+            frame, index = stream.frame()
+            # The merged frame is in date order and the incrementally extended TimeIndex agrees with it
+            dates = np.sort(pd.to_datetime(expected_df[DATE_COLUMN]).to_numpy(dtype="datetime64[ns]"))
+            sorted_ok = np.array_equal(index.times, TimeIndex(frame, DATE_COLUMN).times) and np.array_equal(
+                frame[DATE_COLUMN].to_numpy(dtype="datetime64[ns]"), dates)
+            same = len(frame) == len(expected_df) and _same_rollup(expected, stream.rollup()) and sorted_ok
+            print(f"{name}: {pieces} appends, {len(frame)} rows ingested, rollup and date order match: {same}")
+            ok &= same
+    finally:
+        shutil.rmtree(workdir)
+    return ok
+
+
+def bench(steps=5, batch=100, scale=200):
+    from shared.datasets import read_csv
+
+    rows = pd.concat([read_csv(SURVEY_DATASET)] * scale, ignore_index=True)
+    in_order = rows.iloc[np.argsort(pd.to_datetime(rows[DATE_COLUMN]).to_numpy(), kind="stable")]
+    # New surveys usually carry later dates (appended); shuffled dates force a merge into the order
+    for case, df in [("dates in order", in_order), ("dates shuffled", rows.sample(frac=1, random_state=0))]:
+        workdir = Path(tempfile.mkdtemp())
+        try:
+            path = workdir / "surveys.csv"
+            head = len(df) - steps * batch
+            df.iloc[:head].to_csv(path, index=False)
+            stream = SurveyStream(path)
+            stream.poll()
+            stream.frame()
+            # Both sides produce what the page reads: the rollup and the sorted rows with their TimeIndex
+            print(f"{case}\n{'rows':>9} {'full reload':>12} {'poll':>9} {'frame':>9}")
+            for step in range(steps):
+                df.iloc[head + step * batch:head + (step + 1) * batch].to_csv(path, mode="a", header=False, index=False)
+                start = time.perf_counter()
+                full = sort_by_time(_normalize(read_csv(path)), DATE_COLUMN).reset_index(drop=True)
+                survey_rollup(full)
+                TimeIndex(full, DATE_COLUMN)
+                full_ms = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                stream.poll()
+                poll_ms = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                stream.frame()
+                frame_ms = (time.perf_counter() - start) * 1000
+                print(f"{stream.rows:>9,} {full_ms:>9.1f} ms {poll_ms:>6.2f} ms {frame_ms:>6.2f} ms")
+        finally:
+            shutil.rmtree(workdir)
+
+
+def main():
+    run_commands(__doc__, {
+        "check": (check, "Compare incremental ingestion with a full rebuild.", {"--pieces": ("pieces", 40)}),
+        "bench": (bench, "Refresh cost: full reload vs poll + frame.", {"--batch": ("batch", 100)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
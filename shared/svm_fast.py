@@ -0,0 +1,283 @@
+"""Low-latency serving path for the RBF-kernel SVM churn model.
+
+    python -m shared.svm_fast export [--components 300]   # write svm_model.svm.npz, and svm_model.nystroem.npz if within tolerance
+    python -m shared.svm_fast check                       # parity, accuracy delta and probability error on df_churn_test_scaled.csv
+    python -m shared.svm_fast bench [--rows 2000]         # per-row latency: sklearn vs exact vs Nystroem
+
+The exact mode keeps the support vectors with their squared norms precomputed
+and evaluates the kernel for a whole batch with one matrix product
+(||x||^2 + ||sv||^2 - 2 x.sv), then applies the model's Platt scaling
+(probA_/probB_). The approximate mode replaces the support vectors by
+Nystroem landmarks, with a linear head fitted on the training split to the
+exact model's decision values, so the kernel is evaluated against a few
+hundred points instead of every support vector. Its probabilities go through
+the same Platt scaling, so `export` only writes it, and `check` only accepts
+it, when they stay within MAX_PROBA_DIFF of the exact model on the test set.
+"""
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from shared.cli import run_commands
+from shared.paths import relative, resolve
+
+SVM_MODEL = "Bank_Card/models/svm_model.pkl"
+TRAIN_SET = "Bank_Card/dataset/df_churn_train_scaled.csv"
+TEST_SET = "Bank_Card/dataset/df_churn_test_scaled.csv"
+TARGET = "Attrition_Flag"
+
+# Largest churn-probability difference from the exact SVM (test set) an approximate model may ship with
+MAX_PROBA_DIFF = 0.05
+
+# libsvm clips pairwise probabilities to [MIN_PROB, 1 - MIN_PROB]
+MIN_PROB = 1e-7
+
+
+def _couple_row(r):
+    """Scalar version of `_pairwise_coupling` for one row (numpy overhead dominates on tiny inputs)."""
+    q = ((1.0 - r) ** 2, r ** 2)
+    q01 = -r * (1.0 - r)
+    p = [0.5, 0.5]
+    qp = [q[0] * 0.5 + q01 * 0.5, q01 * 0.5 + q[1] * 0.5]
+    pqp = p[0] * qp[0] + p[1] * qp[1]
+    for _ in range(100):
+        if max(abs(qp[0] - pqp), abs(qp[1] - pqp)) < 0.0025:
+            break
+        for t in (0, 1):
+            qtt, qto = q[t], q01
+            diff = (pqp - qp[t]) / qtt
+            p[t] += diff
+            scale = 1.0 + diff
+            pqp = (pqp + diff * (diff * qtt + 2.0 * qp[t])) / scale ** 2
+            row = (qtt, qto) if t == 0 else (qto, qtt)
+            qp = [(qp[0] + diff * row[0]) / scale, (qp[1] + diff * row[1]) / scale]
+            p = [p[0] / scale, p[1] / scale]
+    return p
+
+
+def _pairwise_coupling(r):
+    """libsvm's `multiclass_probability` for two classes, vectorized over rows.
+
+    sklearn's bundled libsvm runs the iterative coupling solver even for binary
+    problems, so its probabilities differ slightly from the plain sigmoid.
+    """
+    if len(r) <= 16:
+        return np.array([_couple_row(float(value)) for value in r]).reshape(len(r), 2)
+    k = 2
+    Q = np.empty((len(r), k, k))
+    Q[:, 0, 0] = (1.0 - r) ** 2
+    Q[:, 1, 1] = r ** 2
+    Q[:, 0, 1] = Q[:, 1, 0] = -r * (1.0 - r)
+    p = np.full((len(r), k), 1.0 / k)
+    Qp = np.einsum("nij,nj->ni", Q, p)
+    pQp = np.einsum("ni,ni->n", p, Qp)
+    active = np.ones(len(r), dtype=bool)
+    for _ in range(max(100, k)):
+        active &= np.abs(Qp - pQp[:, None]).max(axis=1) >= 0.005 / k
+        if not active.any():
+            break
+        for t in range(k):
+            diff = np.where(active, (pQp - Qp[:, t]) / Q[:, t, t], 0.0)
+            p[:, t] += diff
+            scale = 1.0 + diff
+            pQp = (pQp + diff * (diff * Q[:, t, t] + 2.0 * Qp[:, t])) / scale ** 2
+            Qp = (Qp + diff[:, None] * Q[:, t, :]) / scale[:, None]
+            p /= scale[:, None]
+    return p
+
+
+class RBFSVM:
+    """Binary RBF SVM with `decision_function` / `predict` / `predict_proba` like `sklearn.svm.SVC`."""
+
+    def __init__(self, support_vectors, dual_coef, intercept, gamma, prob_a, prob_b, classes, meta=None):
+        self.support_vectors = np.ascontiguousarray(support_vectors, dtype=np.float64)
+        self.sv_sq_norms = np.einsum("ij,ij->i", self.support_vectors, self.support_vectors)
+        self.dual_coef = np.asarray(dual_coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.gamma = float(gamma)
+        self.prob_a = float(prob_a)
+        self.prob_b = float(prob_b)
+        self.classes = np.asarray(classes)
+        self.meta = meta or {}
+
+    @property
+    def approximate(self):
+        return self.meta.get("mode") == "nystroem"
+
+    def decision_function(self, features):
+        X = np.asarray(features, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        sq_dist = X @ self.support_vectors.T
+        sq_dist *= -2.0
+        sq_dist += self.sv_sq_norms
+        sq_dist += np.einsum("ij,ij->i", X, X)[:, None]
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        sq_dist *= -self.gamma
+        np.exp(sq_dist, out=sq_dist)
+        return sq_dist @ self.dual_coef + self.intercept
+
+    def predict(self, features):
+        return self.classes[(self.decision_function(features) > 0).astype(np.intp)]
+
+    def predict_proba(self, features):
+        # libsvm's decision value for the first class is the negated sklearn one
+        dec = -self.decision_function(features)
+        r = 1.0 / (1.0 + np.exp(self.prob_a * dec + self.prob_b))
+        return _pairwise_coupling(np.clip(r, MIN_PROB, 1.0 - MIN_PROB))
+
+    def save(self, path):
+        np.savez(path, support_vectors=self.support_vectors, dual_coef=self.dual_coef, classes=self.classes,
+                 params=np.array([self.intercept, self.gamma, self.prob_a, self.prob_b]),
+                 meta=np.array(json.dumps(self.meta)))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            intercept, gamma, prob_a, prob_b = data["params"]
+            return cls(data["support_vectors"], data["dual_coef"], intercept, gamma, prob_a, prob_b,
+                       data["classes"], json.loads(str(data["meta"])))
+
+
+def from_sklearn(svc):
+    if svc.kernel != "rbf" or len(svc.classes_) != 2 or not svc.probability:
+        raise ValueError("Only binary RBF SVCs trained with probability=True are supported")
+    return RBFSVM(svc.support_vectors_, svc.dual_coef_[0], svc.intercept_[0], svc._gamma,
+                  svc.probA_[0], svc.probB_[0], svc.classes_, {"mode": "exact", "n_support": len(svc.support_vectors_)})
+
+
+def fit_nystroem(exact, X_train, n_components=300, alpha=1e-3, random_state=42):
+    """Approximate `exact` with `n_components` Nystroem landmarks and a ridge head on its decision values."""
+    from sklearn.kernel_approximation import Nystroem
+    from sklearn.linear_model import Ridge
+
+    nystroem = Nystroem(gamma=exact.gamma, n_components=n_components, random_state=random_state).fit(X_train)
+    head = Ridge(alpha=alpha).fit(nystroem.transform(X_train), exact.decision_function(X_train))
+    # transform(X) = K(X, landmarks) @ normalization_.T, so the head folds into per-landmark weights
+    weights = nystroem.normalization_.T @ head.coef_
+    return RBFSVM(nystroem.components_, weights, head.intercept_, exact.gamma, exact.prob_a, exact.prob_b,
+                  exact.classes, {"mode": "nystroem", "n_components": n_components})
+
+
+def fast_path_for(model_path, approximate=False):
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.name.split(".")[0] + (".nystroem.npz" if approximate else ".svm.npz"))
+
+
+def prefer_fast_svm(model_path, approximate=False):
+    """The exported fast SVM for `model_path` if it exists, else `model_path` unchanged."""
+    fast = fast_path_for(model_path, approximate)
+    if resolve(fast).exists():
+        return relative(fast)
+    return model_path
+
+
+def _load_split(path):
+    import pandas as pd
+
+    from shared.feature_schema import schema_for_model
+
+    df = pd.read_csv(resolve(path))
+    return df[schema_for_model(SVM_MODEL).columns].to_numpy(dtype=np.float64), df[TARGET].to_numpy()
+
+
+def evaluate(model, exact):
+    X, y = _load_split(TEST_SET)
+    pred, exact_pred = model.predict(X), exact.predict(X)
+    return {
+        "accuracy": float(np.mean(pred == y)),
+        "exact_accuracy": float(np.mean(exact_pred == y)),
+        "agreement": float(np.mean(pred == exact_pred)),
+        "max_proba_diff": float(np.abs(model.predict_proba(X) - exact.predict_proba(X)).max()),
+    }
+
+
+def export(n_components=300):
+    import joblib
+
+    exact = from_sklearn(joblib.load(resolve(SVM_MODEL)))
+    approx = fit_nystroem(exact, _load_split(TRAIN_SET)[0], n_components)
+    approx.meta.update(evaluate(approx, exact))
+    meta = approx.meta
+    print(f"Nystroem accuracy {meta['accuracy']:.2%} vs exact {meta['exact_accuracy']:.2%} "
+          f"({(meta['accuracy'] - meta['exact_accuracy']) * 100:+.2f} pp), label agreement {meta['agreement']:.2%}, "
+          f"max probability diff {meta['max_proba_diff']:.3f}")
+    ok = meta["max_proba_diff"] <= MAX_PROBA_DIFF
+    for model in (exact, approx):
+        out = resolve(fast_path_for(SVM_MODEL, model.approximate))
+        if model.approximate and not ok:
+            # Never leave an older approximation behind for the page to pick up
+            out.unlink(missing_ok=True)
+            print(f"{relative(out)}: not written, probabilities differ by more than {MAX_PROBA_DIFF} "
+                  f"(try more --components)")
+            continue
+        model.save(out)
+        print(f"{relative(out)}: {len(model.support_vectors)} kernel centres, {out.stat().st_size / 1024:.0f} KB")
+    return ok
+
+
+def check(atol=1e-9):
+    import joblib
+
+    svc = joblib.load(resolve(SVM_MODEL))
+    X, y = _load_split(TEST_SET)
+    exact = RBFSVM.load(resolve(fast_path_for(SVM_MODEL)))
+    diff = max(float(np.abs(exact.decision_function(X) - svc.decision_function(X)).max()),
+               float(np.abs(exact.predict_proba(X) - svc.predict_proba(X)).max()))
+    ok = diff <= atol and bool(np.all(exact.predict(X) == svc.predict(X)))
+    print(f"{'OK ' if ok else 'FAIL'} exact vs sklearn on {Path(TEST_SET).name} ({len(X)} rows): max |diff| {diff:.2e}")
+    approx_path = resolve(fast_path_for(SVM_MODEL, approximate=True))
+    if approx_path.exists():
+        meta = evaluate(RBFSVM.load(approx_path), exact)
+        within = meta["max_proba_diff"] <= MAX_PROBA_DIFF
+        ok &= within
+        print(f"{'OK ' if within else 'FAIL'} Nystroem: accuracy {meta['accuracy']:.2%} vs exact {meta['exact_accuracy']:.2%} "
+              f"({(meta['accuracy'] - meta['exact_accuracy']) * 100:+.2f} pp), label agreement {meta['agreement']:.2%}, "
+              f"max probability diff {meta['max_proba_diff']:.3f} (limit {MAX_PROBA_DIFF})")
+    return ok
+
+
+def _per_row_us(fn, rows):
+    start = time.perf_counter()
+    for i in range(len(rows)):
+        fn(rows[i:i + 1])
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def bench(n_rows=2000):
+    import joblib
+
+    from shared.tree_compiler import CompiledEnsemble, compiled_path_for
+
+    rows = _load_split(TEST_SET)[0]
+    rows = np.resize(rows, (n_rows, rows.shape[1]))
+    candidates = [("sklearn SVC", joblib.load(resolve(SVM_MODEL))),
+                  ("exact (BLAS kernel)", RBFSVM.load(resolve(fast_path_for(SVM_MODEL))))]
+    approx_path = resolve(fast_path_for(SVM_MODEL, approximate=True))
+    if approx_path.exists():
+        candidates.append(("Nystroem", RBFSVM.load(approx_path)))
+    xgb_path = resolve(compiled_path_for("Bank_Card/models/xgb_model.pkl"))
+    if xgb_path.exists():
+        candidates.append(("XGBoost (compiled)", CompiledEnsemble.load(xgb_path)))
+    print(f"{'model':<22} {'predict_proba/row':>18} {'batch/row':>10}")
+    for name, model in candidates:
+        single = _per_row_us(model.predict_proba, rows)
+        start = time.perf_counter()
+        model.predict_proba(rows)
+        batch = (time.perf_counter() - start) / n_rows * 1e6
+        print(f"{name:<22} {single:>15.1f} us {batch:>7.1f} us")
+
+
+def main():
+    run_commands(__doc__, {
+        "export": (export, "Write the exact and Nystroem serving files next to the SVM pickle.",
+                   {"--components": ("n_components", 300, {"help": "Number of Nystroem landmarks."})}),
+        "check": (check, "Compare the exported SVMs with the sklearn model on the test set.", {}),
+        "bench": (bench, "Per-row latency of the SVM serving paths.", {"--rows": ("n_rows", 2000)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
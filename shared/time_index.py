@@ -0,0 +1,265 @@
+"""Date-sorted dashboard frames: range slices by binary search and per-day rollups.
+
+    python -m shared.time_index check   # slices and rollups vs boolean masks and groupby (survey dataset)
+    python -m shared.time_index bench   # date filter + per-day views: scan vs index, at 1x/10x/100x rows
+
+Dashboards sort their dataset by its date column once per load
+(`sort_by_time`). A `TimeIndex` then resolves any date range to a contiguous
+row slice with two `searchsorted` calls, and `df.iloc[slice]` returns views
+rather than a filtered copy. A `DailyRollup` keeps per-day counts and sums,
+per group and for all groups, as prefix sums over days. Per-day charts read
+a slice of it and range totals are one subtraction. Date ranges are calendar
+days with both ends included.
+"""
+import numpy as np
+import pandas as pd
+
+from shared.cli import best_ms, run_commands
+from shared.satisfaction import SURVEY_SCORES, responder_scores, survey_flags
+
+SURVEY_DATASET = "Project_/dataset/ticket_system_review.csv"
+
+
+def sort_by_time(df, column):
+    """`df` ordered by `column` (stable, missing dates last); index labels are kept."""
+    if df[column].is_monotonic_increasing:
+        return df
+    return df.sort_values(column, kind="stable", na_position="last")
+
+
+def _day_bounds(start, end):
+    """[first instant of `start`'s day, first instant after `end`'s day) as datetime64[ns]."""
+    start = pd.Timestamp(start).normalize()
+    end = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    return start.to_datetime64(), end.to_datetime64()
+
+
+class TimeIndex:
+    """Sorted timestamps of a frame ordered by `column` with `sort_by_time`."""
+
+    def __init__(self, df, column):
+        times = df[column].to_numpy(dtype="datetime64[ns]")
+        valid = ~np.isnat(times)
+        n_valid = int(valid.sum())
+        if not valid[:n_valid].all() or np.any(times[1:n_valid] < times[:n_valid - 1]):
+            raise ValueError(f"Frame is not sorted by {column!r}; load it through sort_by_time() first.")
+        self.column = column
+        self.times = times[:n_valid]
+        self.n_rows = len(df)
+
+    @classmethod
+    def _from_times(cls, column, times, n_rows):
+        index = cls.__new__(cls)
+        index.column, index.times, index.n_rows = column, times, n_rows
+        return index
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def nbytes(self):
+        return self.times.nbytes
+
+    def bounds(self):
+        return pd.Timestamp(self.times[0]), pd.Timestamp(self.times[-1])
+
+    def slice(self, start, end):
+        """Row slice of the dates within the calendar days `start`..`end`."""
+        lo, hi = _day_bounds(start, end)
+        return slice(int(np.searchsorted(self.times, lo, side="left")), int(np.searchsorted(self.times, hi, side="left")))
+
+
+def merge_sorted(df, index, batch):
+    """(`df` with the rows of `batch` merged in date order, its `TimeIndex`), given `index` of `df`.
+
+    `df` is sorted with `sort_by_time` and has a default RangeIndex. New rows
+    go after the existing rows of the same date, and rows without a date stay
+    last. When the batch only holds later dates, it is appended, not re-sorted.
+    """
+    batch = sort_by_time(batch, index.column)
+    new_times = batch[index.column].to_numpy(dtype="datetime64[ns]")
+    n_new = int((~np.isnat(new_times)).sum())
+    new_times = new_times[:n_new]
+    n_old = len(index.times)
+    at = np.searchsorted(index.times, new_times, side="right")
+    frame = pd.concat([df, batch], ignore_index=True)
+    if n_old < len(df) or (n_new and at[0] < n_old):
+        # Positions of the dated rows after the merge; undated rows (old, then new) follow them
+        is_new = np.zeros(n_old + n_new, dtype=bool)
+        is_new[at + np.arange(n_new)] = True
+        dated = np.empty(n_old + n_new, dtype=np.intp)
+        dated[~is_new] = np.arange(n_old)
+        dated[is_new] = len(df) + np.arange(n_new)
+        order = np.concatenate([dated, np.arange(n_old, len(df)), len(df) + np.arange(n_new, len(batch))])
+        frame = frame.take(order).reset_index(drop=True)
+    times = np.insert(index.times, at, new_times) if n_new else index.times
+    return frame, TimeIndex._from_times(index.column, times, len(frame))
+
+
+class DailyRollup:
+    """Per-day row counts, non-missing counts and sums of `values`, and counts of `flags`.
+
+    Statistics are kept for every value of `group` and for all rows, as prefix
+    sums over the sorted distinct days. `update` adds more rows; it replaces
+    the arrays rather than writing into them, so a `copy.copy` taken before
+    the update keeps answering from the old rows.
+    """
+
+    def __init__(self, df, column, values, group=None, flags=None):
+        self.column, self.values, self.group = column, list(values), group
+        self.stats = ["rows"] + [f"{col}_{stat}" for col in self.values for stat in ("sum", "count")]
+        self.stats += list(flags or {})
+        self.days = pd.DatetimeIndex([], dtype="datetime64[ns]", name=column)
+        self.groups = []
+        self._daily = np.zeros((1, 0, len(self.stats)))
+        self.update(df, flags)
+
+    def update(self, df, flags=None):
+        """Add the statistics of the rows of `df` (with the same `flags` names as at construction)."""
+        flags = flags or {}
+        if list(flags) != self.stats[1 + 2 * len(self.values):]:
+            raise ValueError(f"Expected flags {self.stats[1 + 2 * len(self.values):]}, got {list(flags)}.")
+        columns = [np.ones(len(df))]
+        for col in self.values:
+            data = df[col].to_numpy(dtype=np.float64)
+            columns += [np.nan_to_num(data), ~np.isnan(data)]
+        columns += [np.asarray(flag, dtype=bool) for flag in flags.values()]
+        columns = np.column_stack(columns).astype(np.float64)
+
+        days = pd.to_datetime(df[self.column]).dt.normalize()
+        # `union` leaves an empty left side's order as is: sort so every batch can arrive unsorted
+        all_days = self.days.union(pd.DatetimeIndex(days.dropna().unique())).sort_values().rename(self.column)
+        codes, values = (np.full(len(df), -1), []) if self.group is None else pd.factorize(df[self.group])
+        groups = self.groups + [value for value in values if value not in self.groups]
+        daily = np.zeros((len(groups) + 1, len(all_days), len(self.stats)))
+        daily[:len(self.groups) + 1, all_days.get_indexer(self.days)] = self._daily
+        day = all_days.get_indexer(days)
+        # Codes of this batch -> positions in `groups` (missing values stay -1)
+        codes = np.array([groups.index(value) for value in values] + [-1], dtype=np.intp)[codes]
+
+        valid = day >= 0
+        np.add.at(daily[0], day[valid], columns[valid])
+        grouped = valid & (codes >= 0)
+        np.add.at(daily, (codes[grouped] + 1, day[grouped]), columns[grouped])
+        # prefix[g, k] sums days before days[k]; group 0 is all rows
+        self.days, self.groups, self._daily = all_days, groups, daily
+        self._prefix = np.concatenate([np.zeros_like(daily[:, :1]), np.cumsum(daily, axis=1)], axis=1)
+
+    def __len__(self):
+        return len(self.days)
+
+    @property
+    def nbytes(self):
+        return self._daily.nbytes + self._prefix.nbytes
+
+    def _range(self, start, end, group):
+        lo, hi = _day_bounds(start, end)
+        i = int(self.days.searchsorted(lo, side="left"))
+        j = int(self.days.searchsorted(hi, side="left"))
+        g = 0 if group is None else self.groups.index(group) + 1
+        return self._prefix[g], i, j
+
+    def daily(self, start, end, group=None):
+        """One row per day between `start` and `end` that has rows, with the statistics as columns."""
+        prefix, i, j = self._range(start, end, group)
+        frame = pd.DataFrame(np.diff(prefix[i:j + 1], axis=0), index=self.days[i:j], columns=self.stats)
+        return frame[frame["rows"] > 0]
+
+    def totals(self, start, end, group=None):
+        """Statistics summed over the days between `start` and `end`."""
+        prefix, i, j = self._range(start, end, group)
+        return pd.Series(prefix[j] - prefix[i], index=self.stats)
+
+
+def _survey_rows(df):
+    flags = survey_flags(df)
+    scores = responder_scores(df, flags["responders"])
+    return df.assign(**{col: scores[col] for col in SURVEY_SCORES}), flags
+
+
+def survey_rollup(df):
+    """Rollup of the `shared.satisfaction` statistics behind every sentiment dashboard KPI."""
+    rows, flags = _survey_rows(df)
+    return DailyRollup(rows, "date_of_survey", SURVEY_SCORES, group="ticket_system", flags=flags)
+
+
+def update_survey_rollup(rollup, df):
+    """Add newly arrived survey rows to a `survey_rollup`."""
+    rows, flags = _survey_rows(df)
+    rollup.update(rows, flags)
+
+
+def _load_survey(scale=1):
+    from shared.datasets import load_dataset
+
+    df = load_dataset(SURVEY_DATASET)
+    if scale > 1:
+        df = pd.concat([df] * scale, ignore_index=True)
+    return sort_by_time(df, "date_of_survey")
+
+
+def _random_range(days, rng):
+    i, j = sorted(rng.integers(0, len(days), size=2))
+    return days[i], days[j]
+
+
+def check(n_ranges=100, seed=0):
+    df = _load_survey()
+    index = TimeIndex(df, "date_of_survey")
+    rollup = survey_rollup(df)
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+    for _ in range(n_ranges):
+        start, end = _random_range(rollup.days, rng)
+        group = rng.choice([None, *rollup.groups])
+        expected = df[(df["date_of_survey"] >= start) & (df["date_of_survey"] <= end)]
+        if not df.iloc[index.slice(start, end)].equals(expected):
+            mismatches += 1
+        if group is not None:
+            expected = expected[expected["ticket_system"] == group]
+        by_day = expected.groupby("date_of_survey")
+        daily = rollup.daily(start, end, group)
+        means = {col: daily[f"{col}_sum"] / daily[f"{col}_count"] for col in SURVEY_SCORES}
+        ok = (np.array_equal(daily["rows"].to_numpy(), by_day.size().to_numpy())
+              and all(np.allclose(means[col].to_numpy(), by_day[col].mean().to_numpy(), equal_nan=True)
+                      for col in SURVEY_SCORES)
+              and np.array_equal(daily["promoters"].to_numpy(),
+                                 by_day["likelihood_to_recommend"].apply(lambda s: (s >= 9).sum()).to_numpy()))
+        mismatches += not ok
+    print(f"{SURVEY_DATASET}: {n_ranges} random ranges, {mismatches} mismatches · "
+          f"{len(rollup)} days x {len(rollup.groups) + 1} groups, rollup {rollup.nbytes / 1e3:.0f} KB")
+    return mismatches == 0
+
+
+def bench(scales=(1, 10, 100), repeat=5):
+    print(f"{'rows':>9} {'mask + copy':>12} {'slice':>9} {'groupby by day':>15} {'rollup':>9}")
+    for scale in scales:
+        df = _load_survey(scale)
+        index = TimeIndex(df, "date_of_survey")
+        rollup = survey_rollup(df)
+        start, end = rollup.days[len(rollup) // 4], rollup.days[3 * len(rollup) // 4]
+
+        def scan():
+            filtered = df.copy()
+            return filtered[(filtered["date_of_survey"] >= start) & (filtered["date_of_survey"] <= end)]
+
+        filtered = scan()
+
+        def groupby():
+            filtered.groupby("date_of_survey")[SURVEY_SCORES].mean()
+            filtered["date_of_survey"].value_counts()
+
+        print(f"{len(df):>9,} {best_ms(scan, repeat):>9.2f} ms "
+              f"{best_ms(lambda: df.iloc[index.slice(start, end)], repeat):>6.2f} ms "
+              f"{best_ms(groupby, repeat):>12.2f} ms {best_ms(lambda: rollup.daily(start, end), repeat):>6.2f} ms")
+
+
+def main():
+    run_commands(__doc__, {
+        "check": (check, "Compare slices and rollups with masks and groupby.", {"--ranges": ("n_ranges", 100)}),
+        "bench": (bench, "Date filter and per-day views: scan vs index.", {"--repeat": ("repeat", 5)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
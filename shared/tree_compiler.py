@@ -0,0 +1,289 @@
+"""Compile tree ensembles into packed NumPy arrays and score them without xgboost/sklearn.
+
+    python -m shared.tree_compiler compile   # write <model>.trees.npz next to each XGBoost / Random Forest pickle
+    python -m shared.tree_compiler check     # parity of the committed .trees.npz with the original models on the test datasets
+    python -m shared.tree_compiler bench     # per-row latency: native booster vs compiled ensemble
+
+All trees of a model share one set of flat arrays (feature, threshold, left,
+right, default_left, value). Leaves point to themselves, so scoring is
+`max_depth` rounds of vectorized gathers over an (n_rows, n_trees) node matrix.
+The pages pick the compiled file through `prefer_compiled(model_path)`.
+"""
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from shared.cli import run_commands
+from shared.paths import relative, resolve
+from shared.xgb_native import XGB_MODELS, prefer_native
+
+# Random Forest pickles referenced by Zomato_Delivery_Time/my_pages/prediction.py (compiled when present)
+RF_MODELS = [
+    "Zomato_Delivery_Time/models/rf_reg_model.pkl",
+    "Zomato_Delivery_Time/models/rf_class_model.pkl",
+]
+
+# (model, dataset, target column) used by `check`
+PARITY_SETS = [
+    ("Zomato_Delivery_Time/models/xgb_reg_model.pkl", "Zomato_Delivery_Time/dataset/df_zomato_test_reg.csv", "delivery_time"),
+    ("Zomato_Delivery_Time/models/xgb_class_model.pkl", "Zomato_Delivery_Time/dataset/df_zomato_test_clas.csv", "delivery_speed_category"),
+    ("Zomato_Delivery_Time/models/rf_reg_model.pkl", "Zomato_Delivery_Time/dataset/df_zomato_test_reg.csv", "delivery_time"),
+    ("Zomato_Delivery_Time/models/rf_class_model.pkl", "Zomato_Delivery_Time/dataset/df_zomato_test_clas.csv", "delivery_speed_category"),
+    ("Bank_Card/models/xgb_model.pkl", "Bank_Card/dataset/df_churn_test_scaled.csv", "Attrition_Flag"),
+    ("Project_/models/xgboost_model.pkl", "Project_/dataset/df_churn_processed.csv", "Exited"),
+]
+
+
+class CompiledEnsemble:
+    """Flat-array tree ensemble with `predict` / `predict_proba` like the original estimator."""
+
+    ARRAYS = ("roots", "feature", "threshold", "left", "right", "default_left", "value", "classes", "base_margin")
+
+    def __init__(self, roots, feature, threshold, left, right, default_left, value, max_depth,
+                 kind, strict, aggregate, classes=None, base_margin=0.0):
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.right = np.asarray(right, dtype=np.intp)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.value = np.asarray(value, dtype=np.float64)      # (n_nodes, n_outputs), only read at leaves
+        self.max_depth = int(max_depth)
+        self.kind = kind              # "xgb_regressor" | "xgb_binary" | "rf_regressor" | "rf_classifier"
+        self.strict = bool(strict)    # XGBoost splits on x < t, sklearn on x <= t
+        self.aggregate = aggregate    # "sum" (boosting) or "mean" (bagging)
+        self.classes = None if classes is None else np.asarray(classes)
+        self.base_margin = float(base_margin)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _leaves(self, features):
+        X = np.asarray(features, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            threshold = self.threshold[node]
+            go_left = x < threshold if self.strict else x <= threshold
+            missing = np.isnan(x)
+            if missing.any():
+                go_left = np.where(missing, self.default_left[node], go_left)
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node]       # (n_rows, n_trees, n_outputs)
+
+    def raw(self, features):
+        leaves = self._leaves(features)
+        if self.aggregate == "sum":
+            return leaves.sum(axis=1) + self.base_margin
+        return leaves.mean(axis=1)
+
+    def predict_proba(self, features):
+        raw = self.raw(features)
+        if self.kind == "xgb_binary":
+            prob = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+            return np.column_stack([1.0 - prob, prob])
+        if self.kind == "rf_classifier":
+            return raw
+        raise AttributeError("predict_proba is only available for classifiers")
+
+    def predict(self, features):
+        if self.kind == "xgb_binary":
+            return (self.predict_proba(features)[:, 1] > 0.5).astype(np.int64)
+        if self.kind == "rf_classifier":
+            return self.classes[np.argmax(self.raw(features), axis=1)]
+        return self.raw(features)[:, 0]
+
+    def save(self, path):
+        meta = {"max_depth": self.max_depth, "kind": self.kind, "strict": self.strict, "aggregate": self.aggregate}
+        arrays = {name: getattr(self, name) for name in self.ARRAYS if getattr(self, name) is not None}
+        np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            arrays = {name: data[name] for name in cls.ARRAYS if name in data.files}
+        return cls(**arrays, **meta)
+
+
+def _depth(left, right, root):
+    depth, frontier = 0, [root]
+    while True:
+        frontier = [child for node in frontier for child in (left[node], right[node]) if child != node]
+        if not frontier:
+            return depth
+        depth += 1
+
+
+def _pack(trees, kind, strict, aggregate, n_outputs, classes=None, base_margin=0.0):
+    """Concatenate per-tree (feature, threshold, left, right, default_left, value) arrays with global node ids."""
+    roots, parts, offset, max_depth = [], [], 0, 0
+    for feature, threshold, left, right, default_left, value in trees:
+        n = len(feature)
+        is_leaf = left < 0
+        ids = np.arange(n)
+        left = np.where(is_leaf, ids, left) + offset
+        right = np.where(is_leaf, ids, right) + offset
+        feature = np.where(is_leaf, 0, feature)
+        parts.append((feature, threshold, left, right, default_left, value.reshape(n, n_outputs)))
+        max_depth = max(max_depth, _depth(left - offset, right - offset, 0))
+        roots.append(offset)
+        offset += n
+    columns = [np.concatenate(column) for column in zip(*parts)]
+    return CompiledEnsemble(roots, *columns, max_depth=max_depth, kind=kind, strict=strict,
+                            aggregate=aggregate, classes=classes, base_margin=base_margin)
+
+
+def compile_xgboost(booster):
+    model = json.loads(booster.save_raw("json"))
+    learner = model["learner"]
+    objective = learner["objective"]["name"]
+    base_score = float(learner["learner_model_param"]["base_score"])
+    if objective == "binary:logistic":
+        kind, base_margin = "xgb_binary", float(np.log(base_score / (1.0 - base_score)))
+    elif objective.startswith("reg:squared"):
+        kind, base_margin = "xgb_regressor", base_score
+    else:
+        raise ValueError(f"Unsupported XGBoost objective {objective!r}")
+    trees = []
+    for tree in learner["gradient_booster"]["model"]["trees"]:
+        left = np.asarray(tree["left_children"], dtype=np.intp)
+        right = np.asarray(tree["right_children"], dtype=np.intp)
+        # Leaf values are stored in split_conditions for leaf nodes
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        trees.append((np.asarray(tree["split_indices"], dtype=np.intp), conditions.astype(np.float64), left, right,
+                      np.asarray(tree["default_left"], dtype=bool), conditions.astype(np.float64)))
+    return _pack(trees, kind, strict=True, aggregate="sum", n_outputs=1, base_margin=base_margin)
+
+
+def compile_random_forest(forest):
+    is_classifier = hasattr(forest, "classes_")
+    trees = []
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :] if not is_classifier else tree.value[:, 0, :] / tree.value[:, 0, :].sum(axis=1, keepdims=True)
+        default_left = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=np.uint8)).astype(bool)
+        trees.append((tree.feature.astype(np.intp), tree.threshold, tree.children_left.astype(np.intp),
+                      tree.children_right.astype(np.intp), default_left, value))
+    n_outputs = len(forest.classes_) if is_classifier else 1
+    return _pack(trees, "rf_classifier" if is_classifier else "rf_regressor", strict=False, aggregate="mean",
+                 n_outputs=n_outputs, classes=forest.classes_ if is_classifier else None)
+
+
+def compile_model(model):
+    if hasattr(model, "get_booster"):
+        return compile_xgboost(model.get_booster())
+    if hasattr(model, "estimators_"):
+        return compile_random_forest(model)
+    raise TypeError(f"Cannot compile {type(model).__name__}")
+
+
+def compiled_path_for(model_path):
+    model_path = Path(model_path)
+    return model_path.with_name(model_path.name.split(".")[0] + ".trees.npz")
+
+
+def prefer_compiled(model_path):
+    """Compiled ensemble if it exists, else the native booster if exported, else `model_path`."""
+    compiled = compiled_path_for(model_path)
+    if resolve(compiled).exists():
+        return relative(compiled)
+    return prefer_native(model_path)
+
+
+def _existing(paths):
+    return [path for path in paths if resolve(path).exists()]
+
+
+def compile_all():
+    import joblib
+
+    for model_path in _existing(XGB_MODELS + RF_MODELS):
+        compiled = compile_model(joblib.load(resolve(model_path)))
+        out = resolve(compiled_path_for(model_path))
+        compiled.save(out)
+        print(f"{relative(out)}: {compiled.n_trees} trees, {len(compiled.feature)} nodes, "
+              f"depth {compiled.max_depth}, {out.stat().st_size / 1024:.0f} KB")
+
+
+def parity(model_path, dataset):
+    """Outputs of the original model and of its committed `.trees.npz` on `dataset`.
+
+    Returns (expected, got, labels_match); `labels_match` is None for regressors.
+    """
+    import joblib
+    import pandas as pd
+
+    from shared.feature_schema import schema_for_model
+
+    model = joblib.load(resolve(model_path))
+    compiled = CompiledEnsemble.load(resolve(compiled_path_for(model_path)))
+    X = pd.read_csv(resolve(dataset))[schema_for_model(model_path).columns].to_numpy(dtype=np.float32)
+    if hasattr(model, "predict_proba"):
+        expected, got = model.predict_proba(X), compiled.predict_proba(X)
+        labels_match = float(np.mean(model.predict(X) == compiled.predict(X)))
+    else:
+        expected, got = model.predict(X), compiled.predict(X)
+        labels_match = None
+    return np.asarray(expected, dtype=np.float64), got, labels_match
+
+
+def check(atol=1e-5, rtol=1e-5):
+    failed = False
+    for model_path, dataset, target in PARITY_SETS:
+        missing = [path for path in (model_path, compiled_path_for(model_path), dataset) if not resolve(path).exists()]
+        if missing:
+            print(f"{model_path}: skipped ({missing[0]} not in the repository)")
+            continue
+        expected, got, labels_match = parity(model_path, dataset)
+        max_diff = float(np.abs(expected - got).max())
+        # XGBoost accumulates leaves in float32, so large regression outputs differ in the last ulps
+        ok = np.allclose(got, expected, rtol=rtol, atol=atol)
+        failed |= not ok
+        extra = "" if labels_match is None else f", labels match {labels_match:.2%}"
+        print(f"{'OK ' if ok else 'FAIL'} {model_path} on {Path(dataset).name} ({len(expected)} rows): "
+              f"max |diff| {max_diff:.2e}{extra}")
+    return not failed
+
+
+def bench(n_rows=2000):
+    from shared.feature_schema import schema_for_model
+    from shared.xgb_native import NativeBooster
+
+    rng = np.random.default_rng(0)
+    print(f"{'model':<50} {'native booster':>15} {'compiled':>10} {'compiled (batch/row)':>21}")
+    for model_path in _existing(XGB_MODELS):
+        native = NativeBooster.load(resolve(prefer_native(model_path)))
+        compiled = CompiledEnsemble.load(resolve(compiled_path_for(model_path)))
+        method = "predict_proba" if native.is_classifier else "predict"
+        X = rng.normal(size=(n_rows, schema_for_model(model_path).n_features)).astype(np.float32)
+        timings = []
+        for fn in (getattr(native, method), getattr(compiled, method)):
+            start = time.perf_counter()
+            for i in range(n_rows):
+                fn(X[i:i + 1])
+            timings.append((time.perf_counter() - start) / n_rows * 1e6)
+        start = time.perf_counter()
+        getattr(compiled, method)(X)
+        batch_us = (time.perf_counter() - start) / n_rows * 1e6
+        print(f"{model_path:<50} {timings[0]:>12.1f} us {timings[1]:>7.1f} us {batch_us:>18.2f} us")
+
+
+def main():
+    run_commands(__doc__, {
+        "compile": (compile_all, "Write <model>.trees.npz next to each tree-ensemble pickle.", {}),
+        "check": (check, "Compare compiled ensembles with the original models.",
+                  {"--atol": ("atol", 1e-5), "--rtol": ("rtol", 1e-5)}),
+        "bench": (bench, "Per-row latency of the native booster and the compiled ensemble.",
+                  {"--rows": ("n_rows", 2000)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
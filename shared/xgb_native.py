@@ -0,0 +1,134 @@
+"""Native XGBoost boosters for scoring without the sklearn wrapper.
+
+    python -m shared.xgb_native export [--format ubj|json]   # write <model>.ubj next to each XGBoost pickle
+    python -m shared.xgb_native bench [--rows 2000]          # per-row latency: sklearn wrapper vs native booster
+
+The pages and the scoring server call `prefer_native(model_path)`, which picks
+the exported booster when it exists. It is loaded through the model registry
+and scores NumPy arrays in place (`Booster.inplace_predict`), no DMatrix or DataFrame.
+"""
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from shared.cli import run_commands
+from shared.paths import relative, resolve
+
+XGB_MODELS = [
+    "Zomato_Delivery_Time/models/xgb_reg_model.pkl",
+    "Zomato_Delivery_Time/models/xgb_class_model.pkl",
+    "Bank_Card/models/xgb_model.pkl",
+    "Project_/models/xgboost_model.pkl",
+]
+
+# Single rows are cheapest on one thread; batch callers can raise it.
+DEFAULT_NTHREAD = int(os.environ.get("XGB_NATIVE_NTHREAD", "1"))
+
+
+class NativeBooster:
+    """`predict`/`predict_proba` on an `xgboost.Booster`, mirroring the sklearn wrapper's outputs."""
+
+    def __init__(self, booster, nthread=DEFAULT_NTHREAD):
+        import json
+
+        self.booster = booster
+        self.nthread = nthread
+        self.booster.set_param({"nthread": nthread})
+        config = json.loads(booster.save_config())
+        self.objective = config["learner"]["objective"]["name"]
+        self.is_classifier = self.objective.startswith("binary:")
+
+    @classmethod
+    def load(cls, path, nthread=DEFAULT_NTHREAD):
+        import xgboost as xgb
+
+        booster = xgb.Booster()
+        booster.load_model(str(path))
+        return cls(booster, nthread)
+
+    def _margin_or_prob(self, features):
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        return self.booster.inplace_predict(features, validate_features=False)
+
+    def predict(self, features):
+        values = self._margin_or_prob(features)
+        if self.is_classifier:
+            return (values > 0.5).astype(np.int64)
+        return values
+
+    def predict_proba(self, features):
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for binary classifiers")
+        prob = self._margin_or_prob(features)
+        return np.column_stack([1.0 - prob, prob])
+
+
+def native_path_for(model_path, fmt="ubj"):
+    return Path(model_path).with_suffix(f".{fmt}")
+
+
+def prefer_native(model_path):
+    """Return the exported native booster path for an XGBoost pickle if it exists, else `model_path`."""
+    for fmt in ("ubj", "json"):
+        native = native_path_for(model_path, fmt)
+        if resolve(native).exists():
+            return relative(native)
+    return model_path
+
+
+def export(fmt="ubj"):
+    import joblib
+
+    for model_path in XGB_MODELS:
+        booster = joblib.load(resolve(model_path)).get_booster()
+        out = resolve(native_path_for(model_path, fmt))
+        booster.save_model(str(out))
+        print(f"{relative(out)}: {out.stat().st_size / 1024:.0f} KB")
+
+
+def _per_row_us(fn, rows):
+    start = time.perf_counter()
+    for i in range(len(rows)):
+        fn(rows[i:i + 1])
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def bench(n_rows=2000):
+    import joblib
+
+    from shared.feature_schema import schema_for_model
+
+    rng = np.random.default_rng(0)
+    print(f"{'model':<50} {'sklearn+DataFrame':>18} {'sklearn+ndarray':>16} {'native booster':>15} {'speed-up':>9}")
+    for model_path in XGB_MODELS:
+        schema = schema_for_model(model_path)
+        rows = rng.normal(size=(n_rows, schema.n_features)).astype(np.float32)
+        frames = [schema.to_frame(rows[i:i + 1]) for i in range(n_rows)]
+        model = joblib.load(resolve(model_path))
+        native = NativeBooster.load(resolve(prefer_native(model_path)))
+        method = "predict_proba" if native.is_classifier else "predict"
+
+        sk = getattr(model, method)
+        start = time.perf_counter()
+        for frame in frames:
+            sk(frame)
+        frame_us = (time.perf_counter() - start) / n_rows * 1e6
+        array_us = _per_row_us(sk, rows)
+        native_us = _per_row_us(getattr(native, method), rows)
+        assert np.allclose(sk(rows), getattr(native, method)(rows), atol=1e-6)
+        print(f"{model_path:<50} {frame_us:>15.1f} us {array_us:>13.1f} us {native_us:>12.1f} us {frame_us / native_us:>8.1f}x")
+
+
+def main():
+    run_commands(__doc__, {
+        "export": (export, "Write native boosters next to the XGBoost pickles.",
+                   {"--format": ("fmt", "ubj", {"choices": ["ubj", "json"]})}),
+        "bench": (bench, "Compare per-row latency of the sklearn wrapper and the native booster.",
+                  {"--rows": ("n_rows", 2000)}),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _repo_root(monkeypatch):
+    """Run every test from the repository root, as the `python -m shared.X` commands do."""
+    monkeypatch.chdir(REPO_ROOT)
+
+
+@pytest.fixture(scope="session")
+def require():
+    """Callable that skips the test unless every repository path it is given exists."""
+    from shared.paths import resolve
+
+    def require(*paths):
+        missing = [path for path in paths if not resolve(path).exists()]
+        if missing:
+            pytest.skip(f"{missing[0]} not in the repository")
+
+    return require
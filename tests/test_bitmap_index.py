@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared.bitmap_index import BitmapIndex, synthetic_orders
+
+ORDERS = pd.DataFrame({
+    "City": ["Urban", "Metropolitian", np.nan, "Urban", "Semi-Urban", "Urban"],
+    "Weather_conditions": ["Sunny", "Fog", "Sunny", "Stormy", "Fog", "Sunny"],
+    "Order_Date": pd.to_datetime(["2022-02-11", "2022-02-11", "2022-02-12", "2022-02-13", "2022-02-13", "2022-02-15"]),
+})
+
+
+@pytest.fixture
+def index():
+    return BitmapIndex(ORDERS, ["City", "Weather_conditions"], "Order_Date")
+
+
+def test_options_skip_missing_values(index):
+    assert index.options("City") == ["Urban", "Metropolitian", "Semi-Urban"]
+
+
+def test_rows(index):
+    assert index.rows({"City": ["Urban"]}).tolist() == [0, 3, 5]
+    assert index.rows({"City": ["Urban", "Semi-Urban"], "Weather_conditions": ["Sunny", "Fog"]}).tolist() == [0, 4, 5]
+    # Missing values never match, even when every option is selected
+    assert index.rows({"City": index.options("City")}).tolist() == [0, 1, 3, 4, 5]
+    assert index.count({"City": [np.nan]}) == 0
+    assert index.count({"City": []}) == 0
+
+
+def test_date_range_includes_both_days(index):
+    start, end = pd.Timestamp("2022-02-12"), pd.Timestamp("2022-02-13")
+    assert index.rows({}, (start, end)).tolist() == [2, 3, 4]
+    assert index.rows({"Weather_conditions": ["Fog"]}, (start, end)).tolist() == [4]
+    assert index.count({}, (pd.Timestamp("2000-01-01"), pd.Timestamp("2000-01-02"))) == 0
+
+
+def test_word_boundaries():
+    # Enough rows that selections start and end inside 64-bit words
+    df = synthetic_orders(10_000, seed=1)
+    index = BitmapIndex(df, ["City", "Road_traffic_density"], "Order_Date")
+    start, end = pd.Timestamp("2022-02-20"), pd.Timestamp("2022-03-05")
+    expected = np.flatnonzero(((df["City"] == "Urban") | (df["City"] == "Semi-Urban")).to_numpy()
+                              & (df["Road_traffic_density"] == "Jam").to_numpy()
+                              & ((df["Order_Date"] >= start) & (df["Order_Date"] <= end)).to_numpy())
+    got = index.rows({"City": ["Urban", "Semi-Urban"], "Road_traffic_density": ["Jam"]}, (start, end))
+    assert len(expected) > 0
+    np.testing.assert_array_equal(got, expected)
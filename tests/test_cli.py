@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from shared.cli import run_commands
+from shared.paths import REPO_ROOT
+
+
+def _run(monkeypatch, argv, commands):
+    monkeypatch.setattr("sys.argv", ["prog", *argv])
+    run_commands("Test commands.", commands)
+
+
+def test_options_take_the_type_of_their_default(monkeypatch, tmp_path):
+    calls = []
+    commands = {"bench": (lambda **kw: calls.append((kw, os.getcwd())), "", {
+        "--rows": ("n_rows", 2000), "--atol": ("atol", 1e-5), "--save": ("save", False),
+        "--workers": ("workers", None, {"type": int}),
+        "--page": ("pages", None, {"action": "append", "choices": ["a", "b"]}),
+    })}
+    monkeypatch.chdir(tmp_path)
+    _run(monkeypatch, ["bench", "--rows", "10", "--atol", "0.5", "--save", "--page", "a", "--page", "b"], commands)
+    _run(monkeypatch, ["bench"], commands)
+    assert calls == [
+        ({"n_rows": 10, "atol": 0.5, "save": True, "workers": None, "pages": ["a", "b"]}, str(REPO_ROOT)),
+        ({"n_rows": 2000, "atol": 1e-5, "save": False, "workers": None, "pages": None}, str(REPO_ROOT)),
+    ]
+
+
+def test_positional_arguments_are_required(monkeypatch):
+    calls = []
+    commands = {"page": (lambda name, rounds: calls.append((name, rounds)), "", {
+        "name": ("name", None, {"choices": ["a", "b"]}), "--rounds": ("rounds", 20),
+    })}
+    _run(monkeypatch, ["page", "b", "--rounds", "3"], commands)
+    assert calls == [("b", 3)]
+    with pytest.raises(SystemExit) as exc:
+        _run(monkeypatch, ["page"], commands)
+    assert exc.value.code == 2
+
+
+@pytest.mark.parametrize("result, code", [(True, 0), (False, 1)])
+def test_boolean_results_set_the_exit_status(monkeypatch, result, code):
+    with pytest.raises(SystemExit) as exc:
+        _run(monkeypatch, ["export"], {"export": (lambda: result, "", {})})
+    assert exc.value.code == code
+
+
+def test_other_results_do_not_exit(monkeypatch):
+    _run(monkeypatch, ["bench"], {"bench": (lambda: None, "", {})})
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from shared.count_cube import BANK_CHURN_CUBE, BANK_CHURN_DATASET, CountCube
+from shared.paths import resolve
+
+ORDERS = pd.DataFrame({
+    "group": ["a", "b", "a", "b", "a"],
+    "flag": ["x", "x", "y", "y", "x"],
+    "age": [21, 24, 26, 39, 44],
+})
+
+
+@pytest.fixture
+def cube():
+    return CountCube(ORDERS, dims=("group",), ranges={"age": 5}, cuboids=[("flag",)])
+
+
+def test_count(cube):
+    assert cube.count() == 5
+    assert cube.count({"group": ["a"]}) == 3
+    # 22..27 widens to the bins [20, 25) and [25, 30)
+    assert cube.count({"age": (22, 27)}) == 3
+    assert cube.count({"group": ["b"], "age": (22, 27)}) == 1
+    assert cube.count({"group": []}) == 0
+
+
+def test_mask_selects_the_counted_rows(cube):
+    assert cube.mask(ORDERS, {"group": ["a"], "age": (22, 27)}).tolist() == [True, False, True, False, False]
+
+
+def test_counts_include_empty_combinations(cube):
+    counts = cube.counts(["group", "flag"], {"age": (35, 45)})
+    assert counts.to_dict() == {("a", "x"): 1, ("a", "y"): 0, ("b", "x"): 0, ("b", "y"): 1}
+
+
+def test_crosstab(cube):
+    got = cube.crosstab("group", "flag")
+    assert got.to_numpy().tolist() == [[2, 1], [1, 1]]
+    assert list(got.index) == ["a", "b"] and list(got.columns) == ["x", "y"]
+    # All-zero rows and columns are dropped, like pd.crosstab
+    assert cube.crosstab("group", "flag", {"group": ["a"], "age": (20, 25)}).to_numpy().tolist() == [[1]]
+
+
+def test_unknown_filter_column_is_rejected(cube):
+    with pytest.raises(ValueError, match="Can only filter"):
+        cube.count({"city": ["x"]})
+
+
+@pytest.fixture(scope="module")
+def churn(require):
+    require(BANK_CHURN_DATASET)
+    df = pd.read_csv(resolve(BANK_CHURN_DATASET))
+    return df, CountCube(df, **BANK_CHURN_CUBE)
+
+
+@pytest.mark.parametrize("index, columns", [
+    (["Marital_Status", "Dependent_count"], "Gender"),
+    (["Credit_Limit_Category"], "Gender"),
+    (["Education_Level"], "Gender"),
+    (["Gender"], "Attrition_Flag"),
+])
+def test_churn_crosstabs_match_pandas(churn, index, columns):
+    df, cube = churn
+    where = {"Gender": ["F"], "Customer_Age": (40, 50), "Total_Trans_Ct": (30, 90), "Total_Trans_Amt": (1000, 6000)}
+    rows = df[(df["Gender"] == "F") & df["Customer_Age"].between(40, 49) & (df["Total_Trans_Ct"] >= 30)
+              & (df["Total_Trans_Ct"] < 90) & (df["Total_Trans_Amt"] >= 1000) & (df["Total_Trans_Amt"] < 6000)]
+    assert cube.count(where) == len(rows) > 0
+    expected = pd.crosstab([rows[col] for col in index], rows[columns])
+    pd.testing.assert_frame_equal(cube.crosstab(index, columns, where), expected, check_names=False,
+                                  check_index_type=False, check_column_type=False)
@@ -0,0 +1,74 @@
+import os
+
+import pandas as pd
+import pytest
+
+from shared import datasets
+from shared.datasets import DatasetCache, cached_rows, convert, dataset_cache
+
+
+@pytest.fixture
+def orders_csv(tmp_path):
+    path = tmp_path / "orders.csv"
+    pd.DataFrame({
+        "day": ["2022-03-02", "2022-03-01", "2022-03-02", "2022-03-01"],
+        "city": ["Urban", "Metro", "Metro", "Urban"],
+        "minutes": [30, 25, 41, 18],
+    }).to_csv(path, index=False)
+    return path
+
+
+def by_day(df):
+    return df.sort_values("day", kind="stable")
+
+
+def test_cached_rows_lines_up_with_the_full_frame(orders_csv):
+    pytest.importorskip("pyarrow")
+    convert(orders_csv)
+    full = dataset_cache.get(orders_csv, by_day)
+    assert full["minutes"].tolist() == [25, 18, 30, 41]
+    rows = [1, 3]
+    projected = cached_rows(orders_csv, rows, ["day", "minutes"], by_day)
+    assert list(projected.columns) == ["day", "minutes"]
+    assert projected["minutes"].tolist() == [18, 41]
+    assert dataset_cache.loaded()[(datasets.relative(orders_csv), ("day", "minutes"),
+                                   f"{__name__}.by_day", None)].path.endswith("orders.arrow")
+
+
+def test_file_hashes_are_memoized_and_bounded(orders_csv, monkeypatch):
+    calls = []
+    monkeypatch.setattr(datasets, "_sha256", lambda path: calls.append(path) or f"hash{len(calls)}")
+    monkeypatch.setattr(datasets, "_file_hashes", datasets.OrderedDict())
+    monkeypatch.setattr(datasets, "MAX_FILE_HASHES", 2)
+
+    cache = DatasetCache()
+    cache.get(orders_csv)
+    os.utime(orders_csv, ns=(1, 1))
+    cache.get(orders_csv)
+    cache.get(orders_csv, by_day)
+    # One hash per version of the file, not per load
+    assert len(calls) == 2
+    for mtime in (2, 3, 4):
+        os.utime(orders_csv, ns=(mtime, mtime))
+        datasets._file_sha256(orders_csv)
+    assert len(datasets._file_hashes) == 2
+
+
+def test_builders_share_the_prepared_frame(orders_csv):
+    prepared = []
+
+    def prepare(df):
+        prepared.append(len(df))
+        return by_day(df)
+
+    def minutes(df):
+        return df["minutes"].to_numpy()
+
+    def cities(df):
+        return df["city"].to_numpy()
+
+    cache = DatasetCache()
+    assert cache.get(orders_csv, prepare, build=minutes).tolist() == [25, 18, 30, 41]
+    assert cache.get(orders_csv, prepare, build=cities).tolist() == ["Metro", "Urban", "Urban", "Metro"]
+    assert cache.get(orders_csv, prepare)["minutes"].tolist() == [25, 18, 30, 41]
+    assert prepared == [4]
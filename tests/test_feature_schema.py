@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared.feature_schema import FeatureSchema, load_schema, schema_path_for
+
+SPEC = {
+    "model": "test",
+    "columns": [{"name": name, "dtype": "float64"}
+                for name in ("age", "gender", "city_urban", "city_semi_urban", "unused")],
+    "fields": [
+        {"name": "age", "kind": "numeric"},
+        {"name": "gender", "kind": "binary", "mapping": {"F": 0, "M": 1}},
+        {"name": "city", "kind": "onehot", "normalize": "snake_lower",
+         "columns": {"urban": "city_urban", "semi-urban": "city_semi_urban"}},
+    ],
+}
+
+
+def test_encode_writes_each_field_kind():
+    row = FeatureSchema(SPEC).encode({"age": 42, "gender": "M", "city": "Urban"})
+    assert row.dtype == np.float32 and row.shape == (1, 5) and row.flags.c_contiguous
+    np.testing.assert_array_equal(row, [[42, 1, 1, 0, 0]])
+
+
+def test_unknown_onehot_label_leaves_columns_at_zero():
+    row = FeatureSchema(SPEC).encode({"age": 30, "gender": "F", "city": "Rural"})
+    np.testing.assert_array_equal(row, [[30, 0, 0, 0, 0]])
+
+
+def test_unknown_category_names_the_field_and_its_values():
+    with pytest.raises(ValueError, match=r"'X' for field 'gender', expected one of \['F', 'M'\]"):
+        FeatureSchema(SPEC).encode({"age": 30, "gender": "X", "city": "Urban"})
+    spec = dict(SPEC, fields=[*SPEC["fields"][:2], dict(SPEC["fields"][2], choices=["Urban", "Semi-Urban", "Rural"])])
+    np.testing.assert_array_equal(FeatureSchema(spec).encode({"age": 30, "gender": "F", "city": "Rural"}), [[30, 0, 0, 0, 0]])
+    with pytest.raises(ValueError, match=r"'Metro' for field 'city', expected one of \['Urban', 'Semi-Urban', 'Rural'\]"):
+        FeatureSchema(spec).encode({"age": 30, "gender": "F", "city": "Metro"})
+
+
+def test_missing_field_is_a_key_error():
+    with pytest.raises(KeyError, match="gender"):
+        FeatureSchema(SPEC).encode({"age": 30, "city": "Urban"})
+
+
+def test_encode_frame():
+    frame = pd.DataFrame({"age": [42, "n/a", 19], "gender": ["M", "F", "X"], "city": ["Urban", "Semi-Urban", "Rural"]})
+    expected = np.array([[42, 1, 1, 0, 0],
+                         [np.nan, 0, 0, 1, 0],
+                         [19, np.nan, 0, 0, 0]], dtype=np.float32)
+    np.testing.assert_array_equal(FeatureSchema(SPEC).encode_frame(frame), expected)
+
+
+def test_unknown_field_kind_is_rejected():
+    with pytest.raises(ValueError, match="ordinal"):
+        FeatureSchema(dict(SPEC, fields=[{"name": "age", "kind": "ordinal"}]))
+
+
+def test_committed_schema_encodes_a_customer(require):
+    path = schema_path_for("Project_/models/xgboost_model.pkl")
+    require(path)
+    schema = load_schema(path)
+    frame = schema.to_frame(schema.encode({
+        "HasCrCard": "Yes", "CreditScore": 700, "Tenure": 3, "Balance": 1000.0, "NumOfProducts": 2,
+        "IsActiveMember": "No", "Age": 41, "EstimatedSalary": 52000.0, "Geography": "Germany", "Gender": "Male",
+    }))
+    row = frame.iloc[0]
+    assert list(frame.columns) == schema.columns
+    assert row[["HasCrCard", "IsActiveMember", "CreditScore", "Tenure", "NumOfProducts", "Age"]].tolist() == [1, 0, 700, 3, 2, 41]
+    assert row[["Geography_France", "Geography_Germany", "Geography_Spain"]].tolist() == [0, 1, 0]
+    assert row[["Gender_Female", "Gender_Male"]].tolist() == [0, 1]
+    # Engineered columns that no form field writes stay 0
+    assert not row.filter(like="Age_ActiveStatus_").any()
@@ -0,0 +1,42 @@
+import pytest
+
+from shared.feature_schema import FeatureSchema, load_schema
+from shared.paths import REPO_ROOT, relative
+from shared.schema_form import field_input
+
+SCHEMA = FeatureSchema({
+    "columns": [{"name": "age", "dtype": "int64"}, {"name": "km", "dtype": "float64"}, {"name": "stops", "dtype": "int64"}],
+    "fields": [
+        {"name": "age", "kind": "numeric", "min": 15, "max": 50, "default": 30},
+        {"name": "km", "kind": "numeric", "min": 1.5, "max": 30.0, "default": 10.0, "step": 0.1},
+        {"name": "stops", "kind": "numeric", "min": 0, "max": 3, "default": 1, "choices": [0, 1, 2, 3]},
+    ],
+})
+
+
+class Container:
+    """Stands in for a Streamlit column and records the widget it was asked for."""
+
+    def slider(self, label, min_value, max_value, value, step, help=None, key=None):
+        return ("slider", label, min_value, max_value, value, step, key)
+
+    def selectbox(self, label, options, index=0, help=None, key=None):
+        return ("selectbox", label, options, index, key)
+
+
+def test_numeric_fields_become_sliders_over_the_schema_range():
+    assert field_input(Container(), SCHEMA, "age", "Age") == ("slider", "Age", 15, 50, 30, None, None)
+    assert field_input(Container(), SCHEMA, "km", "Distance", key="km_reg") == ("slider", "Distance", 1.5, 30.0, 10.0, 0.1, "km_reg")
+
+
+def test_fields_with_choices_become_selectboxes_on_the_default():
+    assert field_input(Container(), SCHEMA, "stops", "Stops") == ("selectbox", "Stops", [0, 1, 2, 3], 1, None)
+
+
+@pytest.mark.parametrize("path", sorted(relative(path) for path in REPO_ROOT.glob("*/models/*.schema.json")))
+def test_committed_schema_fields_are_renderable(path):
+    for field in load_schema(path).fields:
+        if field["kind"] == "numeric":
+            assert field["min"] <= field["default"] <= field["max"], field["name"]
+        if field["kind"] != "numeric" or "choices" in field:
+            assert field["choices"], field["name"]
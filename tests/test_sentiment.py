@@ -0,0 +1,30 @@
+import zipfile
+
+import pytest
+
+pytest.importorskip("nltk")
+
+from shared.sentiment import NLTK_DATA, lexicon_text, reference_analyzer, vader_analyzer
+
+BUNDLED = NLTK_DATA / "sentiment" / "vader_lexicon.zip"
+
+
+def test_bundled_zip_reads_as_the_analyzer_lexicon():
+    analyzer = reference_analyzer(BUNDLED)
+    assert analyzer.lexicon == vader_analyzer().lexicon
+    assert analyzer.polarity_scores("Great support, thanks!") == vader_analyzer().polarity_scores("Great support, thanks!")
+
+
+def test_reference_lexicon_changes_scores_only_on_the_copy(tmp_path):
+    text = lexicon_text(BUNDLED).replace("\ngood\t1.9\t", "\ngood\t-1.9\t")
+    path = tmp_path / "vader_lexicon.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("vader_lexicon/vader_lexicon.txt", text.replace("\n", "\r\n") + "\r\n")
+    assert reference_analyzer(path).polarity_scores("good")["compound"] < 0
+    assert vader_analyzer().polarity_scores("good")["compound"] > 0
+
+
+def test_latin1_lexicon_is_read(tmp_path):
+    path = tmp_path / "vader_lexicon.txt"
+    path.write_bytes("caf\xe9\t1.5\t0.5\t[1, 2]\n".encode("latin-1"))
+    assert lexicon_text(path) == "caf\xe9\t1.5\t0.5\t[1, 2]"
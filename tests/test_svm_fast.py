@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared.feature_schema import schema_for_model
+from shared.paths import resolve
+from shared.svm_fast import MAX_PROBA_DIFF, SVM_MODEL, TEST_SET, RBFSVM, fast_path_for
+
+
+@pytest.fixture(scope="module")
+def test_rows(require):
+    require(TEST_SET)
+    return pd.read_csv(resolve(TEST_SET))[schema_for_model(SVM_MODEL).columns].to_numpy(dtype=np.float64)
+
+
+@pytest.fixture(scope="module")
+def exact(require):
+    require(fast_path_for(SVM_MODEL))
+    return RBFSVM.load(resolve(fast_path_for(SVM_MODEL)))
+
+
+def test_decision_function_by_hand():
+    svm = RBFSVM([[0.0, 0.0], [1.0, 1.0]], [2.0, -1.0], 0.5, gamma=0.5, prob_a=-1.0, prob_b=0.0, classes=[0, 1])
+    x = [[1.0, 0.0]]
+    # 2 * exp(-0.5 * 1) - 1 * exp(-0.5 * 1) + 0.5
+    assert svm.decision_function(x)[0] == pytest.approx(math.exp(-0.5) + 0.5)
+    assert svm.predict(x).tolist() == [1]
+    np.testing.assert_allclose(svm.predict_proba(x).sum(axis=1), 1.0)
+
+
+def test_save_load_round_trip(tmp_path):
+    svm = RBFSVM([[0.0, 1.0]], [1.5], -0.2, 0.1, -2.0, 0.3, [0, 1], {"mode": "exact"})
+    svm.save(tmp_path / "svm.npz")
+    loaded = RBFSVM.load(tmp_path / "svm.npz")
+    assert loaded.meta == {"mode": "exact"} and not loaded.approximate
+    np.testing.assert_array_equal(loaded.decision_function([[2.0, 3.0]]), svm.decision_function([[2.0, 3.0]]))
+
+
+def test_exact_path_matches_sklearn(require, exact, test_rows):
+    joblib = pytest.importorskip("joblib")
+    require(SVM_MODEL)
+    svc = joblib.load(resolve(SVM_MODEL))
+    np.testing.assert_allclose(exact.decision_function(test_rows), svc.decision_function(test_rows), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(exact.predict_proba(test_rows), svc.predict_proba(test_rows), rtol=0, atol=1e-9)
+    np.testing.assert_array_equal(exact.predict(test_rows), svc.predict(test_rows))
+
+
+def test_shipped_approximation_is_within_tolerance(require, exact, test_rows):
+    require(fast_path_for(SVM_MODEL, approximate=True))
+    approx = RBFSVM.load(resolve(fast_path_for(SVM_MODEL, approximate=True)))
+    assert approx.approximate
+    assert np.abs(approx.predict_proba(test_rows) - exact.predict_proba(test_rows)).max() <= MAX_PROBA_DIFF
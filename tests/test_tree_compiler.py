@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared.feature_schema import schema_for_model
+from shared.paths import resolve
+from shared.tree_compiler import PARITY_SETS, CompiledEnsemble, compiled_path_for
+
+
+@pytest.mark.parametrize("model_path, dataset, target", PARITY_SETS, ids=[row[0] for row in PARITY_SETS])
+def test_committed_ensemble_matches_model(require, model_path, dataset, target):
+    joblib = pytest.importorskip("joblib")
+    require(model_path, compiled_path_for(model_path), dataset)
+    model = joblib.load(resolve(model_path))
+    compiled = CompiledEnsemble.load(resolve(compiled_path_for(model_path)))
+    X = pd.read_csv(resolve(dataset))[schema_for_model(model_path).columns].to_numpy(dtype=np.float32)
+
+    # XGBoost accumulates leaves in float32, so large regression outputs differ in the last ulps
+    if hasattr(model, "predict_proba"):
+        np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X), rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(compiled.predict(X), model.predict(X), rtol=1e-5, atol=1e-5)
+
+
+def test_single_row_matches_batch(require):
+    model_path = "Bank_Card/models/xgb_model.pkl"
+    require(compiled_path_for(model_path))
+    compiled = CompiledEnsemble.load(resolve(compiled_path_for(model_path)))
+    X = np.random.default_rng(0).normal(size=(20, schema_for_model(model_path).n_features)).astype(np.float32)
+    batch = compiled.predict_proba(X)
+    rows = np.vstack([compiled.predict_proba(X[i:i + 1]) for i in range(len(X))])
+    np.testing.assert_allclose(rows, batch)
+    np.testing.assert_allclose(batch.sum(axis=1), 1.0, rtol=1e-6)